@@ -0,0 +1,85 @@
+"""
+Almacén de archivos direccionado por contenido.
+
+Cada archivo se guarda con el hash SHA-256 de su contenido como nombre, así
+que dos subidas idénticas comparten el mismo blob y las URLs son inmutables
+(se pueden cachear para siempre). La escritura va a un temporal en el mismo
+directorio y se publica con un rename atómico.
+
+Los blobs no se borran al reemplazarlos: recolectar() elimina los que ya no
+tienen referencias y llevan más de `gracia` segundos sin tocarse. Una subida
+que reutiliza un blob existente le actualiza la fecha de modificación, de
+modo que no se borre mientras la referencia nueva aún no está guardada.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+TAMANO_BLOQUE = 64 * 1024
+NOMBRE_BLOB = re.compile(r'^[0-9a-f]{20,64}\.[a-z0-9]+$')
+
+
+class AlmacenContenido:
+    def __init__(self, directorio, url_base):
+        self.directorio = directorio
+        self.url_base = url_base
+
+    def guardar(self, stream, extension):
+        """Guardar el contenido de stream y devolver su URL"""
+        os.makedirs(self.directorio, exist_ok=True)
+        sha = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=self.directorio, prefix='.subida-', delete=False) as tmp:
+            try:
+                for bloque in iter(lambda: stream.read(TAMANO_BLOQUE), b''):
+                    sha.update(bloque)
+                    tmp.write(bloque)
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+
+        nombre = f"{sha.hexdigest()}.{extension}"
+        ruta = os.path.join(self.directorio, nombre)
+        if os.path.exists(ruta):
+            # Ya existe: se descarta la copia y se marca el blob como en uso
+            os.unlink(tmp.name)
+            os.utime(ruta)
+        else:
+            os.chmod(tmp.name, 0o644)
+            os.replace(tmp.name, ruta)
+        return f"{self.url_base}/{nombre}"
+
+    def contiene(self, url):
+        return bool(url) and url.startswith(self.url_base + '/')
+
+    def _ruta(self, url):
+        return os.path.join(self.directorio, url[len(self.url_base) + 1:])
+
+    def recolectar(self, referencias, urls=None, gracia=3600):
+        """Borrar blobs sin referencias y devolver la cantidad eliminada.
+
+        referencias: conteo (dict/Counter) de URLs en uso.
+        urls: candidatos a revisar; None revisa todo el directorio.
+        """
+        if urls is None:
+            if not os.path.isdir(self.directorio):
+                return 0
+            urls = [
+                f"{self.url_base}/{nombre}" for nombre in os.listdir(self.directorio)
+                if NOMBRE_BLOB.match(nombre)
+            ]
+        limite = time.time() - gracia
+        eliminados = 0
+        for url in urls:
+            if not self.contiene(url) or referencias.get(url, 0) > 0:
+                continue
+            ruta = self._ruta(url)
+            try:
+                if os.path.getmtime(ruta) < limite:
+                    os.unlink(ruta)
+                    eliminados += 1
+            except FileNotFoundError:
+                pass
+        return eliminados
@@ -0,0 +1,124 @@
+"""
+Cálculos de ocupación, ingresos y anticipación de reservas.
+
+agregar_mensual() reparte cada reserva entre los meses que ocupa (días e
+ingresos proporcionales a los días) para mantener la tabla de resumen
+mensual. ocupacion() y anticipacion() trabajan sobre filas crudas para los
+rangos que no caen en meses completos; usan NumPy si está instalado y, si
+no, un cálculo equivalente en Python puro.
+"""
+
+from datetime import date, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # opcional
+    np = None
+
+# Límites superiores (en días) de los tramos del histograma de anticipación
+TRAMOS_ANTICIPACION = (0, 7, 14, 30, 60, 90, 180)
+
+
+def inicio_de_mes(fecha):
+    return fecha.replace(day=1)
+
+
+def mes_siguiente(mes):
+    return date(mes.year + 1, 1, 1) if mes.month == 12 else date(mes.year, mes.month + 1, 1)
+
+
+def meses_entre(inicio, fin):
+    """Primer día de cada mes que toca [inicio, fin]"""
+    mes = inicio_de_mes(inicio)
+    while mes <= fin:
+        yield mes
+        mes = mes_siguiente(mes)
+
+
+def agregar_mensual(filas, claves=None):
+    """{(mes, inflable_id, estado): [reservas, dias, ingresos, primer_inicio]}
+
+    filas: (inflable_id, fecha_inicio, fecha_fin, estado, precio_total).
+    Una reserva cuenta en 'reservas' en el mes en que empieza; días e
+    ingresos se reparten entre los meses que ocupa. primer_inicio es el
+    inicio más temprano de las reservas que tocan el mes. Con claves
+    (conjunto de (mes, inflable_id)) solo se acumulan esas.
+    """
+    resumen = {}
+    for inflable_id, inicio, fin, estado, precio_total in filas:
+        total_dias = (fin - inicio).days + 1
+        for mes in meses_entre(inicio, fin):
+            if claves is not None and (mes, inflable_id) not in claves:
+                continue
+            dias = (min(fin, mes_siguiente(mes) - timedelta(days=1)) - max(inicio, mes)).days + 1
+            acumulado = resumen.setdefault((mes, inflable_id, estado), [0, 0, 0.0, inicio])
+            acumulado[0] += 1 if inicio >= mes else 0
+            acumulado[1] += dias
+            acumulado[2] += (precio_total or 0) * dias / total_dias
+            acumulado[3] = min(acumulado[3], inicio)
+    return resumen
+
+
+def ocupacion(filas, desde, hasta):
+    """{inflable_id: días ocupados dentro de [desde, hasta]}
+
+    filas: (inflable_id, fecha_inicio, fecha_fin), ya filtradas por estado.
+    """
+    filas = list(filas)
+    if not filas:
+        return {}
+    if np is not None:
+        ids = np.array([f[0] for f in filas])
+        inicios = np.array([f[1].toordinal() for f in filas])
+        fines = np.array([f[2].toordinal() for f in filas])
+        dias = np.minimum(fines, hasta.toordinal()) - np.maximum(inicios, desde.toordinal()) + 1
+        dias = np.clip(dias, 0, None)
+        unicos, posiciones = np.unique(ids, return_inverse=True)
+        sumas = np.bincount(posiciones, weights=dias)
+        return {int(i): int(s) for i, s in zip(unicos, sumas) if s}
+    resultado = {}
+    for inflable_id, inicio, fin in filas:
+        dias = (min(fin, hasta) - max(inicio, desde)).days + 1
+        if dias > 0:
+            resultado[inflable_id] = resultado.get(inflable_id, 0) + dias
+    return resultado
+
+
+def _percentil(ordenados, p):
+    # Interpolación lineal, igual que numpy.percentile por defecto
+    posicion = (len(ordenados) - 1) * p / 100
+    abajo = int(posicion)
+    arriba = min(abajo + 1, len(ordenados) - 1)
+    return ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo)
+
+
+def anticipacion(filas):
+    """Distribución de días entre la creación y el inicio de cada reserva.
+
+    filas: (fecha_inicio, fecha_creacion). Devuelve cantidad, media,
+    percentiles y un histograma por TRAMOS_ANTICIPACION.
+    """
+    dias = [(inicio - creacion.date()).days for inicio, creacion in filas if creacion is not None]
+    # Tramo 'hasta' N días inclusive; el último (None) es el resto
+    limites = list(TRAMOS_ANTICIPACION) + [None]
+    if not dias:
+        return {'reservas': 0, 'media': None, 'percentiles': {},
+                'histograma': [{'hasta': t, 'reservas': 0} for t in limites]}
+    if np is not None:
+        valores = np.array(dias)
+        media = float(valores.mean())
+        percentiles = dict(zip((50, 75, 90, 99), (float(v) for v in np.percentile(valores, (50, 75, 90, 99)))))
+        conteos = np.bincount(np.searchsorted(TRAMOS_ANTICIPACION, valores), minlength=len(limites))
+    else:
+        ordenados = sorted(dias)
+        media = sum(dias) / len(dias)
+        percentiles = {p: float(_percentil(ordenados, p)) for p in (50, 75, 90, 99)}
+        conteos = [0] * len(limites)
+        for d in dias:
+            conteos[next((i for i, t in enumerate(TRAMOS_ANTICIPACION) if d <= t), len(TRAMOS_ANTICIPACION))] += 1
+    return {
+        'reservas': len(dias),
+        'media': round(media, 2),
+        'percentiles': {f'p{p}': round(v, 2) for p, v in percentiles.items()},
+        'histograma': [{'hasta': t, 'reservas': int(c)} for t, c in zip(limites, conteos)],
+    }
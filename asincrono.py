@@ -0,0 +1,217 @@
+"""
+Variante asíncrona de la API de disponibilidad y reservas.
+
+Una aplicación ASGI mínima que atiende GET /api/disponibilidad y
+POST /api/reservas con los mismos parámetros y respuestas que las rutas de
+Flask, sobre un engine asíncrono de SQLAlchemy (asyncpg en PostgreSQL,
+aiosqlite en SQLite) y los mismos modelos de app.py. Mientras una petición
+espera a la base, el proceso sigue atendiendo otras:
+
+    uvicorn asincrono:app --port 5002
+
+El resto de la API sigue en Flask (gunicorn 'app:create_app()'); un proxy puede
+derivar solo estas dos rutas a este proceso. Requiere asyncpg o aiosqlite
+y un servidor ASGI (uvicorn), que no están en requirements.txt.
+"""
+
+import asyncio
+import logging
+from urllib.parse import parse_qs
+
+from dateutil.parser import parse as parse_date
+from werkzeug.http import parse_accept_header
+from sqlalchemy import exists, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import (
+    create_app, Cliente, Inflable, Reserva, ERROR_NO_DISPONIBLE, ERROR_RANGO_INVERTIDO,
+    clientes_guardados, consultas_precios, es_error_solapamiento, filtro_solapamiento, insertar_reserva,
+    reservas_guardadas, sentencias_cambio, sentencias_resumen, serializar_inflable,
+)
+from busqueda import normalizar_telefono
+from tarifas import PreciosVigentes
+from respuestas import a_json, codificar, de_json
+from basedatos import opciones_motor_async, url_async
+
+logger = logging.getLogger('inflables.asincrono')
+
+# Las tareas periódicas quedan en los workers de gunicorn
+app_flask = create_app(tareas=False)
+
+engine = create_async_engine(
+    url_async(app_flask.config['SQLALCHEMY_DATABASE_URI']),
+    **opciones_motor_async(app_flask.config['SQLALCHEMY_DATABASE_URI'])
+)
+Sesion = async_sessionmaker(engine, expire_on_commit=False)
+DIALECTO = engine.dialect.name
+
+
+class ErrorPeticion(Exception):
+    def __init__(self, mensaje, estado=400):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _fechas(fecha_inicio, fecha_fin):
+    try:
+        return parse_date(fecha_inicio).date(), parse_date(fecha_fin).date()
+    except (TypeError, ValueError, OverflowError):
+        raise ErrorPeticion('Formato de fecha inválido')
+
+
+async def get_disponibilidad(consulta, cuerpo):
+    fecha_inicio = consulta.get('fecha_inicio', [None])[0]
+    fecha_fin = consulta.get('fecha_fin', [None])[0]
+    if not fecha_inicio or not fecha_fin:
+        raise ErrorPeticion('Fechas requeridas')
+    fecha_inicio, fecha_fin = _fechas(fecha_inicio, fecha_fin)
+
+    # Sin índice en memoria: una sola consulta, el tiempo es espera a la base
+    ocupado = exists().where(
+        Reserva.inflable_id == Inflable.id,
+        filtro_solapamiento(fecha_inicio, fecha_fin, DIALECTO)
+    )
+    async with Sesion() as sesion:
+        inflables = await sesion.scalars(
+            select(Inflable).where(Inflable.activo == True, ~ocupado).order_by(Inflable.id)
+        )
+        return 200, serializar_inflable.lista(inflables)
+
+
+async def _primero(consulta):
+    # Cada consulta en su propia sesión (y conexión) para poder ir en paralelo
+    async with Sesion() as sesion:
+        return (await sesion.execute(consulta.limit(1))).scalar()
+
+
+async def _todas(consulta):
+    async with Sesion() as sesion:
+        return (await sesion.execute(consulta)).all()
+
+
+async def create_reserva(consulta, cuerpo):
+    data = de_json(cuerpo or b'null')
+    try:
+        inflable_id = int(data['inflable_id'])
+        datos_cliente = data['cliente']
+        telefono = datos_cliente['telefono']
+        fecha_inicio, fecha_fin = _fechas(data['fecha_inicio'], data['fecha_fin'])
+    except (KeyError, TypeError):
+        raise ErrorPeticion('Faltan datos de la reserva')
+    if fecha_fin < fecha_inicio:
+        raise ErrorPeticion(ERROR_RANGO_INVERTIDO)
+
+    # Cliente, precio y reglas son independientes: se consultan a la vez, con
+    # precios y reglas recién leídos como en app.precios_vigentes. El conflicto
+    # se resuelve al insertar (ver insertar_reserva en app.py).
+    consulta_precios, consulta_reglas = consultas_precios([inflable_id])
+    cliente_id, precios, reglas = await asyncio.gather(
+        _primero(select(Cliente.id).where(
+            Cliente.telefono_normalizado == normalizar_telefono(telefono)
+        ).order_by(Cliente.id)),
+        _todas(consulta_precios),
+        _todas(consulta_reglas),
+    )
+    precio_total = PreciosVigentes(dict(precios), reglas).cotizar(inflable_id, fecha_inicio, fecha_fin)
+    if precio_total is None:
+        raise ErrorPeticion('Inflable no encontrado', 404)
+
+    nuevo_cliente = cliente_id is None
+    try:
+        async with Sesion.begin() as sesion:
+            if nuevo_cliente:
+                cliente_id = await sesion.scalar(insert(Cliente).values(
+                    nombre=datos_cliente['nombre'],
+                    telefono=telefono,
+                    email=datos_cliente.get('email', ''),
+                    direccion=datos_cliente.get('direccion', '')
+                ).returning(Cliente.id))
+            reserva = (await sesion.execute(insertar_reserva({
+                'inflable_id': inflable_id,
+                'cliente_id': cliente_id,
+                'fecha_inicio': fecha_inicio,
+                'fecha_fin': fecha_fin,
+                'precio_total': precio_total,
+                'notas': data.get('notas', '')
+            }, DIALECTO))).first()
+            if reserva is None:
+                raise ErrorPeticion(ERROR_NO_DISPONIBLE, 409)
+            reserva_id, estado = reserva
+            for sentencia, parametros in (
+                sentencias_resumen([(inflable_id, fecha_inicio, fecha_fin, estado, precio_total)], [], DIALECTO)
+                + sentencias_cambio('reserva', 'alta', [reserva_id], DIALECTO)
+            ):
+                await sesion.execute(sentencia, parametros)
+    except IntegrityError as e:
+        if es_error_solapamiento(e):
+            raise ErrorPeticion(ERROR_NO_DISPONIBLE, 409)
+        raise
+
+    # Índices y caches con el código síncrono, fuera del event loop
+    def actualizar():
+        with app_flask.app_context():
+            reservas_guardadas([(reserva_id, inflable_id, fecha_inicio, fecha_fin, estado)])
+            if nuevo_cliente:
+                clientes_guardados([(cliente_id, datos_cliente['nombre'], datos_cliente.get('email', ''),
+                                     normalizar_telefono(telefono))])
+    await asyncio.to_thread(actualizar)
+    return 200, {'id': reserva_id, 'message': 'Reserva creada exitosamente'}
+
+
+RUTAS = {
+    ('GET', '/api/disponibilidad'): get_disponibilidad,
+    ('POST', '/api/reservas'): create_reserva,
+}
+
+
+async def _leer_cuerpo(receive):
+    partes = []
+    while True:
+        mensaje = await receive()
+        partes.append(mensaje.get('body', b''))
+        if not mensaje.get('more_body'):
+            return b''.join(partes)
+
+
+async def _responder(send, estado, datos, accept_encoding=''):
+    cuerpo, codificacion = codificar(
+        a_json(datos), parse_accept_header(accept_encoding), app_flask.config['COMPRESION_MINIMO']
+    )
+    headers = [(b'content-type', b'application/json'),
+               (b'content-length', str(len(cuerpo)).encode()),
+               (b'vary', b'Accept-Encoding')]
+    if codificacion:
+        headers.append((b'content-encoding', codificacion.encode()))
+    await send({'type': 'http.response.start', 'status': estado, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': cuerpo})
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            mensaje = await receive()
+            if mensaje['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensaje['type'] == 'lifespan.shutdown':
+                await engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    ruta = RUTAS.get((scope['method'], scope['path']))
+    if ruta is None:
+        return await _responder(send, 404, {'error': 'Ruta no encontrada'})
+    try:
+        consulta = parse_qs(scope['query_string'].decode())
+        estado, datos = await ruta(consulta, await _leer_cuerpo(receive))
+    except ErrorPeticion as e:
+        estado, datos = e.estado, {'error': str(e)}
+    except ValueError as e:  # JSON inválido
+        estado, datos = 400, {'error': str(e)}
+    except Exception as e:
+        logger.exception('Error en %s %s', scope['method'], scope['path'])
+        estado, datos = 500, {'error': str(e)}
+    accept_encoding = dict(scope['headers']).get(b'accept-encoding', b'').decode('latin-1')
+    await _responder(send, estado, datos, accept_encoding)
@@ -0,0 +1,90 @@
+"""
+Configuración del motor de base de datos desde variables de entorno.
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT   tamaño y espera del pool
+    DB_POOL_RECYCLE                                  segundos antes de reabrir una conexión
+    DB_POOL_PRE_PING                                 comprobar la conexión antes de usarla (1/0)
+    DB_STATEMENT_TIMEOUT_MS                          corta sentencias lentas (PostgreSQL)
+    DB_PREPARE_THRESHOLD                             sentencias preparadas (psycopg 3); 'off'
+                                                     las desactiva, p. ej. detrás de PgBouncer
+
+Con SQLite no se aplican las opciones de pool ni de servidor.
+
+url_async() y opciones_motor_async() hacen lo mismo para el engine asíncrono
+de asincrono.py (asyncpg / aiosqlite).
+"""
+
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+
+def _entero(entorno, nombre):
+    valor = entorno.get(nombre)
+    return int(valor) if valor not in (None, '') else None
+
+
+def opciones_motor(uri, entorno=os.environ):
+    """SQLALCHEMY_ENGINE_OPTIONS para la URI, según las variables de entorno"""
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        return {}
+
+    opciones = {'pool_pre_ping': entorno.get('DB_POOL_PRE_PING', '1').lower() in ('1', 'true', 'si')}
+    for clave, nombre in (('pool_size', 'DB_POOL_SIZE'), ('max_overflow', 'DB_MAX_OVERFLOW'),
+                          ('pool_timeout', 'DB_POOL_TIMEOUT'), ('pool_recycle', 'DB_POOL_RECYCLE')):
+        valor = _entero(entorno, nombre)
+        if valor is not None:
+            opciones[clave] = valor
+
+    connect_args = {}
+    if url.get_backend_name() == 'postgresql':
+        timeout = _entero(entorno, 'DB_STATEMENT_TIMEOUT_MS')
+        if timeout:
+            connect_args['options'] = f'-c statement_timeout={timeout}'
+        umbral = entorno.get('DB_PREPARE_THRESHOLD')
+        if umbral and url.get_driver_name() == 'psycopg':
+            connect_args['prepare_threshold'] = None if umbral == 'off' else int(umbral)
+    if connect_args:
+        opciones['connect_args'] = connect_args
+    return opciones
+
+
+DRIVERS_ASYNC = {'postgresql': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+
+
+def url_async(uri):
+    """La misma base con el driver asíncrono correspondiente"""
+    url = make_url(uri)
+    return url.set(drivername=DRIVERS_ASYNC.get(url.get_backend_name(), url.drivername))
+
+
+def opciones_motor_async(uri, entorno=os.environ):
+    """Opciones de create_async_engine: el mismo pool; el timeout y la caché
+    de sentencias se pasan con los nombres de asyncpg"""
+    opciones = opciones_motor(uri, entorno)
+    opciones.pop('connect_args', None)
+    if make_url(uri).get_backend_name() == 'postgresql':
+        connect_args = {}
+        timeout = _entero(entorno, 'DB_STATEMENT_TIMEOUT_MS')
+        if timeout:
+            connect_args['server_settings'] = {'statement_timeout': str(timeout)}
+        if entorno.get('DB_PREPARE_THRESHOLD') == 'off':
+            connect_args['statement_cache_size'] = 0
+        if connect_args:
+            opciones['connect_args'] = connect_args
+    return opciones
+
+
+def estado_conexion(engine):
+    """Comprobar que el pool entrega una conexión usable; devuelve un dict
+    con el tiempo de ida y vuelta y el estado del pool (lanza si falla)"""
+    t0 = time.perf_counter()
+    with engine.connect() as conexion:
+        conexion.execute(text('SELECT 1'))
+    return {
+        'db_ms': round((time.perf_counter() - t0) * 1000, 2),
+        'pool': engine.pool.status(),
+    }
@@ -0,0 +1 @@
+"""Benchmarks de rendimiento. Ejecutar desde la raíz: python -m benchmarks.<nombre>"""
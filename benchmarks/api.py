@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las rutas /api/*.
+
+Mide latencia (p50/p90/p99) y throughput de cada ruta contra la base de
+DATABASE_URL (SQLite o PostgreSQL), usando el cliente de pruebas de Flask en
+el mismo proceso. Las rutas que escriben crean sus propios datos, así que
+conviene usar una base de pruebas (ver `python seed_data.py --masivo`).
+
+    DATABASE_URL=postgresql://... python -m benchmarks.api --peticiones 500 --concurrencia 4 \
+        --salida resultados.json --comparar resultados_anteriores.json
+
+Con --url las peticiones van por HTTP a un servidor ya levantado (p. ej.
+gunicorn con la misma DATABASE_URL), para medir cómo escala con workers:
+
+    SERVER_TIMING=1 gunicorn 'app:create_app()' &
+    python -m benchmarks.api --url http://localhost:5001 --concurrencia 16 --rutas get_inflables get_disponibilidad
+"""
+
+import argparse
+import http.client
+import io
+import json
+import platform
+import random
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode, urlsplit
+
+import planillas
+from app import app, db, Cambio, Inflable, Cliente, Reserva
+
+
+class Contexto:
+    """Ids de muestra y datos creados por el propio benchmark"""
+
+    def __init__(self):
+        self.inflable_ids = [i for (i,) in db.session.query(Inflable.id).filter(Inflable.activo == True).limit(1000)]
+        rango = db.session.query(db.func.min(Reserva.id), db.func.max(Reserva.id)).one()
+        self.reserva_min, self.reserva_max = rango[0] or 0, rango[1] or 0
+        self.nombres_clientes = [n for (n,) in db.session.query(Cliente.nombre).limit(1000)] or ['Cliente']
+        self.cambio = db.session.query(db.func.max(Cambio.id)).scalar() or 0
+        self.reservas_creadas = []
+        self.inflables_creados = []
+        self.reglas_creadas = []
+        self._lock = threading.Lock()
+
+    def inflable(self):
+        return random.choice(self.inflable_ids)
+
+    def reserva(self):
+        return random.randint(self.reserva_min, self.reserva_max)
+
+    def texto_cliente(self, largo):
+        """Parte de un nombre de cliente existente, para buscar"""
+        nombre = random.choice(self.nombres_clientes)
+        inicio = random.randint(0, max(len(nombre) - largo, 0))
+        return nombre[inicio:inicio + largo]
+
+    def fechas(self, dias=3, desde=-30, hasta=180):
+        inicio = date.today() + timedelta(days=random.randint(desde, hasta))
+        return inicio.isoformat(), (inicio + timedelta(days=dias - 1)).isoformat()
+
+    def guardar(self, lista, valor):
+        with self._lock:
+            lista.append(valor)
+
+    def tomar(self, lista):
+        with self._lock:
+            return lista.pop() if lista else None
+
+
+def _crear_reserva(ctx):
+    # Fechas lejanas para no chocar con las reservas existentes
+    inicio, fin = ctx.fechas(dias=2, desde=3650, hasta=3650 + 3650)
+    return 'POST', '/api/reservas', {'json': {
+        'inflable_id': ctx.inflable(),
+        'fecha_inicio': inicio,
+        'fecha_fin': fin,
+        'cliente': {'nombre': 'Cliente benchmark', 'telefono': f'bench-{random.randrange(10**6)}'},
+    }}
+
+
+def _crear_reservas_bulk(ctx, cantidad=50):
+    return 'POST', '/api/reservas/bulk', {'json': [_crear_reserva(ctx)[2]['json'] for _ in range(cantidad)]}
+
+
+def _reserva_creada(ctx, metodo, opciones=None):
+    reserva_id = ctx.tomar(ctx.reservas_creadas) or ctx.reserva()
+    if metodo == 'PUT':
+        ctx.guardar(ctx.reservas_creadas, reserva_id)
+    return metodo, f'/api/reservas/{reserva_id}', opciones or {}
+
+
+def _inflable_creado(ctx, accion):
+    inflable_id = ctx.inflables_creados[-1] if ctx.inflables_creados else ctx.inflable()
+    return 'POST', f'/api/inflables/{inflable_id}/{accion}', {}
+
+
+def _cotizar_rangos(ctx, rangos=4, inflables=10):
+    return 'POST', '/api/cotizar', {'json': {
+        'rangos': [ctx.fechas(dias=random.randint(1, 7)) for _ in range(rangos)],
+        'inflable_ids': [ctx.inflable() for _ in range(inflables)],
+    }}
+
+
+def _cotizar_lista(ctx, cantidad=20):
+    return 'POST', '/api/cotizar', {'json': {'cotizaciones': [
+        dict(zip(('fecha_inicio', 'fecha_fin'), ctx.fechas(dias=random.randint(1, 7))), inflable_id=ctx.inflable())
+        for _ in range(cantidad)
+    ]}}
+
+
+def _crear_regla_precio(ctx):
+    # Factor 1 y fechas lejanas: no cambia los precios de los otros escenarios
+    desde = date.today() + timedelta(days=random.randint(365 * 30, 365 * 40))
+    return 'POST', '/api/reglas-precio', {'json': {
+        'tipo': 'temporada', 'factor': 1, 'descripcion': 'benchmark',
+        'desde': desde.isoformat(), 'hasta': (desde + timedelta(days=7)).isoformat(),
+    }}
+
+
+def _borrar_regla_precio(ctx):
+    # Sin reglas creadas, un id que no existe (404)
+    return 'DELETE', '/api/reglas-precio/%d' % (ctx.tomar(ctx.reglas_creadas) or 0), {}
+
+
+def _importar_clientes(ctx, cantidad=50):
+    filas = ''.join(f'Cliente benchmark,bench-{random.randrange(10**9)}\n' for _ in range(cantidad))
+    return 'POST', '/api/importar/clientes', {'data': {
+        'archivo': (io.BytesIO(f'nombre,telefono\n{filas}'.encode()), 'clientes.csv')}}
+
+
+def _stream_cambios(ctx):
+    # Hasta el primer evento: los 50 cambios anteriores al inicio del benchmark.
+    # Con más concurrencia que CAMBIOS_SSE_MAXIMO por proceso, el resto es 503
+    return 'GET', '/api/cambios/stream?since=%d' % max(ctx.cambio - 50, 0), {'primer_evento': True}
+
+
+# endpoint -> {variante: generador(ctx) -> (método, url, kwargs para client.open)}
+ESCENARIOS = {
+    'get_clientes': {'': lambda ctx: ('GET', '/api/clientes', {})},
+    'buscar_clientes': {
+        'prefijo': lambda ctx: ('GET', '/api/clientes/buscar?' + urlencode({'q': ctx.texto_cliente(2)}), {}),
+        'texto': lambda ctx: ('GET', '/api/clientes/buscar?' + urlencode({'q': ctx.texto_cliente(4)}), {}),
+    },
+    'get_inflables': {'': lambda ctx: ('GET', '/api/inflables', {})},
+    'get_inflables_admin': {'': lambda ctx: ('GET', '/api/inflables/admin', {})},
+    'get_disponibilidad': {
+        '': lambda ctx: ('GET', '/api/disponibilidad?fecha_inicio=%s&fecha_fin=%s' % ctx.fechas(), {}),
+    },
+    'buscar_disponibilidad': {
+        'duracion': lambda ctx: ('POST', '/api/disponibilidad/buscar', {'json': {
+            'duracion': random.randint(1, 5), 'desde': ctx.fechas()[0]}}),
+        'rangos': lambda ctx: ('POST', '/api/disponibilidad/buscar', {'json': {
+            'rangos': [ctx.fechas(dias=2) for _ in range(8)]}}),
+    },
+    'get_ocupacion': {
+        'año': lambda ctx: ('GET', '/api/analitica/ocupacion?desde=%s&hasta=%s' % ctx.fechas(dias=365, desde=-400, hasta=-300), {}),
+    },
+    'get_ingresos': {'': lambda ctx: ('GET', '/api/analitica/ingresos', {})},
+    'get_anticipacion': {
+        'trimestre': lambda ctx: ('GET', '/api/analitica/anticipacion?desde=%s&hasta=%s' % ctx.fechas(dias=90), {}),
+    },
+    'get_reservas': {
+        'paginado': lambda ctx: ('GET', '/api/reservas?limite=50', {}),
+        'filtrado': lambda ctx: ('GET', '/api/reservas?limite=50&estado=pendiente,confirmada&inflable_id=%d' % ctx.inflable(), {}),
+        'rango': lambda ctx: ('GET', '/api/reservas?limite=50&desde=%s&hasta=%s' % ctx.fechas(dias=30), {}),
+    },
+    'get_calendario': {
+        'mes': lambda ctx: ('GET', '/api/calendario?mes=%d&año=%d' % (random.randint(1, 12), date.today().year), {}),
+    },
+    'get_inflable_reservas': {
+        'proximas': lambda ctx: ('GET', '/api/inflables/%d/reservas?tipo=proximas' % ctx.inflable(), {}),
+        'historial': lambda ctx: ('GET', '/api/inflables/%d/reservas?tipo=historial' % ctx.inflable(), {}),
+    },
+    'get_reserva': {'': lambda ctx: ('GET', '/api/reservas/%d' % ctx.reserva(), {})},
+    'cotizar': {'rangos': _cotizar_rangos, 'lista': _cotizar_lista},
+    'get_reglas_precio': {'': lambda ctx: ('GET', '/api/reglas-precio', {})},
+    'create_regla_precio': {'': _crear_regla_precio},
+    'delete_regla_precio': {'': _borrar_regla_precio},
+    'get_cambios': {
+        'cursor': lambda ctx: ('GET', '/api/cambios', {}),
+        'recientes': lambda ctx: ('GET', '/api/cambios?since=%d' % max(ctx.cambio - 50, 0), {}),
+    },
+    'stream_cambios': {'primer_evento': _stream_cambios},
+    'exportar': {
+        'inflables': lambda ctx: ('GET', '/api/exportar/inflables', {}),
+        'reservas_mes': lambda ctx: ('GET', '/api/exportar/reservas?desde=%s&hasta=%s' % ctx.fechas(dias=30), {}),
+        # xlsx solo con openpyxl instalado
+        **({'inflables_xlsx': lambda ctx: ('GET', '/api/exportar/inflables?formato=xlsx', {})}
+           if planillas.openpyxl is not None else {}),
+    },
+    'importar': {'clientes_50': _importar_clientes},
+    'create_reserva': {'': _crear_reserva},
+    'create_reservas_bulk': {'50': _crear_reservas_bulk},
+    'update_reserva': {'': lambda ctx: _reserva_creada(ctx, 'PUT', {'json': {'notas': 'benchmark'}})},
+    'delete_reserva': {'': lambda ctx: _reserva_creada(ctx, 'DELETE')},
+    'create_inflable': {'': lambda ctx: ('POST', '/api/inflables', {'json': {
+        'nombre': 'Inflable benchmark', 'precio_diario': 100, 'descripcion': 'benchmark'}})},
+    'update_inflable': {'': lambda ctx: (
+        'PUT', '/api/inflables/%d' % (ctx.inflables_creados[-1] if ctx.inflables_creados else ctx.inflable()),
+        {'data': {'descripcion': 'benchmark'}})},
+    'desactivar_inflable': {'': lambda ctx: _inflable_creado(ctx, 'desactivar')},
+    'reactivar_inflable': {'': lambda ctx: _inflable_creado(ctx, 'reactivar')},
+}
+
+# Las rutas que crean datos se ejecutan antes que las que los usan
+ORDEN = ['create_inflable', 'update_inflable', 'desactivar_inflable', 'reactivar_inflable',
+         'create_reserva', 'create_reservas_bulk', 'update_reserva', 'create_regla_precio']
+ULTIMAS = ['delete_reserva', 'delete_regla_precio']
+
+
+# Server-Timing que agrega observabilidad.instrumentar: db;dur=..;desc="N consultas"
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) consultas"')
+
+
+class RespuestaHTTP:
+    def __init__(self, respuesta, al_cortar):
+        self.status_code = respuesta.status
+        self.headers = respuesta.headers
+        self._respuesta = respuesta
+        self._al_cortar = al_cortar
+
+    def get_data(self):
+        return self._respuesta.read()
+
+    @property
+    def response(self):
+        # El cuerpo de a partes, como en una respuesta de Werkzeug
+        while parte := self._respuesta.read1():
+            yield parte
+
+    def close(self):
+        if not self._respuesta.isclosed():
+            # Sin leer hasta el final (un stream) la conexión no se puede reusar
+            self._al_cortar()
+
+
+class ClienteHTTP:
+    """Misma interfaz que app.test_client().open, contra un servidor real.
+    Una conexión keep-alive por hilo."""
+
+    def __init__(self, base):
+        self._base = urlsplit(base)
+        self._conexion = None
+
+    def open(self, url, method='GET', json=None, data=None):
+        cuerpo, headers = None, {}
+        if json is not None:
+            cuerpo, headers = _json_bytes(json), {'Content-Type': 'application/json'}
+        elif data is not None and any(isinstance(v, tuple) for v in data.values()):
+            cuerpo, headers = _multipart(data)
+        elif data is not None:
+            cuerpo, headers = urlencode(data).encode(), {'Content-Type': 'application/x-www-form-urlencoded'}
+        for intento in range(2):
+            if self._conexion is None:
+                self._conexion = http.client.HTTPConnection(self._base.hostname, self._base.port or 80)
+            try:
+                self._conexion.request(method, url, body=cuerpo, headers=headers)
+                return RespuestaHTTP(self._conexion.getresponse(), self._desconectar)
+            except (http.client.HTTPException, ConnectionError):
+                # El servidor cerró la conexión (p. ej. max_requests): reconectar
+                self._desconectar()
+                if intento:
+                    raise
+
+    def _desconectar(self):
+        self._conexion.close()
+        self._conexion = None
+
+
+def _json_bytes(datos):
+    return json.dumps(datos).encode()
+
+
+def _multipart(campos):
+    """Cuerpo multipart/form-data; los archivos como (archivo, nombre), igual
+    que en el cliente de pruebas de Flask"""
+    limite = f'benchmark-{random.randrange(10**12)}'
+    cuerpo = io.BytesIO()
+    for campo, valor in campos.items():
+        if isinstance(valor, tuple):
+            archivo, nombre = valor
+            cuerpo.write(f'--{limite}\r\nContent-Disposition: form-data; name="{campo}"; filename="{nombre}"\r\n'
+                         f'Content-Type: application/octet-stream\r\n\r\n'.encode())
+            cuerpo.write(archivo.read())
+        else:
+            cuerpo.write(f'--{limite}\r\nContent-Disposition: form-data; name="{campo}"\r\n\r\n{valor}'.encode())
+        cuerpo.write(b'\r\n')
+    cuerpo.write(f'--{limite}--\r\n'.encode())
+    return cuerpo.getvalue(), {'Content-Type': f'multipart/form-data; boundary={limite}'}
+
+
+def _primer_evento(respuesta):
+    """Primera parte del cuerpo de un stream; después lo cierra"""
+    try:
+        return next(iter(respuesta.response), b'')
+    finally:
+        respuesta.close()
+
+
+def _percentil(valores, p):
+    return valores[min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))]
+
+
+def medir_escenario(generador, ctx, peticiones, concurrencia, crear_cliente=app.test_client):
+    latencias = []
+    tiempos_db = []
+    consultas = []
+    errores = 0
+    lock = threading.Lock()
+
+    def trabajador(n):
+        nonlocal errores
+        cliente = crear_cliente()
+        for _ in range(n):
+            metodo, url, opciones = generador(ctx)
+            primer_evento = opciones.pop('primer_evento', False)
+            t0 = time.perf_counter()
+            respuesta = cliente.open(url, method=metodo, **opciones)
+            datos = _primer_evento(respuesta) if primer_evento else respuesta.get_data()
+            transcurrido = (time.perf_counter() - t0) * 1000
+            if metodo == 'POST' and url == '/api/reservas' and respuesta.status_code == 200:
+                ctx.guardar(ctx.reservas_creadas, json.loads(datos)['id'])
+            if metodo == 'POST' and url == '/api/inflables' and respuesta.status_code == 200:
+                ctx.guardar(ctx.inflables_creados, json.loads(datos)['id'])
+            if metodo == 'POST' and url == '/api/reglas-precio' and respuesta.status_code == 200:
+                ctx.guardar(ctx.reglas_creadas, json.loads(datos)['id'])
+            db_ms = SERVER_TIMING_DB.search(respuesta.headers.get('Server-Timing', ''))
+            with lock:
+                latencias.append(transcurrido)
+                if db_ms:
+                    tiempos_db.append(float(db_ms.group(1)))
+                    consultas.append(int(db_ms.group(2)))
+                if respuesta.status_code >= 500:
+                    errores += 1
+
+    reparto = [peticiones // concurrencia + (1 if i < peticiones % concurrencia else 0)
+               for i in range(concurrencia)]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        list(pool.map(trabajador, reparto))
+    total = time.perf_counter() - t0
+
+    latencias.sort()
+    return {
+        'peticiones': len(latencias),
+        'errores': errores,
+        'media_ms': round(statistics.fmean(latencias), 3),
+        'p50_ms': round(_percentil(latencias, 50), 3),
+        'p90_ms': round(_percentil(latencias, 90), 3),
+        'p99_ms': round(_percentil(latencias, 99), 3),
+        'rps': round(len(latencias) / total, 1),
+        'db_media_ms': round(statistics.fmean(tiempos_db), 3) if tiempos_db else None,
+        'consultas_media': round(statistics.fmean(consultas), 2) if consultas else None,
+    }
+
+
+def rutas_api():
+    return sorted({regla.endpoint for regla in app.url_map.iter_rules() if regla.rule.startswith('/api/')})
+
+
+def comparar(actual, anterior):
+    print("\n📊 Comparación de p50 y rps con la corrida anterior:")
+    for nombre, datos in actual['rutas'].items():
+        previo = anterior['rutas'].get(nombre)
+        if not previo:
+            continue
+        delta_p50 = (datos['p50_ms'] - previo['p50_ms']) / previo['p50_ms'] * 100 if previo['p50_ms'] else 0
+        delta_rps = (datos['rps'] - previo['rps']) / previo['rps'] * 100 if previo['rps'] else 0
+        alerta = ' ⚠️' if delta_p50 > 20 else ''
+        print(f"  {nombre:40} p50 {delta_p50:+6.1f}%  rps {delta_rps:+6.1f}%{alerta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de las rutas /api/*')
+    parser.add_argument('--peticiones', type=int, default=200, help='Peticiones por escenario')
+    parser.add_argument('--concurrencia', type=int, default=1)
+    parser.add_argument('--rutas', nargs='*', help='Limitar a estos endpoints')
+    parser.add_argument('--salida', help='Guardar resultados en este JSON')
+    parser.add_argument('--comparar', help='JSON de una corrida anterior')
+    parser.add_argument('--url', help='Medir por HTTP contra este servidor en vez del cliente de pruebas')
+    args = parser.parse_args()
+    crear_cliente = (lambda: ClienteHTTP(args.url)) if args.url else app.test_client
+
+    # Tiempo en la base y sentencias por petición, leídos del header Server-Timing
+    app.config['SERVER_TIMING'] = True
+    with app.app_context():
+        ctx = Contexto()
+        filas = {
+            'inflables': Inflable.query.count(),
+            'clientes': Cliente.query.count(),
+            'reservas': Reserva.query.count(),
+        }
+        dialecto = db.engine.dialect.name
+
+    rutas = rutas_api()
+    sin_escenario = [r for r in rutas if r not in ESCENARIOS]
+    if sin_escenario:
+        print(f"⚠️  Rutas sin escenario: {', '.join(sin_escenario)}")
+    seleccion = [r for r in rutas if r in ESCENARIOS and (not args.rutas or r in args.rutas)]
+    seleccion.sort(key=lambda r: (r in ULTIMAS, r not in ORDEN, ORDEN.index(r) if r in ORDEN else 0))
+
+    print(f"🏁 {dialecto}: {filas}")
+    resultados = {}
+    for endpoint in seleccion:
+        for variante, generador in ESCENARIOS[endpoint].items():
+            nombre = f"{endpoint}[{variante}]" if variante else endpoint
+            datos = medir_escenario(generador, ctx, args.peticiones, args.concurrencia, crear_cliente)
+            resultados[nombre] = datos
+            print(f"  {nombre:40} p50 {datos['p50_ms']:8.2f} ms  p99 {datos['p99_ms']:8.2f} ms  "
+                  f"{datos['rps']:8.1f} rps  db {datos['db_media_ms'] or 0:7.2f} ms / "
+                  f"{datos['consultas_media'] or 0:5.1f} consultas  errores {datos['errores']}")
+
+    salida = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'base': dialecto,
+        'python': platform.python_version(),
+        'filas': filas,
+        'peticiones': args.peticiones,
+        'concurrencia': args.concurrencia,
+        'servidor': args.url or 'test_client',
+        'rutas': resultados,
+    }
+    if args.salida:
+        with open(args.salida, 'w') as f:
+            json.dump(salida, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar) as f:
+            comparar(salida, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
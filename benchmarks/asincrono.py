@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Throughput de las rutas síncronas (Flask) contra las asíncronas (asincrono.py).
+
+Manda las mismas peticiones de benchmarks.api por HTTP a los dos servidores,
+ya levantados sobre la misma DATABASE_URL, con distintas cantidades de
+conexiones concurrentes:
+
+    gunicorn 'app:create_app()' --bind :5001 &
+    uvicorn asincrono:app --port 5002 &
+    python -m benchmarks.asincrono --sync http://localhost:5001 --async http://localhost:5002 \
+        --concurrencias 1 8 32 --salida asincrono.json
+"""
+
+import argparse
+import json
+import platform
+from datetime import datetime
+
+from app import app, db
+from benchmarks.api import ESCENARIOS, ClienteHTTP, Contexto, medir_escenario
+
+RUTAS = ('get_disponibilidad', 'create_reserva')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rutas síncronas contra asíncronas por HTTP')
+    parser.add_argument('--sync', required=True, help='URL del servidor Flask')
+    parser.add_argument('--async', dest='asincrono', required=True, help='URL del servidor ASGI')
+    parser.add_argument('--concurrencias', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--peticiones', type=int, default=500, help='Peticiones por medición')
+    parser.add_argument('--rutas', nargs='*', default=list(RUTAS), choices=RUTAS)
+    parser.add_argument('--salida', help='Guardar resultados en este JSON')
+    args = parser.parse_args()
+
+    with app.app_context():
+        ctx = Contexto()
+        dialecto = db.engine.dialect.name
+
+    print(f"🏁 {dialecto}: sync {args.sync}  async {args.asincrono}")
+    resultados = {}
+    for endpoint in args.rutas:
+        generador = ESCENARIOS[endpoint]['']
+        for concurrencia in args.concurrencias:
+            fila = {}
+            for modo, url in (('sync', args.sync), ('async', args.asincrono)):
+                fila[modo] = medir_escenario(generador, ctx, args.peticiones, concurrencia,
+                                             lambda url=url: ClienteHTTP(url))
+            resultados[f'{endpoint}[{concurrencia}]'] = fila
+            sync, asinc = fila['sync'], fila['async']
+            razon = asinc['rps'] / sync['rps'] if sync['rps'] else 0
+            print(f"  {endpoint:20} c={concurrencia:<4} "
+                  f"sync {sync['rps']:8.1f} rps p99 {sync['p99_ms']:8.2f} ms  "
+                  f"async {asinc['rps']:8.1f} rps p99 {asinc['p99_ms']:8.2f} ms  "
+                  f"x{razon:.2f}  errores {sync['errores']}/{asinc['errores']}")
+
+    if args.salida:
+        with open(args.salida, 'w') as f:
+            json.dump({
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'base': dialecto,
+                'python': platform.python_version(),
+                'peticiones': args.peticiones,
+                'servidores': {'sync': args.sync, 'async': args.asincrono},
+                'rutas': resultados,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los índices de disponibilidad.
+
+Puebla la base indicada en DATABASE_URL con reservas sintéticas, mide el plan
+y los tiempos de las consultas de solapamiento sin índices y luego con ellos.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.indices_disponibilidad --reservas 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from app import app, db, Inflable, Cliente, Reserva, filtro_solapamiento, INDICE_RANGO_RESERVA
+
+INDICES = ('ix_reserva_disponibilidad', 'ix_cliente_telefono', 'ix_reserva_rango_activo')
+ESTADOS = ('pendiente', 'confirmada', 'completada', 'cancelada')
+LOTE = 10000
+
+
+def poblar(n_reservas, n_inflables, n_clientes):
+    """Completar la base hasta tener n_reservas (inserts por lotes)"""
+    if Inflable.query.count() < n_inflables:
+        db.session.execute(db.insert(Inflable), [
+            {'nombre': f'Inflable {i}', 'precio_diario': random.randint(100, 300), 'activo': True}
+            for i in range(n_inflables)
+        ])
+    if Cliente.query.count() < n_clientes:
+        db.session.execute(db.insert(Cliente), [
+            {'nombre': f'Cliente {i}', 'telefono': f'+54 11 {i:08d}'}
+            for i in range(n_clientes)
+        ])
+    db.session.commit()
+
+    inflable_ids = [i for (i,) in db.session.query(Inflable.id)]
+    cliente_ids = [c for (c,) in db.session.query(Cliente.id)]
+    faltantes = n_reservas - Reserva.query.count()
+    origen = date.today() - timedelta(days=5 * 365)
+    while faltantes > 0:
+        lote = []
+        for _ in range(min(LOTE, faltantes)):
+            inicio = origen + timedelta(days=random.randint(0, 6 * 365))
+            lote.append({
+                'inflable_id': random.choice(inflable_ids),
+                'cliente_id': random.choice(cliente_ids),
+                'fecha_inicio': inicio,
+                'fecha_fin': inicio + timedelta(days=random.randint(0, 3)),
+                'precio_total': 0,
+                'estado': random.choice(ESTADOS),
+            })
+        db.session.execute(db.insert(Reserva), lote)
+        db.session.commit()
+        faltantes -= len(lote)
+        print(f"  ... faltan {faltantes} reservas")
+
+
+def eliminar_indices():
+    for nombre in INDICES:
+        db.session.execute(db.text(f'DROP INDEX IF EXISTS {nombre}'))
+    db.session.commit()
+
+
+def crear_indices():
+    conn = db.session.connection()
+    for indice in Reserva.__table__.indexes | Cliente.__table__.indexes:
+        indice.create(conn, checkfirst=True)
+    if conn.dialect.name == 'postgresql':
+        conn.execute(INDICE_RANGO_RESERVA)
+    db.session.commit()
+
+
+def analizar():
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+
+def consultas(fecha_inicio, fecha_fin, inflable_id, telefono):
+    return {
+        'disponibilidad_flota': db.select(Reserva.inflable_id).where(
+            filtro_solapamiento(fecha_inicio, fecha_fin)
+        ),
+        'conflicto_inflable': db.select(Reserva.id).where(
+            Reserva.inflable_id == inflable_id,
+            filtro_solapamiento(fecha_inicio, fecha_fin)
+        ).limit(1),
+        'cliente_por_telefono': db.select(Cliente.id).where(Cliente.telefono == telefono).limit(1),
+    }
+
+
+def plan(stmt):
+    conn = db.session.connection()
+    prefijo = 'EXPLAIN ANALYZE ' if conn.dialect.name == 'postgresql' else 'EXPLAIN QUERY PLAN '
+    compilado = stmt.compile(dialect=conn.dialect, compile_kwargs={'render_postcompile': True})
+    params = compilado.construct_params()
+    if compilado.positional:
+        params = tuple(params[k] for k in compilado.positiontup)
+    filas = conn.exec_driver_sql(prefijo + str(compilado), params).fetchall()
+    return '\n'.join(' '.join(str(c) for c in fila) for fila in filas)
+
+
+def medir(repeticiones, etiqueta):
+    inflable_ids = [i for (i,) in db.session.query(Inflable.id)]
+    n_clientes = Cliente.query.count()
+    muestras = {}
+    ejemplo = None
+    for _ in range(repeticiones):
+        inicio = date.today() + timedelta(days=random.randint(-30, 180))
+        stmts = consultas(inicio, inicio + timedelta(days=2), random.choice(inflable_ids),
+                          f'+54 11 {random.randrange(n_clientes):08d}')
+        ejemplo = ejemplo or stmts
+        for nombre, stmt in stmts.items():
+            t0 = time.perf_counter()
+            db.session.execute(stmt).fetchall()
+            muestras.setdefault(nombre, []).append((time.perf_counter() - t0) * 1000)
+
+    print(f"\n=== {etiqueta} ===")
+    for nombre, stmt in ejemplo.items():
+        tiempos = sorted(muestras[nombre])
+        p95 = tiempos[int(len(tiempos) * 0.95) - 1] if len(tiempos) > 1 else tiempos[0]
+        print(f"\n- {nombre}: mediana {statistics.median(tiempos):.2f} ms, p95 {p95:.2f} ms")
+        print(plan(stmt))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reservas', type=int, default=1_000_000)
+    parser.add_argument('--inflables', type=int, default=200)
+    parser.add_argument('--clientes', type=int, default=5000)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        print(f"🔧 Poblando {db.engine.url.render_as_string(hide_password=True)}...")
+        poblar(args.reservas, args.inflables, args.clientes)
+
+        eliminar_indices()
+        analizar()
+        medir(args.repeticiones, 'Sin índices')
+
+        crear_indices()
+        analizar()
+        medir(args.repeticiones, 'Con índices')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+CPU de serialización y bytes transferidos de GET /api/reservas.
+
+Sobre las reservas de DATABASE_URL (p. ej. `python seed_data.py --masivo
+--reservas 100000`), compara el serializador anterior (dict armado a mano,
+isoformat y json de la biblioteca estándar como jsonify) con Esquema + a_json
+(orjson si está instalado), y mide el tamaño y el costo de cada codificación.
+Por último pide la ruta completa con el cliente de pruebas de Flask.
+
+    python -m benchmarks.serializacion --repeticiones 5 --salida serializacion.json
+"""
+
+import argparse
+import json
+import platform
+import time
+from datetime import datetime
+
+from werkzeug.datastructures import Accept
+
+from app import app, db, Reserva, COLUMNAS_RESERVA_LISTA, consulta_reservas, serializar_reserva_lista
+from respuestas import CODIFICACIONES, a_json, codificar, orjson
+
+
+def _isoformat(valor):
+    return valor.isoformat() if valor else None
+
+
+def serializar_anterior(r):
+    return {
+        'id': r.id,
+        'inflable': r.inflable,
+        'cliente': r.cliente,
+        'fecha_inicio': _isoformat(r.fecha_inicio),
+        'fecha_fin': _isoformat(r.fecha_fin),
+        'precio_total': r.precio_total,
+        'estado': r.estado,
+        'notas': r.notas
+    }
+
+
+def json_anterior(datos):
+    # Lo que hacía jsonify con el proveedor por defecto de Flask
+    return (json.dumps(datos, sort_keys=True, separators=(',', ':')) + '\n').encode()
+
+
+def medir(funcion, repeticiones):
+    """(mejor tiempo de CPU en ms, resultado)"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.process_time()
+        resultado = funcion()
+        duracion = (time.process_time() - inicio) * 1000
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return round(mejor, 1), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serialización y compresión de /api/reservas')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--minimo', type=int, default=1024, help='COMPRESION_MINIMO')
+    parser.add_argument('--salida', help='Guardar resultados en este JSON')
+    args = parser.parse_args()
+
+    with app.app_context():
+        dialecto = db.engine.dialect.name
+        filas = consulta_reservas(COLUMNAS_RESERVA_LISTA).order_by(Reserva.fecha_inicio, Reserva.id).all()
+    print(f"🏁 {dialecto}: {len(filas)} reservas, JSON con {'orjson' if orjson else 'json'}, "
+          f"codificaciones {', '.join(CODIFICACIONES)}")
+
+    resultados = {'serializacion': {}, 'codificacion': {}, 'ruta': {}}
+    for nombre, serializar, volcar in (
+        ('anterior', lambda filas: [serializar_anterior(r) for r in filas], json_anterior),
+        ('esquema', serializar_reserva_lista.lista, a_json),
+    ):
+        ms_dicts, datos = medir(lambda: serializar(filas), args.repeticiones)
+        ms_json, cuerpo = medir(lambda: volcar(datos), args.repeticiones)
+        resultados['serializacion'][nombre] = {
+            'dicts_ms': ms_dicts, 'json_ms': ms_json, 'total_ms': round(ms_dicts + ms_json, 1),
+            'bytes': len(cuerpo)
+        }
+        print(f"  {nombre:10} dicts {ms_dicts:8.1f} ms  json {ms_json:8.1f} ms  "
+              f"total {ms_dicts + ms_json:8.1f} ms  {len(cuerpo):>12,} bytes")
+
+    for codificacion in ('identity',) + CODIFICACIONES:
+        ms, (comprimido, _) = medir(lambda: codificar(cuerpo, Accept([(codificacion, 1)]), args.minimo),
+                                    args.repeticiones)
+        resultados['codificacion'][codificacion] = {'ms': ms, 'bytes': len(comprimido)}
+        print(f"  {codificacion:10} {ms:8.1f} ms  {len(comprimido):>12,} bytes "
+              f"({100 * len(comprimido) / len(cuerpo):.1f}%)")
+
+    cliente = app.test_client()
+    for codificacion in ('identity',) + CODIFICACIONES:
+        mejor = None
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            respuesta = cliente.get('/api/reservas', headers={'Accept-Encoding': codificacion})
+            duracion = (time.perf_counter() - inicio) * 1000
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        resultados['ruta'][codificacion] = {'ms': round(mejor, 1), 'bytes': len(respuesta.get_data())}
+        print(f"  GET /api/reservas [{codificacion:8}] {mejor:8.1f} ms  "
+              f"{len(respuesta.get_data()):>12,} bytes")
+
+    if args.salida:
+        with open(args.salida, 'w') as f:
+            json.dump({
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'base': dialecto,
+                'python': platform.python_version(),
+                'reservas': len(filas),
+                'orjson': orjson is not None,
+                **resultados,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
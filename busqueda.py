@@ -0,0 +1,118 @@
+"""
+Búsqueda de clientes por nombre, email o teléfono.
+
+En PostgreSQL la resuelve la base con índices de trigramas (pg_trgm). En
+SQLite, que no los tiene, cada proceso arma un IndiceClientes: por cada
+trigrama, los ids de los clientes que lo contienen. Una búsqueda toma la
+lista del trigrama menos frecuente de la consulta y verifica cada candidato,
+en vez de recorrer toda la tabla.
+
+Las dos variantes devuelven lo mismo: con 3 o más caracteres, clientes con la
+consulta en cualquier parte del nombre, email o teléfono; con menos, solo los
+que empiezan con ella. Sin distinguir mayúsculas, ordenados por nombre e id.
+Como el índice de disponibilidad, el índice es por proceso y se reconstruye
+al invalidarse o al vencer el TTL.
+"""
+
+import heapq
+import threading
+import time
+from array import array
+
+LARGO_SUBCADENA = 3  # desde aquí se busca en cualquier parte, antes solo prefijos
+
+
+def normalizar_telefono(telefono):
+    """Solo los dígitos; si no tiene ninguno, el texto sin espacios de los bordes"""
+    telefono = str(telefono or '').strip()
+    return ''.join(c for c in telefono if c.isdigit()) or telefono
+
+
+def normalizar_consulta(texto):
+    return ' '.join(str(texto or '').lower().split())
+
+
+def patron_busqueda(consulta):
+    """Patrón LIKE de la consulta (ya normalizada), con los comodines escapados"""
+    escapada = consulta.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    if len(consulta) >= LARGO_SUBCADENA:
+        return f'%{escapada}%'
+    return f'{escapada}%'
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceClientes:
+    def __init__(self, cargador, ttl=None):
+        """
+        cargador: función sin argumentos que devuelve un iterable de
+        (id, nombre, email, telefono_normalizado).
+        ttl: segundos tras los cuales se reconstruye; None para no vencer nunca.
+        """
+        self._cargador = cargador
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        self._construido_en = None
+        self._campos = {}  # cliente_id -> (nombre, email, telefono) en minúsculas
+        self._trigramas = {}  # trigrama -> array de cliente_id
+        self._prefijos = {}  # primeros 1 y 2 caracteres de cada campo -> array de cliente_id
+
+    def invalidar(self):
+        with self._lock:
+            self._construido_en = None
+
+    def reconstruir(self):
+        with self._lock:
+            self._campos = {}
+            self._trigramas = {}
+            self._prefijos = {}
+            for fila in self._cargador():
+                self._agregar(*fila)
+            self._construido_en = time.monotonic()
+
+    def _asegurar(self):
+        if self._construido_en is None or (
+            self._ttl is not None and time.monotonic() - self._construido_en > self._ttl
+        ):
+            self.reconstruir()
+
+    def _agregar(self, cliente_id, nombre, email, telefono):
+        campos = tuple(normalizar_consulta(c) for c in (nombre, email, telefono))
+        self._campos[cliente_id] = campos
+        for trigrama in set().union(*map(_trigramas, campos)):
+            self._trigramas.setdefault(trigrama, array('l')).append(cliente_id)
+        for prefijo in {c[:n] for c in campos for n in (1, 2) if len(c) >= n}:
+            self._prefijos.setdefault(prefijo, array('l')).append(cliente_id)
+
+    def registrar(self, cliente_id, nombre, email, telefono):
+        """Reflejar el alta de un cliente"""
+        with self._lock:
+            if self._construido_en is not None and cliente_id not in self._campos:
+                self._agregar(cliente_id, nombre, email, telefono)
+
+    def _candidatos(self, consulta):
+        if len(consulta) < LARGO_SUBCADENA:
+            return self._prefijos.get(consulta, ()), lambda c: c.startswith(consulta)
+        listas = [self._trigramas.get(t, ()) for t in _trigramas(consulta)]
+        return min(listas, key=len), lambda c: consulta in c
+
+    def buscar(self, consulta, limite, despues_de=None):
+        """Hasta limite ids que coinciden con la consulta, ordenados por (nombre, id),
+        posteriores al cliente despues_de si se indica"""
+        consulta = normalizar_consulta(consulta)
+        with self._lock:
+            self._asegurar()
+            if despues_de is not None and despues_de not in self._campos:
+                return []
+            desde = (self._campos[despues_de][0], despues_de) if despues_de is not None else None
+            candidatos, coincide = self._candidatos(consulta)
+            claves = (
+                (campos[0], cliente_id)
+                for cliente_id, campos in ((i, self._campos[i]) for i in candidatos)
+                if any(coincide(c) for c in campos)
+            )
+            if desde is not None:
+                claves = (k for k in claves if k > desde)
+            return [cliente_id for _, cliente_id in heapq.nsmallest(limite, claves)]
@@ -0,0 +1,111 @@
+"""
+Cache versionado con backend intercambiable.
+
+Cada cache tiene un número de versión guardado en el backend y las claves se
+guardan bajo esa versión. Invalidar solo sube la versión: las entradas viejas
+dejan de leerse y el backend las descarta (LRU o TTL).
+
+- BackendMemoria: LRU en el proceso. Cada worker tiene el suyo, así que el
+  TTL acota cuánto tarda en ver invalidaciones hechas por otro worker.
+- BackendRedis: cualquier cliente con la interfaz de redis-py (get/set/incr),
+  compartido entre workers.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class BackendMemoria:
+    def __init__(self, max_entradas=256):
+        self._max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # clave -> (expira_en, valor)
+        self._versiones = {}  # fuera del LRU: una versión nunca se descarta
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            expira_en, valor = entrada
+            if expira_en is not None and time.monotonic() > expira_en:
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor, ttl=None):
+        with self._lock:
+            expira_en = time.monotonic() + ttl if ttl is not None else None
+            self._entradas[clave] = (expira_en, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self._max_entradas:
+                self._entradas.popitem(last=False)
+
+    def version(self, nombre):
+        return self._versiones.get(nombre, 0)
+
+    def subir_version(self, nombre):
+        with self._lock:
+            self._versiones[nombre] = self._versiones.get(nombre, 0) + 1
+            return self._versiones[nombre]
+
+
+class BackendRedis:
+    def __init__(self, cliente, prefijo='inflables:'):
+        self._cliente = cliente
+        self._prefijo = prefijo
+
+    def get(self, clave):
+        valor = self._cliente.get(self._prefijo + clave)
+        return pickle.loads(valor) if valor is not None else None
+
+    def set(self, clave, valor, ttl=None):
+        self._cliente.set(self._prefijo + clave, pickle.dumps(valor), ex=ttl)
+
+    def version(self, nombre):
+        valor = self._cliente.get(self._prefijo + nombre + ':version')
+        return int(valor) if valor is not None else 0
+
+    def subir_version(self, nombre):
+        return self._cliente.incr(self._prefijo + nombre + ':version')
+
+
+def crear_backend(redis_url=None, max_entradas=256):
+    """Backend Redis si hay URL (requiere el paquete redis); si no, memoria"""
+    if redis_url:
+        import redis
+        return BackendRedis(redis.Redis.from_url(redis_url))
+    return BackendMemoria(max_entradas)
+
+
+class CacheVersionado:
+    def __init__(self, nombre, backend, ttl=None):
+        self._nombre = nombre
+        self._backend = backend
+        self._ttl = ttl
+
+    @property
+    def version(self):
+        return self._backend.version(self._nombre)
+
+    def invalidar(self):
+        """Subir la versión; devuelve la nueva"""
+        return self._backend.subir_version(self._nombre)
+
+    def _clave(self, clave, version):
+        return f'{self._nombre}:{version}:{clave}'
+
+    def obtener(self, clave):
+        return self._backend.get(self._clave(clave, self.version))
+
+    def guardar(self, clave, valor, version=None):
+        """Guardar valor; version es la vigente cuando se empezó a calcular.
+
+        Si hubo una invalidación mientras se calculaba, el valor queda bajo
+        la versión vieja y nunca se lee.
+        """
+        version = self.version if version is None else version
+        self._backend.set(self._clave(clave, version), valor, self._ttl)
@@ -0,0 +1,101 @@
+"""
+Feed de cambios en memoria.
+
+Los endpoints que modifican reservas o inflables agregan una fila a la tabla
+`cambio` en la misma transacción; su id es el cursor de /api/cambios. Cada
+worker guarda los últimos cambios leídos en un DifusorCambios: todas las
+peticiones de polling y los streams SSE del proceso comparten una misma
+consulta por intervalo, así que la carga sobre la base no crece con la
+cantidad de paneles abiertos. Los cursores anteriores a lo que hay en
+memoria se resuelven consultando la base.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class DifusorCambios:
+    def __init__(self, cargador, cursor_actual, intervalo=1.0, capacidad=1000):
+        """
+        cargador: función (desde, limite) que devuelve los cambios con id > desde,
+        como dicts con 'id', ordenados por id.
+        cursor_actual: función sin argumentos que devuelve el último id (0 si no hay).
+        intervalo: segundos mínimos entre dos lecturas de la base.
+        """
+        self._cargador = cargador
+        self._cursor_actual = cursor_actual
+        self._intervalo = intervalo
+        self._capacidad = capacidad
+        self._lock = threading.Lock()
+        self._nuevos = threading.Condition(self._lock)
+        self._cambios = deque()
+        self._inicio = None  # cursor desde el que _cambios está completo
+        self._ultimo = None
+        self._leido_en = None
+
+    def avisar(self):
+        """Forzar la lectura en la próxima consulta (tras un commit de este proceso)"""
+        with self._lock:
+            self._leido_en = None
+
+    def _actualizar(self):
+        ahora = time.monotonic()
+        if self._leido_en is not None and ahora - self._leido_en < self._intervalo:
+            return
+        if self._ultimo is None:
+            self._inicio = self._ultimo = self._cursor_actual()
+        else:
+            while True:
+                nuevos = self._cargador(self._ultimo, self._capacidad)
+                for cambio in nuevos:
+                    if len(self._cambios) == self._capacidad:
+                        self._inicio = self._cambios.popleft()['id']
+                    self._cambios.append(cambio)
+                if nuevos:
+                    self._ultimo = nuevos[-1]['id']
+                    self._nuevos.notify_all()
+                if len(nuevos) < self._capacidad:
+                    break
+        self._leido_en = time.monotonic()
+
+    def cursor(self):
+        with self._lock:
+            self._actualizar()
+            return self._ultimo
+
+    def desde(self, cursor, limite):
+        """(cambios posteriores a cursor, nuevo cursor, hay_mas), o None si el
+        cursor es anterior a lo que hay en memoria"""
+        with self._lock:
+            self._actualizar()
+            if cursor >= self._ultimo:
+                return [], cursor, False
+            if cursor < self._inicio:
+                return None
+            cambios = [c for c in self._cambios if c['id'] > cursor]
+            if len(cambios) > limite:
+                return cambios[:limite], cambios[limite - 1]['id'], True
+            return cambios, self._ultimo, False
+
+    def esperar(self, cursor, timeout):
+        """Bloquear hasta que haya cambios posteriores a cursor o pase timeout"""
+        limite = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                self._actualizar()
+                restante = limite - time.monotonic()
+                if self._ultimo > cursor or restante <= 0:
+                    return
+                # Un solo hilo lee la base por intervalo; el resto lo espera
+                self._nuevos.wait(min(restante, self._intervalo))
+
+
+def compactar(cambios):
+    """Dejar solo el último cambio de cada entidad, en orden de id"""
+    ultimos = {}
+    for cambio in cambios:
+        clave = (cambio['entidad'], cambio['entidad_id'])
+        ultimos.pop(clave, None)
+        ultimos[clave] = cambio
+    return list(ultimos.values())
@@ -0,0 +1,134 @@
+"""
+Índice de disponibilidad en memoria.
+
+Guarda, por inflable, la lista de reservas activas ordenada por fecha de
+inicio. Así "¿qué inflables están libres entre A y B?" se responde con una
+búsqueda binaria por inflable, sin consultar la base.
+
+El índice es por proceso: cada worker lo reconstruye desde la base la primera
+vez que se usa, cuando se invalida, cuando vence el TTL y, si se le da una
+versión compartida (la de un CacheVersionado con Redis), cuando otro worker
+la sube al escribir. La validación de solapamiento al reservar sigue
+haciéndose en la base.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from bisect import bisect_left, bisect_right, insort
+
+
+class IndiceDisponibilidad:
+    def __init__(self, cargador, ttl=None, version=None):
+        """
+        cargador: función sin argumentos que devuelve (reservas, inflables), donde
+        reservas es un iterable de (id, inflable_id, fecha_inicio, fecha_fin) con
+        las reservas activas e inflables una lista de dicts de inflables activos.
+        ttl: segundos tras los cuales se reconstruye; None para no vencer nunca.
+        version: función sin argumentos que devuelve la versión compartida del
+        índice; se reconstruye si cambió desde la última vez. None: sin versión.
+        """
+        self._cargador = cargador
+        self._ttl = ttl
+        self._version = version
+        self._lock = threading.RLock()
+        self._construido_en = None
+        self._construido_version = None
+        self._intervalos = {}  # inflable_id -> [(inicio, fin, reserva_id)] ordenada
+        self._max_duracion = {}  # inflable_id -> timedelta más larga vista
+        self._por_reserva = {}  # reserva_id -> (inflable_id, intervalo)
+        self._inflables = []
+
+    def invalidar(self):
+        with self._lock:
+            self._construido_en = None
+
+    def reconstruir(self):
+        with self._lock:
+            # Leída antes de cargar: una escritura durante la carga fuerza otra
+            version = self._version() if self._version is not None else None
+            reservas, inflables = self._cargador()
+            self._intervalos = {}
+            self._max_duracion = {}
+            self._por_reserva = {}
+            for reserva_id, inflable_id, inicio, fin in reservas:
+                self._agregar(reserva_id, inflable_id, inicio, fin, ordenado=False)
+            for lista in self._intervalos.values():
+                lista.sort()
+            self._inflables = list(inflables)
+            self._construido_en = time.monotonic()
+            self._construido_version = version
+
+    def _asegurar(self):
+        if self._construido_en is None or (
+            self._ttl is not None and time.monotonic() - self._construido_en > self._ttl
+        ) or (
+            self._version is not None and self._version() != self._construido_version
+        ):
+            self.reconstruir()
+
+    def al_dia(self, version):
+        """Después de registrar() o quitar() lo que escribió este proceso y de
+        subir la versión compartida a version: si nadie más la subió en el
+        medio, el índice ya está al día y no hace falta reconstruirlo"""
+        with self._lock:
+            if self._construido_version is not None and self._construido_version == version - 1:
+                self._construido_version = version
+
+    def _agregar(self, reserva_id, inflable_id, inicio, fin, ordenado=True):
+        intervalo = (inicio, fin, reserva_id)
+        lista = self._intervalos.setdefault(inflable_id, [])
+        if ordenado:
+            insort(lista, intervalo)
+        else:
+            lista.append(intervalo)
+        duracion = fin - inicio
+        if duracion >= self._max_duracion.get(inflable_id, timedelta(0)):
+            self._max_duracion[inflable_id] = duracion
+        self._por_reserva[reserva_id] = (inflable_id, intervalo)
+
+    def _quitar(self, reserva_id):
+        entrada = self._por_reserva.pop(reserva_id, None)
+        if entrada is None:
+            return
+        inflable_id, intervalo = entrada
+        lista = self._intervalos[inflable_id]
+        posicion = bisect_left(lista, intervalo)
+        if posicion < len(lista) and lista[posicion] == intervalo:
+            del lista[posicion]
+
+    def registrar(self, reserva_id, inflable_id, inicio, fin, activa=True):
+        """Reflejar el alta o modificación de una reserva"""
+        with self._lock:
+            if self._construido_en is None:
+                return
+            self._quitar(reserva_id)
+            if activa:
+                self._agregar(reserva_id, inflable_id, inicio, fin)
+
+    def quitar(self, reserva_id):
+        """Reflejar la baja de una reserva"""
+        with self._lock:
+            if self._construido_en is not None:
+                self._quitar(reserva_id)
+
+    def _ocupado(self, inflable_id, inicio, fin):
+        lista = self._intervalos.get(inflable_id)
+        if not lista:
+            return False
+        # Un intervalo que se solapa con [inicio, fin] empieza, como muy
+        # temprano, inicio - max_duracion; basta recorrer desde ahí hasta fin.
+        desde = bisect_left(lista, (inicio - self._max_duracion[inflable_id],))
+        hasta = bisect_right(lista, (fin, date.max))
+        return any(f >= inicio for _, f, _ in lista[desde:hasta])
+
+    def ocupado(self, inflable_id, inicio, fin):
+        with self._lock:
+            self._asegurar()
+            return self._ocupado(inflable_id, inicio, fin)
+
+    def disponibles(self, inicio, fin):
+        """Inflables activos sin reservas activas que se solapen con [inicio, fin]"""
+        with self._lock:
+            self._asegurar()
+            return [i for i in self._inflables if not self._ocupado(i['id'], inicio, fin)]
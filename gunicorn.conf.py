@@ -0,0 +1,48 @@
+"""
+Configuración de gunicorn para producción:
+
+    gunicorn 'app:create_app()'
+
+Un proceso por núcleo disponible (más uno) con varios hilos cada uno: las
+peticiones pasan casi todo el tiempo esperando a la base, así que los hilos
+aprovechan esa espera y los procesos reparten el trabajo de Python entre
+núcleos. WEB_CONCURRENCY y GUNICORN_THREADS permiten ajustarlo.
+
+Cada worker importa la aplicación por separado (sin preload_app) y llama a
+create_app(): tiene su propio pool de conexiones, índice de disponibilidad,
+caches en memoria, métricas y hilo de tareas periódicas.
+"""
+
+import os
+
+
+def _nucleos():
+    # Respeta los núcleos asignados al contenedor/proceso, no los de la máquina
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '5001')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', _nucleos() + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Reciclar workers de a poco para acotar fugas de memoria
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = '-'
+errorlog = '-'
+
+# Una conexión por hilo, más margen para picos y los callbacks de imágenes
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+os.environ.setdefault('DB_MAX_OVERFLOW', str(threads))
+
+
+def on_starting(server):
+    # JS/CSS con huella y precomprimidos (ver recursos.py), una vez en el master
+    from recursos import construir
+    construir(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
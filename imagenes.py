@@ -0,0 +1,105 @@
+"""
+Procesamiento de imágenes de inflables.
+
+A partir del original subido genera variantes redimensionadas en formatos
+modernos (WebP y, si Pillow lo soporta, AVIF), sin metadatos y guardadas en un
+almacén direccionado por contenido, de modo que se pueden cachear para
+siempre. La codificación corre en un pool de procesos, fuera del hilo que
+atiende la petición.
+"""
+
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+from almacen import AlmacenContenido
+
+logger = logging.getLogger('inflables.imagenes')
+
+# Anchos en píxeles de las variantes (miniatura, tarjeta, detalle)
+ANCHOS = (320, 640, 1280)
+CALIDAD = {'webp': 80, 'avif': 60}
+
+
+def formatos_disponibles():
+    formatos = ['webp']
+    if features.check('avif'):
+        formatos.insert(0, 'avif')
+    return formatos
+
+
+def _anchos_para(ancho_original):
+    # Nunca se agranda: las variantes mayores que el original se reemplazan
+    # por una al tamaño original
+    anchos = [a for a in ANCHOS if a < ancho_original]
+    anchos.append(min(ancho_original, ANCHOS[-1]))
+    return sorted(set(anchos))
+
+
+def generar_variantes(ruta_original, directorio, url_base):
+    """Generar las variantes de una imagen y devolver su descripción.
+
+    Devuelve {formato: {'srcset': str, 'variantes': [{'ancho', 'url'}]}},
+    con los formatos en orden de preferencia.
+    """
+    almacen = AlmacenContenido(directorio, url_base)
+    with Image.open(ruta_original) as original:
+        # Aplicar la orientación EXIF antes de descartar los metadatos
+        imagen = ImageOps.exif_transpose(original)
+        imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() else 'RGB')
+
+    resultado = {}
+    for formato in formatos_disponibles():
+        variantes = []
+        for ancho in _anchos_para(imagen.width):
+            alto = max(1, round(imagen.height * ancho / imagen.width))
+            redimensionada = imagen.resize((ancho, alto), Image.LANCZOS)
+            buffer = io.BytesIO()
+            # Sin exif/icc_profile: Pillow no copia metadatos si no se le pasan
+            redimensionada.save(buffer, formato.upper(), quality=CALIDAD[formato])
+            buffer.seek(0)
+            variantes.append({'ancho': ancho, 'url': almacen.guardar(buffer, formato)})
+        resultado[formato] = {
+            'srcset': ', '.join(f"{v['url']} {v['ancho']}w" for v in variantes),
+            'variantes': variantes,
+        }
+    return resultado
+
+
+class ProcesadorImagenes:
+    def __init__(self, directorio, url_base, max_workers=2):
+        self.directorio = directorio
+        self.url_base = url_base
+        self._max_workers = max_workers
+        self._pool = None
+
+    def _obtener_pool(self):
+        # El pool se crea al primer uso, ya dentro del worker que lo necesita
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._pool
+
+    def enviar(self, ruta_original, al_terminar):
+        """Procesar en segundo plano; al_terminar(resultado) se llama al finalizar.
+
+        Si falla, al_terminar no se llama y se devuelve el error en el future.
+        """
+        futuro = self._obtener_pool().submit(
+            generar_variantes, ruta_original, self.directorio, self.url_base
+        )
+
+        def _callback(f):
+            if f.exception() is None:
+                al_terminar(f.result())
+            else:
+                logger.error('Error procesando %s', ruta_original, exc_info=f.exception(),
+                             extra={'imagen': ruta_original})
+
+        futuro.add_done_callback(_callback)
+        return futuro
+
+    def procesar(self, ruta_original):
+        """Procesar en el hilo actual (para comandos de línea)"""
+        return generar_variantes(ruta_original, self.directorio, self.url_base)
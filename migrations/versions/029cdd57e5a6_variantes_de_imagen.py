@@ -0,0 +1,26 @@
+"""variantes de imagen
+
+Revision ID: 029cdd57e5a6
+Revises: f4bc2ccef78b
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '029cdd57e5a6'
+down_revision = 'f4bc2ccef78b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inflable', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('imagen_variantes', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('inflable', schema=None) as batch_op:
+        batch_op.drop_column('imagen_variantes')
@@ -0,0 +1,100 @@
+"""resumen mensual
+
+Revision ID: 167336e61b58
+Revises: dbed97e50a0b
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '167336e61b58'
+down_revision = 'dbed97e50a0b'
+branch_labels = None
+depends_on = None
+
+# Fechas por dialecto: inicio del mes, mes siguiente, último día del mes y
+# días entre dos fechas
+FECHAS = {
+    'postgresql': {
+        'inicio_mes': "date_trunc('month', {})::date",
+        'mes_siguiente': "({} + interval '1 month')::date",
+        'ultimo_dia': "({} + interval '1 month' - interval '1 day')::date",
+        'dias': "({1} - {0})",
+        'menor': 'LEAST',
+        'mayor': 'GREATEST',
+    },
+    'sqlite': {
+        'inicio_mes': "date({}, 'start of month')",
+        'mes_siguiente': "date({}, '+1 month')",
+        'ultimo_dia': "date({}, '+1 month', '-1 day')",
+        'dias': "CAST(julianday({1}) - julianday({0}) AS INTEGER)",
+        'menor': 'MIN',
+        'mayor': 'MAX',
+    },
+}
+
+# Igual que analitica.agregar_mensual: cada reserva se reparte entre los
+# meses que ocupa, con días e ingresos proporcionales a los días. Las
+# reservas viejas sin estado cuentan como pendientes (estado es parte de la
+# clave primaria), igual que en sentencias_resumen
+LLENAR_RESUMEN = """
+INSERT INTO resumen_mensual (mes, inflable_id, estado, reservas, dias, ingresos, primer_inicio)
+WITH RECURSIVE tramos (inflable_id, estado, fecha_inicio, fecha_fin, precio_total, mes) AS (
+    SELECT inflable_id, COALESCE(estado, 'pendiente'), fecha_inicio, fecha_fin, precio_total,
+           {inicio_mes_reserva}
+    FROM reserva
+    UNION ALL
+    SELECT inflable_id, estado, fecha_inicio, fecha_fin, precio_total, {siguiente} FROM tramos
+    WHERE {siguiente} <= fecha_fin
+)
+SELECT mes, inflable_id, estado,
+       SUM(CASE WHEN fecha_inicio >= mes THEN 1 ELSE 0 END),
+       SUM(dias),
+       SUM(COALESCE(precio_total, 0) * dias / total_dias),
+       MIN(fecha_inicio)
+FROM (
+    SELECT mes, inflable_id, estado, fecha_inicio, precio_total,
+           {dias_en_mes} + 1 AS dias,
+           {dias_reserva} + 1 AS total_dias
+    FROM tramos
+) AS dias_por_mes
+GROUP BY mes, inflable_id, estado
+"""
+
+
+def _llenar_resumen():
+    fechas = FECHAS.get(op.get_bind().dialect.name)
+    if fechas is None:
+        # Otra base: se llena con `flask --app app refrescar-resumen`
+        return
+    op.execute(LLENAR_RESUMEN.format(
+        inicio_mes_reserva=fechas['inicio_mes'].format('fecha_inicio'),
+        siguiente=fechas['mes_siguiente'].format('mes'),
+        dias_en_mes=fechas['dias'].format(
+            f"{fechas['mayor']}(fecha_inicio, mes)",
+            f"{fechas['menor']}(fecha_fin, {fechas['ultimo_dia'].format('mes')})",
+        ),
+        dias_reserva=fechas['dias'].format('fecha_inicio', 'fecha_fin'),
+    ))
+
+
+def upgrade():
+    op.create_table('resumen_mensual',
+    sa.Column('mes', sa.Date(), nullable=False),
+    sa.Column('inflable_id', sa.Integer(), nullable=False),
+    sa.Column('estado', sa.String(length=20), nullable=False),
+    sa.Column('reservas', sa.Integer(), nullable=False),
+    sa.Column('dias', sa.Integer(), nullable=False),
+    sa.Column('ingresos', sa.Float(), nullable=False),
+    sa.Column('primer_inicio', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['inflable_id'], ['inflable.id'], ),
+    sa.PrimaryKeyConstraint('mes', 'inflable_id', 'estado')
+    )
+    _llenar_resumen()
+
+
+def downgrade():
+    op.drop_table('resumen_mensual')
@@ -0,0 +1,26 @@
+"""version de reserva
+
+Revision ID: 5a0e9c3d7b21
+Revises: 167336e61b58
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a0e9c3d7b21'
+down_revision = '167336e61b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reserva', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('reserva', schema=None) as batch_op:
+        batch_op.drop_column('version')
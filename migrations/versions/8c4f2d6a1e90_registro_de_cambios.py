@@ -0,0 +1,31 @@
+"""registro de cambios
+
+Revision ID: 8c4f2d6a1e90
+Revises: 5a0e9c3d7b21
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4f2d6a1e90'
+down_revision = '5a0e9c3d7b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cambio',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('entidad', sa.String(length=20), nullable=False),
+    sa.Column('entidad_id', sa.Integer(), nullable=False),
+    sa.Column('operacion', sa.String(length=20), nullable=False),
+    sa.Column('fecha', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('cambio')
@@ -0,0 +1,45 @@
+"""tareas periodicas
+
+Revision ID: a3f8e2c6b4d1
+Revises: e5c1a7b3d9f2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f8e2c6b4d1'
+down_revision = 'e5c1a7b3d9f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ejecucion_tarea',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tarea', sa.String(length=50), nullable=False),
+    sa.Column('inicio', sa.DateTime(), nullable=False),
+    sa.Column('segundos', sa.Float(), nullable=False),
+    sa.Column('filas', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ejecucion_tarea', schema=None) as batch_op:
+        batch_op.create_index('ix_ejecucion_tarea_tarea_inicio', ['tarea', 'inicio'], unique=False)
+
+    with op.batch_alter_table('reserva', schema=None) as batch_op:
+        batch_op.create_index('ix_reserva_activa_fecha_fin', ['fecha_fin'], unique=False,
+                              postgresql_where=sa.text("estado IN ('pendiente', 'confirmada')"),
+                              sqlite_where=sa.text("estado IN ('pendiente', 'confirmada')"))
+
+
+def downgrade():
+    with op.batch_alter_table('reserva', schema=None) as batch_op:
+        batch_op.drop_index('ix_reserva_activa_fecha_fin')
+
+    with op.batch_alter_table('ejecucion_tarea', schema=None) as batch_op:
+        batch_op.drop_index('ix_ejecucion_tarea_tarea_inicio')
+
+    op.drop_table('ejecucion_tarea')
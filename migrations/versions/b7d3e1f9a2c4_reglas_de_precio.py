@@ -0,0 +1,35 @@
+"""reglas de precio
+
+Revision ID: b7d3e1f9a2c4
+Revises: 8c4f2d6a1e90
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e1f9a2c4'
+down_revision = '8c4f2d6a1e90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('regla_precio',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('inflable_id', sa.Integer(), nullable=True),
+    sa.Column('factor', sa.Float(), nullable=False),
+    sa.Column('desde', sa.Date(), nullable=True),
+    sa.Column('hasta', sa.Date(), nullable=True),
+    sa.Column('dias_minimos', sa.Integer(), nullable=True),
+    sa.Column('descripcion', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['inflable_id'], ['inflable.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('regla_precio')
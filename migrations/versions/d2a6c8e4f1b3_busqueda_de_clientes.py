@@ -0,0 +1,62 @@
+"""busqueda de clientes
+
+Revision ID: d2a6c8e4f1b3
+Revises: b7d3e1f9a2c4
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a6c8e4f1b3'
+down_revision = 'b7d3e1f9a2c4'
+branch_labels = None
+depends_on = None
+
+COLUMNAS_TRIGRAMAS = ('nombre', 'email', 'telefono_normalizado')
+
+
+def normalizar_telefono(telefono):
+    # Copia de busqueda.normalizar_telefono al momento de esta migración
+    telefono = str(telefono or '').strip()
+    return ''.join(c for c in telefono if c.isdigit()) or telefono
+
+
+def upgrade():
+    with op.batch_alter_table('cliente', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('telefono_normalizado', sa.String(length=20), nullable=True))
+        batch_op.create_index(batch_op.f('ix_cliente_telefono_normalizado'), ['telefono_normalizado'], unique=False)
+
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        # Mismo criterio que busqueda.normalizar_telefono
+        op.execute(
+            "UPDATE cliente SET telefono_normalizado = "
+            "COALESCE(NULLIF(regexp_replace(telefono, '[^0-9]', '', 'g'), ''), btrim(COALESCE(telefono, '')))"
+        )
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for columna in COLUMNAS_TRIGRAMAS:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_cliente_{columna}_trgm ON cliente "
+                f"USING gin ({columna} gin_trgm_ops)"
+            )
+    else:
+        cliente = sa.table('cliente', sa.column('id', sa.Integer), sa.column('telefono_normalizado', sa.String))
+        filas = conn.execute(sa.text("SELECT id, telefono FROM cliente")).all()
+        if filas:
+            conn.execute(
+                cliente.update().where(cliente.c.id == sa.bindparam('cliente_id')),
+                [{'cliente_id': i, 'telefono_normalizado': normalizar_telefono(t)} for i, t in filas]
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for columna in COLUMNAS_TRIGRAMAS:
+            op.execute(f"DROP INDEX IF EXISTS ix_cliente_{columna}_trgm")
+
+    with op.batch_alter_table('cliente', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cliente_telefono_normalizado'))
+        batch_op.drop_column('telefono_normalizado')
@@ -0,0 +1,24 @@
+"""indice de paginacion de reservas
+
+Revision ID: dbed97e50a0b
+Revises: 029cdd57e5a6
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dbed97e50a0b'
+down_revision = '029cdd57e5a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_reserva_fecha_inicio_id', 'reserva', ['fecha_inicio', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_reserva_fecha_inicio_id', table_name='reserva')
@@ -0,0 +1,158 @@
+"""particiones de reservas
+
+Revision ID: e5c1a7b3d9f2
+Revises: d2a6c8e4f1b3
+Create Date: 2026-10-18 23:00:00.000000
+
+Crea reserva_archivo en todas las bases. En PostgreSQL (13 o posterior)
+además convierte reserva en una tabla particionada por año de fecha_inicio:
+copia las filas a la tabla nueva, así que bloquea las reservas mientras
+dura. La restricción de exclusión pasa a ser un trigger equivalente (ver
+SOLAPAMIENTO_RESERVA en app.py): en cada partición no vería los solapamientos
+entre reservas que empiezan en particiones distintas.
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c1a7b3d9f2'
+down_revision = 'd2a6c8e4f1b3'
+branch_labels = None
+depends_on = None
+
+COLUMNAS = ('id, inflable_id, cliente_id, fecha_inicio, fecha_fin, precio_total, estado, notas, '
+            'fecha_creacion, version')
+INDICES = {
+    'ix_reserva_disponibilidad': '(inflable_id, estado, fecha_inicio, fecha_fin)',
+    'ix_reserva_fecha_inicio_id': '(fecha_inicio, id)',
+    'ix_reserva_rango_activo': "USING gist (daterange(fecha_inicio, fecha_fin, '[]')) "
+                               "WHERE estado IN ('pendiente', 'confirmada')",
+}
+# Copia de SOLAPAMIENTO_RESERVA de app.py al momento de esta migración
+FUNCION_SOLAPAMIENTO = """
+CREATE OR REPLACE FUNCTION reserva_sin_solapamiento() RETURNS trigger AS $$
+BEGIN
+    IF NEW.estado IN ('pendiente', 'confirmada') THEN
+        PERFORM pg_advisory_xact_lock(1380275030, NEW.inflable_id);
+        IF EXISTS (
+            SELECT 1 FROM reserva
+            WHERE inflable_id = NEW.inflable_id AND id <> NEW.id
+              AND estado IN ('pendiente', 'confirmada')
+              AND fecha_inicio <= NEW.fecha_fin
+              AND daterange(fecha_inicio, fecha_fin, '[]') && daterange(NEW.fecha_inicio, NEW.fecha_fin, '[]')
+        ) THEN
+            RAISE EXCEPTION 'La reserva se solapa con otra activa del mismo inflable'
+                USING ERRCODE = 'exclusion_violation', CONSTRAINT = 'reserva_sin_solapamiento';
+        END IF;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _crear_indices(tabla):
+    for nombre, definicion in INDICES.items():
+        op.execute(f"CREATE INDEX {nombre} ON {tabla} {definicion}")
+
+
+def upgrade():
+    es_pg = op.get_bind().dialect.name == 'postgresql'
+    op.create_table('reserva_archivo',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('inflable_id', sa.Integer(), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_inicio', sa.Date(), nullable=False),
+    sa.Column('fecha_fin', sa.Date(), nullable=False),
+    sa.Column('precio_total', sa.Float(), nullable=False),
+    sa.Column('estado', sa.String(length=20), nullable=True),
+    sa.Column('notas', sa.Text(), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.ForeignKeyConstraint(['cliente_id'], ['cliente.id'], ),
+    sa.ForeignKeyConstraint(['inflable_id'], ['inflable.id'], ),
+    sa.PrimaryKeyConstraint(*(('id', 'fecha_inicio') if es_pg else ('id',))),
+    postgresql_partition_by='RANGE (fecha_inicio)'
+    )
+    with op.batch_alter_table('reserva_archivo', schema=None) as batch_op:
+        batch_op.create_index('ix_reserva_archivo_disponibilidad',
+                              ['inflable_id', 'estado', 'fecha_inicio', 'fecha_fin'], unique=False)
+        batch_op.create_index('ix_reserva_archivo_fecha_inicio_id', ['fecha_inicio', 'id'], unique=False)
+
+    if not es_pg:
+        return
+
+    conn = op.get_bind()
+    op.execute("ALTER TABLE reserva DROP CONSTRAINT IF EXISTS reserva_sin_solapamiento")
+    op.execute("ALTER TABLE reserva RENAME TO reserva_sin_particionar")
+    op.execute("ALTER TABLE reserva_sin_particionar DROP CONSTRAINT reserva_pkey")
+    for nombre in INDICES:
+        op.execute(f"DROP INDEX IF EXISTS {nombre}")
+
+    op.execute("CREATE TABLE reserva (LIKE reserva_sin_particionar INCLUDING DEFAULTS) "
+               "PARTITION BY RANGE (fecha_inicio)")
+    op.execute("ALTER SEQUENCE reserva_id_seq OWNED BY reserva.id")
+    op.execute("ALTER TABLE reserva ADD CONSTRAINT reserva_pkey PRIMARY KEY (id, fecha_inicio)")
+    op.execute("ALTER TABLE reserva ADD FOREIGN KEY (inflable_id) REFERENCES inflable (id)")
+    op.execute("ALTER TABLE reserva ADD FOREIGN KEY (cliente_id) REFERENCES cliente (id)")
+    _crear_indices('reserva')
+
+    # Un año por partición para lo que ya hay, este año y el próximo;
+    # mantener-particiones crea las siguientes
+    anios = set(conn.execute(sa.text(
+        "SELECT DISTINCT CAST(extract(year FROM fecha_inicio) AS integer) FROM reserva_sin_particionar"
+    )).scalars())
+    anios.update((date.today().year, date.today().year + 1))
+    for anio in sorted(anios):
+        op.execute(f"CREATE TABLE reserva_{anio} PARTITION OF reserva "
+                   f"FOR VALUES FROM ('{anio}-01-01') TO ('{anio + 1}-01-01')")
+    op.execute("CREATE TABLE reserva_otras PARTITION OF reserva DEFAULT")
+
+    op.execute(f"INSERT INTO reserva ({COLUMNAS}) SELECT {COLUMNAS} FROM reserva_sin_particionar")
+    op.execute("DROP TABLE reserva_sin_particionar")
+
+    op.execute(FUNCION_SOLAPAMIENTO)
+    op.execute(
+        "CREATE TRIGGER reserva_sin_solapamiento "
+        "BEFORE INSERT OR UPDATE OF inflable_id, fecha_inicio, fecha_fin, estado ON reserva "
+        "FOR EACH ROW EXECUTE FUNCTION reserva_sin_solapamiento()"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS reserva_sin_solapamiento ON reserva")
+        op.execute("DROP FUNCTION IF EXISTS reserva_sin_solapamiento()")
+        op.execute("ALTER TABLE reserva RENAME TO reserva_particionada")
+        op.execute("ALTER TABLE reserva_particionada DROP CONSTRAINT reserva_pkey")
+        for nombre in INDICES:
+            op.execute(f"DROP INDEX IF EXISTS {nombre}")
+
+        op.execute("CREATE TABLE reserva (LIKE reserva_particionada INCLUDING DEFAULTS)")
+        op.execute("ALTER SEQUENCE reserva_id_seq OWNED BY reserva.id")
+        op.execute("ALTER TABLE reserva ADD CONSTRAINT reserva_pkey PRIMARY KEY (id)")
+        op.execute("ALTER TABLE reserva ADD FOREIGN KEY (inflable_id) REFERENCES inflable (id)")
+        op.execute("ALTER TABLE reserva ADD FOREIGN KEY (cliente_id) REFERENCES cliente (id)")
+        op.execute(f"INSERT INTO reserva ({COLUMNAS}) SELECT {COLUMNAS} FROM reserva_particionada")
+        op.execute(f"INSERT INTO reserva ({COLUMNAS}) SELECT {COLUMNAS} FROM reserva_archivo")
+        op.execute("DROP TABLE reserva_particionada")
+        _crear_indices('reserva')
+
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "ALTER TABLE reserva ADD CONSTRAINT reserva_sin_solapamiento "
+            "EXCLUDE USING gist (inflable_id WITH =, daterange(fecha_inicio, fecha_fin, '[]') WITH &&) "
+            "WHERE (estado IN ('pendiente', 'confirmada'))"
+        )
+    else:
+        op.execute(f"INSERT INTO reserva ({COLUMNAS}) SELECT {COLUMNAS} FROM reserva_archivo")
+
+    with op.batch_alter_table('reserva_archivo', schema=None) as batch_op:
+        batch_op.drop_index('ix_reserva_archivo_fecha_inicio_id')
+        batch_op.drop_index('ix_reserva_archivo_disponibilidad')
+
+    op.drop_table('reserva_archivo')
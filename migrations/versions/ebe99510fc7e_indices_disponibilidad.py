@@ -0,0 +1,37 @@
+"""indices de disponibilidad
+
+Revision ID: ebe99510fc7e
+Revises: f65a185c9633
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ebe99510fc7e'
+down_revision = 'f65a185c9633'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_reserva_disponibilidad', 'reserva',
+                    ['inflable_id', 'estado', 'fecha_inicio', 'fecha_fin'], unique=False)
+    op.create_index(op.f('ix_cliente_telefono'), 'cliente', ['telefono'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_reserva_rango_activo ON reserva "
+            "USING gist (daterange(fecha_inicio, fecha_fin, '[]')) "
+            "WHERE estado IN ('pendiente', 'confirmada')"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_reserva_rango_activo")
+
+    op.drop_index(op.f('ix_cliente_telefono'), table_name='cliente')
+    op.drop_index('ix_reserva_disponibilidad', table_name='reserva')
@@ -0,0 +1,38 @@
+"""exclusion de solapamiento de reservas
+
+Revision ID: f4bc2ccef78b
+Revises: ebe99510fc7e
+Create Date: 2026-10-18 11:00:00.000000
+
+Solo PostgreSQL. Si ya existen reservas activas solapadas, hay que
+resolverlas (cancelar o mover) antes de aplicar esta revisión.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4bc2ccef78b'
+down_revision = 'ebe99510fc7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE reserva ADD CONSTRAINT reserva_sin_solapamiento "
+        "EXCLUDE USING gist (inflable_id WITH =, daterange(fecha_inicio, fecha_fin, '[]') WITH &&) "
+        "WHERE (estado IN ('pendiente', 'confirmada'))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE reserva DROP CONSTRAINT IF EXISTS reserva_sin_solapamiento")
@@ -0,0 +1,240 @@
+"""
+Métricas por petición y logging estructurado.
+
+instrumentar(app) registra, para cada petición, la latencia por endpoint, la
+cantidad de sentencias SQL y el tiempo pasado en la base, y los publica en
+/metrics en formato de texto de Prometheus. Opcionalmente agrega el header
+Server-Timing (db y total) para verlos desde el navegador o un benchmark.
+Las consultas que superan SQL_LENTA_MS se loguean; sus parámetros (que pueden
+tener datos de clientes) solo con SQL_LENTA_PARAMETROS.
+
+Las métricas son por proceso: con varios workers, Prometheus debe leer cada
+uno (o agregarlas aparte).
+"""
+
+import json
+import logging
+import threading
+import time
+
+from flask import Response, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('inflables')
+logger_sql = logging.getLogger('inflables.sql')
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100)
+BUCKETS_TAREAS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+MAX_PARAMETROS_LOG = 1000
+
+# Atributos propios de LogRecord; el resto viene de extra={...}
+_CAMPOS_LOG_RECORD = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class FormatoJSON(logging.Formatter):
+    """Un objeto JSON por línea, con los campos pasados en extra={...}"""
+
+    def format(self, record):
+        datos = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensaje': record.getMessage(),
+        }
+        if has_request_context():
+            datos['metodo'] = request.method
+            datos['ruta'] = request.path
+        for clave, valor in vars(record).items():
+            if clave not in _CAMPOS_LOG_RECORD and not clave.startswith('_'):
+                datos[clave] = valor
+        if record.exc_info:
+            datos['excepcion'] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def configurar_logging(nivel='INFO', formato='texto'):
+    """Configurar el logger 'inflables' (nivel y formato 'texto' o 'json')"""
+    manejador = logging.StreamHandler()
+    if formato == 'json':
+        manejador.setFormatter(FormatoJSON())
+    else:
+        manejador.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logger.handlers[:] = [manejador]
+    logger.setLevel(nivel.upper())
+    logger.propagate = False
+
+
+def _etiquetas(nombres, valores):
+    if not nombres:
+        return ''
+    pares = []
+    for nombre, valor in zip(nombres, valores):
+        valor = str(valor).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+        pares.append(f'{nombre}="{valor}"')
+    return '{' + ','.join(pares) + '}'
+
+
+class Contador:
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self._lock = threading.Lock()
+        self._valores = {}
+
+    def inc(self, *valores, cantidad=1):
+        with self._lock:
+            self._valores[valores] = self._valores.get(valores, 0) + cantidad
+
+    def exportar(self):
+        lineas = [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} counter']
+        with self._lock:
+            for valores, total in sorted(self._valores.items()):
+                lineas.append(f'{self.nombre}{_etiquetas(self.etiquetas, valores)} {total}')
+        return lineas
+
+
+class Histograma:
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # valores de etiquetas -> [conteos por bucket, suma, total]
+
+    def observar(self, valor, *valores):
+        with self._lock:
+            serie = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [[0] * len(self.buckets), 0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[0][i] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exportar(self):
+        lineas = [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} histogram']
+        nombres_le = self.etiquetas + ('le',)
+        with self._lock:
+            for valores, (conteos, suma, total) in sorted(self._series.items()):
+                for limite, conteo in zip(self.buckets, conteos):
+                    lineas.append(f'{self.nombre}_bucket{_etiquetas(nombres_le, valores + (limite,))} {conteo}')
+                lineas.append(f'{self.nombre}_bucket{_etiquetas(nombres_le, valores + ("+Inf",))} {total}')
+                lineas.append(f'{self.nombre}_sum{_etiquetas(self.etiquetas, valores)} {suma:.6f}')
+                lineas.append(f'{self.nombre}_count{_etiquetas(self.etiquetas, valores)} {total}')
+        return lineas
+
+
+class Metricas:
+    def __init__(self):
+        self.peticiones = Contador(
+            'inflables_peticiones_total', 'Peticiones atendidas', ('endpoint', 'metodo', 'estado'))
+        self.duracion = Histograma(
+            'inflables_peticion_segundos', 'Latencia de las peticiones', ('endpoint', 'metodo'))
+        self.consultas = Histograma(
+            'inflables_sql_consultas', 'Sentencias SQL por petición', ('endpoint',), BUCKETS_CONSULTAS)
+        self.tiempo_sql = Histograma(
+            'inflables_sql_segundos', 'Tiempo en la base por petición', ('endpoint',))
+        self.consultas_lentas = Contador(
+            'inflables_sql_lentas_total', 'Sentencias SQL más lentas que SQL_LENTA_MS')
+        # Tareas periódicas (ver tareas.py); resultado: ok, error u ocupada (la corre otro proceso)
+        self.tareas = Contador(
+            'inflables_tareas_total', 'Ejecuciones de tareas periódicas', ('tarea', 'resultado'))
+        self.tareas_duracion = Histograma(
+            'inflables_tarea_segundos', 'Duración de las tareas periódicas', ('tarea',), BUCKETS_TAREAS)
+        self.tareas_filas = Contador(
+            'inflables_tarea_filas_total', 'Filas modificadas por las tareas periódicas', ('tarea',))
+
+    def exportar(self):
+        lineas = []
+        for metrica in (self.peticiones, self.duracion, self.consultas, self.tiempo_sql, self.consultas_lentas,
+                        self.tareas, self.tareas_duracion, self.tareas_filas):
+            lineas.extend(metrica.exportar())
+        return '\n'.join(lineas) + '\n'
+
+
+def _antes_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('inicio_sentencia', []).append((id(context), time.perf_counter()))
+
+
+def _sentencia_fallida(contexto):
+    # La sentencia que falló en el driver no llega a after_cursor_execute:
+    # sacar su inicio, si es el último (un error fuera de la ejecución no dejó ninguno)
+    if contexto.connection is None or contexto.execution_context is None:
+        return
+    inicios = contexto.connection.info.get('inicio_sentencia')
+    if inicios and inicios[-1][0] == id(contexto.execution_context):
+        inicios.pop()
+
+
+def _sentencia_ejecutada(metricas, umbral_lenta, con_parametros=False):
+    def despues(conn, cursor, statement, parameters, context, executemany):
+        duracion = time.perf_counter() - conn.info['inicio_sentencia'].pop()[1]
+        if has_app_context():
+            g.sql_consultas = g.get('sql_consultas', 0) + 1
+            g.sql_segundos = g.get('sql_segundos', 0.0) + duracion
+        if duracion * 1000 >= umbral_lenta:
+            metricas.consultas_lentas.inc()
+            extra = {'duracion_ms': round(duracion * 1000, 3), 'sql': statement,
+                     'endpoint': request.endpoint if has_request_context() else None}
+            if con_parametros:
+                parametros = repr(parameters)
+                if len(parametros) > MAX_PARAMETROS_LOG:
+                    parametros = parametros[:MAX_PARAMETROS_LOG] + '...'
+                extra['parametros'] = parametros
+            logger_sql.warning('Consulta lenta (%.1f ms): %s', duracion * 1000, statement, extra=extra)
+    return despues
+
+
+def instrumentar(app):
+    """Registrar hooks de petición y de SQLAlchemy, y la ruta /metrics.
+
+    Configuración: SQL_LENTA_MS (umbral del log de consultas lentas),
+    SQL_LENTA_PARAMETROS (incluir en ese log los parámetros), SERVER_TIMING (agregar el header) y METRICAS_RUTA.
+    """
+    metricas = Metricas()
+    umbral_lenta = app.config.get('SQL_LENTA_MS', 200)
+
+    # Sobre la clase Engine: cubre cualquier engine que cree la aplicación
+    event.listen(Engine, 'before_cursor_execute', _antes_de_sentencia)
+    event.listen(Engine, 'after_cursor_execute',
+                 _sentencia_ejecutada(metricas, umbral_lenta, app.config.get('SQL_LENTA_PARAMETROS', False)))
+    event.listen(Engine, 'handle_error', _sentencia_fallida)
+
+    @app.before_request
+    def iniciar_medicion():
+        g.inicio_peticion = time.perf_counter()
+        g.sql_consultas = 0
+        g.sql_segundos = 0.0
+
+    @app.after_request
+    def registrar_medicion(response):
+        inicio = g.get('inicio_peticion')
+        if inicio is None:
+            return response
+        # En respuestas en streaming mide hasta los headers, no el cuerpo
+        duracion = time.perf_counter() - inicio
+        endpoint = request.endpoint or 'sin_ruta'
+        if endpoint == 'metricas':
+            return response
+        metricas.peticiones.inc(endpoint, request.method, response.status_code)
+        metricas.duracion.observar(duracion, endpoint, request.method)
+        metricas.consultas.observar(g.sql_consultas, endpoint)
+        metricas.tiempo_sql.observar(g.sql_segundos, endpoint)
+        if app.config.get('SERVER_TIMING'):
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={g.sql_segundos * 1000:.2f};desc="{g.sql_consultas} consultas", '
+                f'total;dur={duracion * 1000:.2f}'
+            )
+        return response
+
+    @app.route(app.config.get('METRICAS_RUTA', '/metrics'), endpoint='metricas')
+    def exponer_metricas():
+        return Response(metricas.exportar(), mimetype='text/plain; version=0.0.4')
+
+    return metricas
@@ -0,0 +1,183 @@
+"""
+Particiones de reservas por rango de fecha_inicio.
+
+En PostgreSQL `reserva` es una tabla particionada: una partición por año (o
+por mes) más `reserva_otras`, la partición por defecto, que recibe lo que no
+cae en ninguna otra. Las consultas de disponibilidad, calendario y listados
+filtran por fecha y solo recorren las particiones de ese período, así que
+años de historia no agrandan lo que tiene que estar en memoria.
+
+mantener() crea por adelantado las particiones de los próximos meses (y las
+de los períodos que hayan quedado en reserva_otras, pasando esas filas) y
+archiva las que terminan antes del corte: las separa de `reserva` y las
+adjunta a `reserva_archivo`, de igual estructura, sin copiar filas. Una
+partición con reservas pendientes o confirmadas no se archiva.
+
+En otras bases no hay particiones: archivar_filas() mueve a reserva_archivo
+las reservas que empiezan antes del corte y no están activas.
+
+Las reservas archivadas salen de `reserva`: con registrar, una función
+(conexion, ids), las dos formas de archivar la llaman en la misma
+transacción con los ids que sacaron (para el registro de cambios).
+"""
+
+import re
+from datetime import date
+
+from sqlalchemy import bindparam, text
+
+GRANULARIDADES = ('anual', 'mensual')
+TABLA = 'reserva'
+TABLA_ARCHIVO = 'reserva_archivo'
+PARTICION_DEFECTO = 'reserva_otras'
+
+_LIMITES = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+def inicio_periodo(fecha, granularidad):
+    return date(fecha.year, 1 if granularidad == 'anual' else fecha.month, 1)
+
+
+def fin_periodo(inicio, granularidad):
+    """Primer día del período siguiente (límite superior, excluido)"""
+    if granularidad == 'anual':
+        return date(inicio.year + 1, 1, 1)
+    return date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+
+
+def sumar_meses(fecha, meses):
+    """Primer día del mes que está meses después (o antes) del de fecha"""
+    total = fecha.year * 12 + fecha.month - 1 + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def nombre_particion(inicio, granularidad):
+    return f"{TABLA}_{inicio.year}" if granularidad == 'anual' else f"{TABLA}_{inicio:%Y_%m}"
+
+
+def particiones(conexion, tabla=TABLA):
+    """[(nombre, desde, hasta)] de las particiones por rango de la tabla, por fecha"""
+    filas = conexion.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = CAST(:tabla AS regclass)"
+    ), {'tabla': tabla})
+    resultado = []
+    for nombre, limites in filas:
+        encontrado = _LIMITES.search(limites)
+        if encontrado:  # la partición por defecto no tiene límites
+            resultado.append((nombre, date.fromisoformat(encontrado[1]), date.fromisoformat(encontrado[2])))
+    return sorted(resultado, key=lambda p: p[1])
+
+
+def crear_particion(conexion, nombre, desde, hasta):
+    """Crear la partición [desde, hasta) de reserva con las filas de ese rango
+    que estaban en la partición por defecto; devuelve cuántas pasó.
+
+    Se arma como tabla suelta y se adjunta al final: las filas movidas no
+    vuelven a pasar por el trigger de solapamiento y PostgreSQL crea los
+    índices de la tabla padre al adjuntarla.
+    """
+    conexion.execute(text(f"CREATE TABLE {nombre} (LIKE {TABLA} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    movidas = conexion.execute(text(
+        f"WITH movidas AS (DELETE FROM {PARTICION_DEFECTO} "
+        f"WHERE fecha_inicio >= :desde AND fecha_inicio < :hasta RETURNING *) "
+        f"INSERT INTO {nombre} SELECT * FROM movidas"
+    ), {'desde': desde, 'hasta': hasta}).rowcount
+    conexion.execute(text(
+        f"ALTER TABLE {TABLA} ATTACH PARTITION {nombre} FOR VALUES FROM ('{desde}') TO ('{hasta}')"
+    ))
+    return movidas
+
+
+def archivar_particion(conexion, nombre, desde, hasta, estados_activos, registrar=None):
+    """Pasar una partición de reserva a reserva_archivo; False si tiene
+    reservas activas y no se archivó. conexion tiene que estar en una
+    transacción."""
+    # Sin escrituras en reserva desde el chequeo hasta separar la partición:
+    # una reserva activada en el medio se archivaría. DETACH bloquea la tabla
+    # de todos modos; el lock solo se toma un poco antes y en el mismo orden
+    # (tabla padre, particiones) que las escrituras, sin deadlocks.
+    conexion.execute(text(f"LOCK TABLE {TABLA} IN SHARE ROW EXCLUSIVE MODE"))
+    activa = conexion.execute(
+        text(f"SELECT 1 FROM {nombre} WHERE estado IN :estados LIMIT 1").bindparams(
+            bindparam('estados', expanding=True)
+        ), {'estados': list(estados_activos)}
+    ).first()
+    if activa:
+        return False
+    if registrar is not None:
+        registrar(conexion, conexion.execute(text(f"SELECT id FROM {nombre}")).scalars().all())
+    conexion.execute(text(f"ALTER TABLE {TABLA} DETACH PARTITION {nombre}"))
+    conexion.execute(text(
+        f"ALTER TABLE {TABLA_ARCHIVO} ATTACH PARTITION {nombre} FOR VALUES FROM ('{desde}') TO ('{hasta}')"
+    ))
+    # Los índices de reserva que el archivo no tiene (como el GiST de las
+    # activas) quedan sueltos tras separarla: ya no sirven
+    sueltos = conexion.execute(text(
+        "SELECT CAST(CAST(i.indexrelid AS regclass) AS text) FROM pg_index i "
+        "WHERE i.indrelid = CAST(:nombre AS regclass) AND NOT i.indisunique "
+        "AND NOT EXISTS (SELECT 1 FROM pg_inherits h WHERE h.inhrelid = i.indexrelid)"
+    ), {'nombre': nombre}).scalars().all()
+    for indice in sueltos:
+        conexion.execute(text(f"DROP INDEX {indice}"))
+    return True
+
+
+def mantener(engine, granularidad, hasta_fecha, corte, estados_activos, registrar=None):
+    """Crear las particiones hasta hasta_fecha y las que falten para las filas
+    de la partición por defecto, y archivar las que terminan en o antes de
+    corte (None para no archivar). Cada paso va en su propia transacción.
+
+    Devuelve {'creadas': [(nombre, filas_movidas)], 'archivadas': [nombre],
+    'con_activas': [nombre]}.
+    """
+    resultado = {'creadas': [], 'archivadas': [], 'con_activas': []}
+    truncar = 'year' if granularidad == 'anual' else 'month'
+    with engine.connect() as conexion:
+        ocupadas = particiones(conexion) + particiones(conexion, TABLA_ARCHIVO)
+        inicios = set(conexion.execute(text(
+            f"SELECT DISTINCT CAST(date_trunc('{truncar}', fecha_inicio) AS date) FROM {PARTICION_DEFECTO}"
+        )).scalars())
+    inicio = inicio_periodo(date.today(), granularidad)
+    while inicio <= hasta_fecha:
+        inicios.add(inicio)
+        inicio = fin_periodo(inicio, granularidad)
+
+    for inicio in sorted(inicios):
+        fin = fin_periodo(inicio, granularidad)
+        # Un período que se pisa con otra partición (p. ej. tras cambiar la
+        # granularidad, o uno ya archivado) se deja en la partición por defecto
+        if any(inicio < hasta and fin > desde for _, desde, hasta in ocupadas):
+            continue
+        nombre = nombre_particion(inicio, granularidad)
+        with engine.begin() as conexion:
+            resultado['creadas'].append((nombre, crear_particion(conexion, nombre, inicio, fin)))
+        ocupadas.append((nombre, inicio, fin))
+
+    if corte is not None:
+        with engine.connect() as conexion:
+            viejas = [p for p in particiones(conexion) if p[2] <= corte]
+        for nombre, desde, hasta in viejas:
+            with engine.begin() as conexion:
+                archivada = archivar_particion(conexion, nombre, desde, hasta, estados_activos, registrar)
+            resultado['archivadas' if archivada else 'con_activas'].append(nombre)
+    return resultado
+
+
+def archivar_filas(conexion, columnas, corte, estados_activos, registrar=None):
+    """Sin particiones: mover a reserva_archivo las reservas que empiezan antes
+    de corte y no están activas; devuelve cuántas"""
+    lista = ', '.join(columnas)
+    condicion = "fecha_inicio < :corte AND estado NOT IN :estados"
+    parametros = {'corte': corte, 'estados': list(estados_activos)}
+    conexion.execute(text(
+        f"INSERT INTO {TABLA_ARCHIVO} ({lista}) SELECT {lista} FROM {TABLA} WHERE {condicion}"
+    ).bindparams(bindparam('estados', expanding=True)), parametros)
+    ids = conexion.execute(
+        text(f"DELETE FROM {TABLA} WHERE {condicion} RETURNING id").bindparams(
+            bindparam('estados', expanding=True)
+        ), parametros
+    ).scalars().all()
+    if registrar is not None:
+        registrar(conexion, ids)
+    return len(ids)
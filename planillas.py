@@ -0,0 +1,144 @@
+"""
+Planillas de importación y exportación (CSV o Excel).
+
+leer() recorre las filas de un CSV (UTF-8, con o sin BOM, separado por comas
+o punto y coma) o de un .xlsx como dicts por encabezado, a medida que lee el
+archivo; lotes() las agrupa para procesarlas de a varias.
+
+csv_en_partes() genera un CSV de a bloques para una respuesta en streaming.
+Un .xlsx es un zip y no se puede enviar por partes: escribir_xlsx() lo arma
+en un archivo con el modo write_only de openpyxl, que tampoco guarda las
+filas en memoria. Excel necesita openpyxl instalado.
+
+copiar() carga filas con COPY de PostgreSQL (psycopg2 o psycopg 3).
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from itertools import islice
+
+from dateutil.parser import parse as parse_date
+
+try:
+    import openpyxl
+except ImportError:  # opcional
+    openpyxl = None
+
+FORMATOS = ('csv', 'xlsx')
+TIPOS = {'csv': 'text/csv; charset=utf-8',
+         'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'}
+BLOQUE_CSV = 64 * 1024  # caracteres por parte de la respuesta
+
+
+def formato_de(nombre):
+    """'csv' o 'xlsx' según la extensión del archivo"""
+    formato = nombre.rsplit('.', 1)[-1].lower() if '.' in nombre else ''
+    if formato not in FORMATOS:
+        raise ValueError(f'Formato no soportado: usar {" o ".join(FORMATOS)}')
+    return formato
+
+
+def _requiere_openpyxl():
+    if openpyxl is None:
+        raise ValueError('El formato xlsx requiere el paquete openpyxl')
+
+
+def _valor(valor):
+    if isinstance(valor, str):
+        valor = valor.strip()
+        return valor or None
+    return valor
+
+
+def _filas_csv(archivo):
+    lineas = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    encabezado = lineas.readline()
+    separador = ';' if encabezado.count(';') > encabezado.count(',') else ','
+    yield from csv.reader([encabezado], delimiter=separador)
+    yield from csv.reader(lineas, delimiter=separador)
+
+
+def _filas_xlsx(archivo):
+    _requiere_openpyxl()
+    libro = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def leer(archivo, formato):
+    """(número de fila, {columna: valor}) de cada fila con datos; archivo es
+    binario. Columnas en minúsculas; celdas vacías como None."""
+    filas = _filas_xlsx(archivo) if formato == 'xlsx' else _filas_csv(archivo)
+    columnas = [str(c or '').strip().lower() for c in next(filas, ())]
+    for numero, fila in enumerate(filas, start=2):
+        valores = dict(zip(columnas, map(_valor, fila)))
+        valores.pop('', None)
+        if any(v is not None for v in valores.values()):
+            yield numero, valores
+
+
+def lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while lote := list(islice(iterador, tamano)):
+        yield lote
+
+
+def csv_en_partes(columnas, filas):
+    """Bytes del CSV (con BOM, para que Excel lo abra como UTF-8) de a BLOQUE_CSV"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write('\ufeff')
+    escritor.writerow(columnas)
+    for fila in filas:
+        escritor.writerow(fila)
+        if buffer.tell() >= BLOQUE_CSV:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def escribir_xlsx(columnas, filas, destino):
+    _requiere_openpyxl()
+    libro = openpyxl.Workbook(write_only=True)
+    hoja = libro.create_sheet()
+    hoja.append(list(columnas))
+    for fila in filas:
+        hoja.append(list(fila))
+    libro.save(destino)
+
+
+def fecha(valor):
+    """date de una celda: ISO 8601 (o lo que entienda dateutil) o fecha de Excel"""
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return parse_date(str(valor)).date()
+
+
+def _texto_copy(valor):
+    if valor is None:
+        return r'\N'
+    return (str(valor).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copiar(conexion, tabla, columnas, filas):
+    """COPY de filas (secuencias en el orden de columnas) a tabla; conexion
+    es la del driver"""
+    sentencia = f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN"
+    with conexion.cursor() as cursor:
+        if hasattr(cursor, 'copy'):  # psycopg 3
+            with cursor.copy(sentencia) as copia:
+                for fila in filas:
+                    copia.write_row(fila)
+        else:
+            texto = io.StringIO()
+            for fila in filas:
+                texto.write('\t'.join(map(_texto_copy, fila)) + '\n')
+            texto.seek(0)
+            cursor.copy_expert(sentencia, texto)
@@ -0,0 +1,154 @@
+"""
+Recursos estáticos de la SPA con huella de contenido.
+
+construir() minifica los JS y CSS de FUENTES, los escribe en static/dist con
+el hash del contenido en el nombre (js/app.3f9c0d1e2a4b.js) junto a sus
+versiones precomprimidas .gz y .br, y guarda en manifest.json qué archivo
+corresponde a cada fuente. Como el nombre cambia con el contenido, se pueden
+cachear para siempre.
+
+Las plantillas piden las URLs con recurso('js/app.js'): con manifiesto
+apuntan al archivo compilado; sin él (desarrollo, antes de construir) al
+original. servir() entrega la variante precomprimida que acepte el cliente.
+
+La minificación usa rjsmin y rcssmin si están instalados. Sin rjsmin el JS
+queda como está (la compresión se lleva casi toda la diferencia): quitar
+comentarios o indentación sin analizar el código rompe template literals y
+strings de varias líneas. Sin rcssmin, el CSS pierde comentarios y espacios.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+
+from flask import send_from_directory
+
+try:
+    import rjsmin
+except ImportError:  # opcional
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # opcional
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:  # opcional
+    brotli = None
+
+FUENTES = ('js/app.js', 'js/admin_inflables.js', 'css/style.css')
+DIRECTORIO_SALIDA = 'dist'
+MANIFIESTO = 'manifest.json'
+LARGO_HUELLA = 12
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def minificar_js(texto):
+    if rjsmin is not None:
+        return rjsmin.jsmin(texto)
+    return texto
+
+
+def minificar_css(texto):
+    if rcssmin is not None:
+        return rcssmin.cssmin(texto)
+    texto = re.sub(r'/\*.*?\*/', '', texto, flags=re.S)
+    texto = re.sub(r'\s+', ' ', texto)
+    texto = re.sub(r'\s*([{};,])\s*', r'\1', texto)
+    texto = re.sub(r':\s+', ':', texto)
+    return texto.replace(';}', '}').strip() + '\n'
+
+
+MINIFICADORES = {'.js': minificar_js, '.css': minificar_css}
+
+
+def _escribir(ruta, contenido):
+    """Escritura atómica: temporal en el mismo directorio y rename"""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(ruta), prefix='.recurso-', delete=False) as tmp:
+        tmp.write(contenido)
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, ruta)
+
+
+def construir(directorio_static, fuentes=FUENTES, limpiar=False):
+    """Compilar las fuentes y escribir el manifiesto; devuelve {fuente: compilado}.
+
+    Con limpiar, borra de la salida los archivos que no son del manifiesto nuevo.
+    """
+    salida = os.path.join(directorio_static, DIRECTORIO_SALIDA)
+    manifiesto = {}
+    escritos = {MANIFIESTO}
+    for fuente in fuentes:
+        base, extension = os.path.splitext(fuente)
+        with open(os.path.join(directorio_static, fuente), encoding='utf-8') as f:
+            contenido = MINIFICADORES[extension](f.read()).encode('utf-8')
+        nombre = f"{base}.{hashlib.sha256(contenido).hexdigest()[:LARGO_HUELLA]}{extension}"
+        variantes = {nombre: contenido, nombre + '.gz': gzip.compress(contenido, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variantes[nombre + '.br'] = brotli.compress(contenido, quality=11)
+        for archivo, datos in variantes.items():
+            ruta = os.path.join(salida, archivo)
+            if not os.path.exists(ruta):
+                _escribir(ruta, datos)
+            escritos.add(archivo)
+        manifiesto[fuente] = f"{DIRECTORIO_SALIDA}/{nombre}"
+    _escribir(os.path.join(salida, MANIFIESTO),
+              json.dumps(manifiesto, indent=2, sort_keys=True).encode('utf-8'))
+
+    if limpiar:
+        for carpeta, _, archivos in os.walk(salida):
+            for archivo in archivos:
+                relativo = os.path.relpath(os.path.join(carpeta, archivo), salida).replace(os.sep, '/')
+                if relativo not in escritos:
+                    os.unlink(os.path.join(carpeta, archivo))
+    return manifiesto
+
+
+class Manifiesto:
+    """Manifiesto de static/dist, releído cuando cambia el archivo"""
+
+    def __init__(self, directorio_static):
+        self._ruta = os.path.join(directorio_static, DIRECTORIO_SALIDA, MANIFIESTO)
+        self._leido = None  # mtime de la versión cargada
+        self._entradas = {}
+
+    def resolver(self, fuente):
+        """Archivo (relativo a static) que corresponde a la fuente"""
+        try:
+            modificado = os.stat(self._ruta).st_mtime_ns
+        except FileNotFoundError:
+            modificado = None
+        if modificado != self._leido:
+            if modificado is None:
+                self._entradas = {}
+            else:
+                with open(self._ruta, encoding='utf-8') as f:
+                    self._entradas = json.load(f)
+            self._leido = modificado
+        return self._entradas.get(fuente, fuente)
+
+
+def servir(directorio_static, nombre, accept_encodings):
+    """Respuesta con un archivo de static/dist, en la variante precomprimida
+    que acepte el cliente, con cache inmutable"""
+    salida = os.path.join(directorio_static, DIRECTORIO_SALIDA)
+    mimetype = mimetypes.guess_type(nombre)[0] or 'application/octet-stream'
+    disponibles = [c for c, sufijo in (('br', '.br'), ('gzip', '.gz'))
+                   if os.path.isfile(os.path.join(salida, nombre + sufijo))]
+    codificacion = accept_encodings.best_match(disponibles) if disponibles else None
+    archivo = nombre + {'br': '.br', 'gzip': '.gz'}.get(codificacion, '')
+    response = send_from_directory(salida, archivo, mimetype=mimetype, max_age=31536000)
+    response.headers.pop('Content-Disposition', None)  # nombraría al .gz/.br
+    if codificacion:
+        response.headers['Content-Encoding'] = codificacion
+    if disponibles:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = CACHE_INMUTABLE
+    return response
@@ -0,0 +1,159 @@
+"""
+Serialización JSON y compresión de las respuestas.
+
+a_json() convierte a JSON con orjson si está instalado (escribe date y
+datetime en ISO 8601 sin pasar por Python) o, si no, con el módulo json;
+ProveedorJSON lo usa para jsonify. Esquema describe cada serializador como
+un mapeo clave -> atributo en vez de un dict armado a mano.
+
+comprimir() aplica brotli (si está instalado el paquete brotli) o gzip a
+las respuestas de texto que superan un tamaño mínimo, según Accept-Encoding.
+Las respuestas en streaming (NDJSON, SSE) y los archivos se envían tal cual.
+"""
+
+import gzip
+import json
+from datetime import date, time
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+
+from flask.json.provider import JSONProvider
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # opcional
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # opcional
+    brotli = None
+
+NIVEL_GZIP = 6
+CALIDAD_BROTLI = 5  # de 0 a 11; más alto comprime más pero cuesta más CPU por respuesta
+TIPOS_COMPRIMIBLES = ('application/json', 'application/x-ndjson', 'application/javascript',
+                      'image/svg+xml', 'text/')
+CODIFICACIONES = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _por_defecto(valor):
+    if isinstance(valor, (date, time)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (tuple, set, frozenset)):
+        return list(valor)
+    if isinstance(valor, Row):
+        # En SQLAlchemy 2.0 una fila no es una tupla: como lista, en el orden de las columnas
+        return list(valor)
+    raise TypeError(f'{type(valor).__name__} no se puede convertir a JSON')
+
+
+def a_json(datos, indentado=False):
+    """Bytes JSON (UTF-8) de datos"""
+    if orjson is not None:
+        opciones = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indentado else 0)
+        return orjson.dumps(datos, default=_por_defecto, option=opciones)
+    return json.dumps(datos, default=_por_defecto, ensure_ascii=False,
+                      indent=2 if indentado else None,
+                      separators=None if indentado else (',', ':')).encode()
+
+
+def de_json(texto):
+    return orjson.loads(texto) if orjson is not None else json.loads(texto)
+
+
+class ProveedorJSON(JSONProvider):
+    """Proveedor de Flask (app.json) sobre a_json; en debug, indentado"""
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return a_json(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return de_json(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(a_json(obj, indentado=self._app.debug), mimetype=self.mimetype)
+
+
+class Esquema:
+    """Serializador declarativo de modelos o filas de consultas.
+
+    Esquema(id='id', imagenes='imagen_variantes', titulo=lambda r: ...): cada
+    clave del resultado sale del atributo nombrado o de la función aplicada al
+    objeto, en el orden declarado. Las fechas quedan como date/datetime.
+    """
+
+    def __init__(self, **campos):
+        self.campos = campos
+        self._claves = tuple(campos)
+        self._atributos = None
+        if all(isinstance(c, str) for c in campos.values()):
+            self._atributos = tuple(campos.values())
+            # Un solo attrgetter para todos los atributos: sin bucle en Python
+            self._valores = _tupla(attrgetter(*self._atributos), len(campos))
+        else:
+            lectores = [attrgetter(c) if isinstance(c, str) else c for c in campos.values()]
+            self._valores = lambda obj: [leer(obj) for leer in lectores]
+
+    def __call__(self, obj):
+        return dict(zip(self._claves, self._valores(obj)))
+
+    def lista(self, objetos):
+        """Serializar varios objetos. Con filas de una consulta (Row) que tienen
+        todos los atributos, las columnas se leen por posición, que es varias
+        veces más rápido que por nombre."""
+        objetos = list(objetos)
+        leer = self._valores
+        columnas = getattr(objetos[0], '_fields', None) if objetos else None
+        if self._atributos and columnas and all(a in columnas for a in self._atributos):
+            leer = _tupla(itemgetter(*(columnas.index(a) for a in self._atributos)), len(self._atributos))
+        claves = self._claves
+        return [dict(zip(claves, leer(obj))) for obj in objetos]
+
+
+def _tupla(getter, cantidad):
+    # attrgetter/itemgetter con un solo campo no devuelven una tupla
+    return getter if cantidad > 1 else lambda obj: (getter(obj),)
+
+
+def codificar(cuerpo, accept_encodings, minimo):
+    """(cuerpo, codificación): comprimido con br o gzip si mide al menos minimo
+    bytes, el cliente lo acepta y achica; si no, (cuerpo, None)"""
+    codificacion = accept_encodings.best_match(CODIFICACIONES)
+    if len(cuerpo) < minimo or codificacion is None:
+        return cuerpo, None
+    if codificacion == 'br':
+        comprimido = brotli.compress(cuerpo, quality=CALIDAD_BROTLI)
+    else:
+        comprimido = gzip.compress(cuerpo, compresslevel=NIVEL_GZIP, mtime=0)
+    if len(comprimido) >= len(cuerpo):
+        return cuerpo, None
+    return comprimido, codificacion
+
+
+def comprimir(response, accept_encodings, minimo):
+    """Aplicar codificar() al cuerpo de una respuesta de Flask de tipo texto"""
+    if response.status_code == 304:
+        response.vary.add('Accept-Encoding')
+        return response
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 206)
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(TIPOS_COMPRIMIBLES)
+            or 'no-transform' in response.headers.get('Cache-Control', '')):
+        return response
+    response.vary.add('Accept-Encoding')
+    cuerpo, codificacion = codificar(response.get_data(), accept_encodings, minimo)
+    if codificacion is None:
+        return response
+    response.set_data(cuerpo)
+    response.headers['Content-Encoding'] = codificacion
+    # Otra representación de los mismos datos: el ETag pasa a ser débil
+    etag, debil = response.get_etag()
+    if etag and not debil:
+        response.set_etag(etag, weak=True)
+    return response
@@ -1,11 +1,28 @@
 #!/usr/bin/env python3
 """
 Script para poblar la base de datos con datos de prueba
+
+    python seed_data.py                      # datos de muestra (borra la base)
+    python seed_data.py --masivo --reservas 1000000 --inflables 2000 --clientes 50000
 """
 
-from app import app, db, Inflable, Cliente, Reserva
+from app import app, db, Inflable, Cliente, Reserva, ReglaPrecio, mantener_particiones, reconstruir_resumen
+from busqueda import normalizar_telefono
 from datetime import datetime, date, timedelta
+import argparse
+import csv
+import io
+import math
 import random
+import time
+
+LOTE = 10000
+
+# Peso relativo de cada mes (temporada alta en verano y vacaciones de invierno)
+PESO_MES = {1: 1.8, 2: 1.6, 3: 1.0, 4: 0.8, 5: 0.6, 6: 0.6,
+            7: 1.1, 8: 0.9, 9: 0.9, 10: 1.0, 11: 1.3, 12: 2.0}
+# Peso relativo de arrancar una reserva cada día de la semana (lunes = 0)
+PESO_DIA = (0.5, 0.4, 0.4, 0.6, 1.4, 2.2, 1.5)
 
 def create_sample_data():
     with app.app_context():
@@ -74,6 +91,20 @@ def create_sample_data():
         db.session.commit()
         print(f"✅ Creados {len(inflables)} inflables")
         
+        # Reglas de precio de ejemplo: recargo de fin de semana, temporada de
+        # verano y descuento por alquileres largos
+        hoy = date.today()
+        verano = date(hoy.year, 12, 15)
+        reglas = [
+            ReglaPrecio(tipo='fin_de_semana', factor=1.2, descripcion='Recargo sábados y domingos'),
+            ReglaPrecio(tipo='temporada', factor=1.15, desde=verano, hasta=date(hoy.year + 1, 2, 28),
+                        descripcion='Temporada de verano'),
+            ReglaPrecio(tipo='duracion', factor=0.9, dias_minimos=3, descripcion='10% desde 3 días'),
+        ]
+        db.session.add_all(reglas)
+        db.session.commit()
+        print(f"✅ Creadas {len(reglas)} reglas de precio")
+        
         # Crear clientes de muestra
         clientes_data = [
             {
@@ -166,6 +197,8 @@ def create_sample_data():
         
         db.session.commit()
         print(f"✅ Creadas {len(reservas_data)} reservas")
+        crear_particiones()
+        reconstruir_resumen()
         
         print("\n🎉 Base de datos poblada exitosamente!")
         print("\nDatos creados:")
@@ -174,5 +207,142 @@ def create_sample_data():
         print(f"- {len(reservas_data)} reservas")
         print("\nPuedes iniciar la aplicación con: python app.py")
 
+def crear_particiones():
+    """En PostgreSQL, repartir lo insertado en la partición por defecto (ver particiones.py)"""
+    creadas = mantener_particiones(archivar=False)['creadas']
+    if creadas:
+        print(f"📅 Creadas {len(creadas)} particiones de reservas")
+
+def insertar_masivo(tabla, columnas, filas):
+    """Insertar filas (tuplas) con COPY en PostgreSQL o por lotes en otras bases"""
+    conn = db.session.connection()
+    if conn.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for fila in filas:
+            escritor.writerow(['' if v is None else v for v in fila])
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {tabla.name} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    else:
+        conn.execute(tabla.insert(), [dict(zip(columnas, fila)) for fila in filas])
+
+def _en_lotes(filas, tamano=LOTE):
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def generar_reservas_inflable(inflable_id, precio, cantidad, inicio, fin_periodo, hoy, n_clientes, primer_cliente):
+    """Reservas consecutivas (sin solapamientos) de un inflable.
+
+    La separación entre reservas se acorta en temporada alta y los inicios
+    se concentran en fines de semana.
+    """
+    dias_periodo = (fin_periodo - inicio).days
+    duracion_media = 2.0
+    hueco_medio = max(0.0, dias_periodo / cantidad - duracion_media - 1)
+    fecha = inicio
+    for _ in range(cantidad):
+        peso = PESO_MES[fecha.month]
+        fecha += timedelta(days=int(random.expovariate(peso / hueco_medio)) if hueco_medio else 0)
+        # Mover el inicio hacia el fin de semana más probable
+        while random.random() > PESO_DIA[fecha.weekday()] / max(PESO_DIA):
+            fecha += timedelta(days=1)
+        dias = random.choices((1, 2, 3, 4), weights=(45, 30, 15, 10))[0]
+        fecha_fin = fecha + timedelta(days=dias - 1)
+        if fecha_fin < hoy:
+            estado = random.choices(('completada', 'cancelada'), weights=(92, 8))[0]
+        else:
+            estado = random.choices(('pendiente', 'confirmada'), weights=(40, 60))[0]
+        creada = datetime.combine(fecha, datetime.min.time()) - timedelta(days=random.randint(1, 60))
+        yield (inflable_id, primer_cliente + random.randrange(n_clientes), fecha, fecha_fin,
+               precio * dias, estado, None, creada)
+        fecha = fecha_fin + timedelta(days=1)
+
+def create_bulk_data(n_reservas, n_inflables, n_clientes, limpiar=False, semilla=None):
+    """Generar un volumen de datos parecido al de producción"""
+    random.seed(semilla)
+    with app.app_context():
+        if limpiar:
+            db.drop_all()
+        db.create_all()
+        t0 = time.perf_counter()
+
+        primer_inflable = (db.session.query(db.func.max(Inflable.id)).scalar() or 0) + 1
+        precios = [random.choice(range(100, 401, 10)) for _ in range(n_inflables)]
+        for lote in _en_lotes((primer_inflable + i, f'Inflable {primer_inflable + i}', None, float(p), None, None, True)
+                              for i, p in enumerate(precios)):
+            insertar_masivo(Inflable.__table__,
+                            ('id', 'nombre', 'descripcion', 'precio_diario', 'imagen_url', 'imagen_variantes', 'activo'),
+                            lote)
+        print(f"✅ Creados {n_inflables} inflables")
+
+        primer_cliente = (db.session.query(db.func.max(Cliente.id)).scalar() or 0) + 1
+        telefonos = [f'+54 11 {random.randrange(10**8):08d}' for _ in range(n_clientes)]
+        for lote in _en_lotes((primer_cliente + i, f'Cliente {primer_cliente + i}', t, normalizar_telefono(t),
+                               f'cliente{primer_cliente + i}@email.com', None)
+                              for i, t in enumerate(telefonos)):
+            insertar_masivo(Cliente.__table__,
+                            ('id', 'nombre', 'telefono', 'telefono_normalizado', 'email', 'direccion'), lote)
+        print(f"✅ Creados {n_clientes} clientes")
+
+        # Período suficiente para que las reservas de cada inflable no se
+        # solapen; hoy queda al 85% del período
+        por_inflable = math.ceil(n_reservas / n_inflables)
+        dias_periodo = max(3 * 365, por_inflable * 4)
+        hoy = date.today()
+        inicio = hoy - timedelta(days=int(dias_periodo * 0.85))
+        fin_periodo = inicio + timedelta(days=dias_periodo)
+
+        def todas():
+            restantes = n_reservas
+            for i, precio in enumerate(precios):
+                cantidad = min(por_inflable, restantes)
+                restantes -= cantidad
+                yield from generar_reservas_inflable(primer_inflable + i, precio, cantidad, inicio,
+                                                     fin_periodo, hoy, n_clientes, primer_cliente)
+
+        columnas = ('inflable_id', 'cliente_id', 'fecha_inicio', 'fecha_fin', 'precio_total',
+                    'estado', 'notas', 'fecha_creacion')
+        total = 0
+        for lote in _en_lotes(todas()):
+            insertar_masivo(Reserva.__table__, columnas, lote)
+            total += len(lote)
+            if total % (LOTE * 10) == 0:
+                print(f"  ... {total} reservas")
+        print(f"✅ Creadas {total} reservas")
+
+        if db.engine.dialect.name == 'postgresql':
+            # Alinear las secuencias con los ids insertados explícitamente
+            for tabla in ('inflable', 'cliente'):
+                db.session.execute(db.text(
+                    f"SELECT setval(pg_get_serial_sequence('{tabla}', 'id'), (SELECT MAX(id) FROM {tabla}))"
+                ))
+        db.session.commit()
+        crear_particiones()
+        print(f"📊 Resumen mensual: {reconstruir_resumen()} filas")
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        print(f"\n🎉 Datos generados en {time.perf_counter() - t0:.1f} s")
+
 if __name__ == '__main__':
-    create_sample_data()
+    parser = argparse.ArgumentParser(description='Poblar la base de datos con datos de prueba')
+    parser.add_argument('--masivo', action='store_true', help='Generar volumen de producción')
+    parser.add_argument('--reservas', type=int, default=1_000_000)
+    parser.add_argument('--inflables', type=int, default=2000)
+    parser.add_argument('--clientes', type=int, default=50000)
+    parser.add_argument('--limpiar', action='store_true', help='Borrar la base antes de generar')
+    parser.add_argument('--semilla', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.masivo:
+        create_bulk_data(args.reservas, args.inflables, args.clientes, args.limpiar, args.semilla)
+    else:
+        create_sample_data()
@@ -72,7 +72,7 @@ function mostrarInflables(inflablesFiltrados) {
             <div class="card h-100 ${inflable.activo ? '' : 'border-warning'}">
                 <div class="card-img-top-container" style="height: 200px; overflow: hidden;">
                     ${inflable.imagen_url ? 
-                        `<img src="${inflable.imagen_url}" class="card-img-top" style="object-fit: cover; height: 100%;" alt="${inflable.nombre}">` :
+                        `<picture>${fuentesImagen(inflable)}<img src="${inflable.imagen_url}" class="card-img-top" style="object-fit: cover; height: 100%;" alt="${inflable.nombre}" loading="lazy"></picture>` :
                         `<div class="d-flex align-items-center justify-content-center bg-light" style="height: 100%;">
                             <i class="fas fa-balloon fa-3x text-muted"></i>
                         </div>`
@@ -108,6 +108,13 @@ function mostrarInflables(inflablesFiltrados) {
     `).join('');
 }
 
+// <source> con las variantes responsivas del inflable, si existen
+function fuentesImagen(inflable) {
+    return Object.entries(inflable.imagenes || {}).map(([formato, datos]) =>
+        `<source type="image/${formato}" srcset="${datos.srcset}" sizes="(min-width: 992px) 33vw, (min-width: 768px) 50vw, 100vw">`
+    ).join('');
+}
+
 // Aplicar filtros
 function aplicarFiltros() {
     const estadoFiltro = document.getElementById('filtroEstado').value;
@@ -2,6 +2,17 @@
 let calendar;
 let inflables = [];
 let reservas = [];
+let reservasCursor = null;
+const RESERVAS_POR_PAGINA = 50;
+let cambiosCursor = null;
+let cambiosFuente = null;
+const CAMBIOS_POLLING_MS = 10000;
+const CLIENTES_BUSQUEDA_ESPERA_MS = 250;
+let clientesBusqueda = null;
+let historial = [];
+let historialInflableId = null;
+let historialCursor = null;
+const HISTORIAL_POR_PAGINA = 50;
 
 // Inicialización
 document.addEventListener('DOMContentLoaded', function() {
@@ -30,16 +41,20 @@ function checkFullCalendar() {
 
 function initializeAppWithoutCalendar() {
     console.log('🚀 Inicializando aplicación sin calendario...');
-    loadInflables();
-    loadReservas();
+    iniciarCambios().then(() => {
+        loadInflables();
+        loadReservas();
+    });
     setupEventListeners();
     console.log('✅ Aplicación inicializada (sin calendario)');
 }
 
 function initializeApp() {
     console.log('🚀 Inicializando aplicación...');
-    loadInflables();
-    loadReservas();
+    iniciarCambios().then(() => {
+        loadInflables();
+        loadReservas();
+    });
     initializeCalendar();
     setupEventListeners();
     console.log('✅ Aplicación inicializada');
@@ -126,7 +141,7 @@ function renderInflables() {
         card.className = 'col-md-6 col-lg-4 mb-4';
         card.innerHTML = `
             <div class="card inflable-card h-100">
-                ${inflable.imagen_url ? `<img src="${inflable.imagen_url}" class="card-img-top inflable-img" alt="${inflable.nombre}" onerror="this.style.display='none'">` : ''}
+                ${imagenInflable(inflable, 'card-img-top inflable-img', '(min-width: 992px) 33vw, (min-width: 768px) 50vw, 100vw')}
                 <div class="card-header">
                     <h5 class="mb-0">${inflable.nombre}</h5>
                 </div>
@@ -153,12 +168,25 @@ function renderInflables() {
     });
 }
 
-// Cargar reservas
+// Cargar reservas (primera página)
 async function loadReservas() {
     console.log('📅 Cargando reservas...');
+    reservas = [];
+    reservasCursor = null;
+    await loadMasReservas();
+}
+
+// Cargar la siguiente página de reservas
+async function loadMasReservas() {
     try {
-        const response = await fetch('/api/reservas');
-        reservas = await response.json();
+        let url = `/api/reservas?limite=${RESERVAS_POR_PAGINA}`;
+        if (reservasCursor) {
+            url += `&cursor=${encodeURIComponent(reservasCursor)}`;
+        }
+        const response = await fetch(url);
+        const pagina = await response.json();
+        reservas = reservas.concat(pagina.reservas);
+        reservasCursor = pagina.siguiente_cursor;
         console.log(`📅 Cargadas ${reservas.length} reservas`);
         renderReservas();
     } catch (error) {
@@ -180,6 +208,11 @@ function renderReservas() {
     console.log('✅ Elemento reservas-table encontrado');
     tbody.innerHTML = '';
     
+    const btnMas = document.getElementById('reservas-cargar-mas');
+    if (btnMas) {
+        btnMas.style.display = reservasCursor ? 'inline-block' : 'none';
+    }
+    
     if (reservas.length === 0) {
         console.log('⚠️ No hay reservas para mostrar');
         tbody.innerHTML = `
@@ -250,14 +283,12 @@ function initializeCalendar() {
         },
         events: function(info, successCallback, failureCallback) {
             console.log('📅 Cargando eventos del calendario...');
-            const fecha = info.start;
-            const mes = fecha.getMonth() + 1;
-            const año = fecha.getFullYear();
+            const params = new URLSearchParams({start: info.startStr, end: info.endStr});
             
-            fetch(`/api/calendario?mes=${mes}&año=${año}`)
+            fetch(`/api/calendario?${params}`)
                 .then(response => response.json())
                 .then(eventos => {
-                    console.log(`📅 Cargados ${eventos.length} eventos para ${mes}/${año}`);
+                    console.log(`📅 Cargados ${eventos.length} eventos entre ${info.startStr} y ${info.endStr}`);
                     successCallback(eventos);
                 })
                 .catch(error => {
@@ -273,17 +304,143 @@ function initializeCalendar() {
 
 // Cargar eventos del calendario
 async function loadCalendarEvents() {
+    // Vuelve a pedir la ventana visible; si no hubo cambios el servidor responde 304
+    if (calendar) {
+        calendar.refetchEvents();
+    }
+}
+
+// Feed de cambios: se aplican deltas en lugar de recargar las colecciones
+async function iniciarCambios() {
+    // El cursor se toma antes de la carga inicial: lo que cambie mientras
+    // tanto llega por el feed (aplicar dos veces un cambio no tiene efecto)
     try {
-        const today = new Date();
-        const response = await fetch(`/api/calendario?mes=${today.getMonth() + 1}&año=${today.getFullYear()}`);
-        const eventos = await response.json();
-        
-        calendar.removeAllEvents();
-        eventos.forEach(evento => {
-            calendar.addEvent(evento);
-        });
+        const response = await fetch('/api/cambios');
+        cambiosCursor = (await response.json()).cursor;
+        suscribirCambios();
+    } catch (error) {
+        console.error('❌ Error iniciando el feed de cambios:', error);
+    }
+}
+
+function suscribirCambios() {
+    if (!window.EventSource) {
+        setInterval(sincronizarCambios, CAMBIOS_POLLING_MS);
+        return;
+    }
+    cambiosFuente = new EventSource(`/api/cambios/stream?since=${cambiosCursor}`);
+    cambiosFuente.addEventListener('cambios', (evento) => {
+        aplicarCambios(JSON.parse(evento.data));
+        cambiosCursor = parseInt(evento.lastEventId);
+    });
+    cambiosFuente.addEventListener('recargar', recargarTodo);
+    cambiosFuente.onerror = () => {
+        // Si el servidor rechazó el stream (503) el navegador no reconecta: polling
+        if (cambiosFuente.readyState === EventSource.CLOSED) {
+            console.warn('⚠️ Stream de cambios no disponible, consultando cada', CAMBIOS_POLLING_MS, 'ms');
+            cambiosFuente = null;
+            setInterval(sincronizarCambios, CAMBIOS_POLLING_MS);
+        }
+    };
+}
+
+async function sincronizarCambios() {
+    if (cambiosCursor === null) {
+        return recargarTodo();
+    }
+    try {
+        let mas = true;
+        while (mas) {
+            const response = await fetch(`/api/cambios?since=${cambiosCursor}`);
+            if (response.status === 410) {
+                return recargarTodo();
+            }
+            const pagina = await response.json();
+            aplicarCambios(pagina.cambios);
+            cambiosCursor = Math.max(cambiosCursor, pagina.cursor);
+            mas = pagina.mas;
+        }
     } catch (error) {
-        console.error('Error cargando eventos del calendario:', error);
+        console.error('❌ Error sincronizando cambios:', error);
+    }
+}
+
+function recargarTodo() {
+    if (cambiosFuente) {
+        cambiosFuente.close();
+        cambiosFuente = null;
+    }
+    cambiosCursor = null;
+    iniciarCambios().then(() => {
+        loadInflables();
+        loadReservas();
+        loadCalendarEvents();
+    });
+}
+
+function compararReservas(a, b) {
+    // Mismo orden que /api/reservas: (fecha_inicio, id)
+    return a.fecha_inicio === b.fecha_inicio ? a.id - b.id : (a.fecha_inicio < b.fecha_inicio ? -1 : 1);
+}
+
+function aplicarCambios(cambios) {
+    let reservasCambiaron = false;
+    let inflablesCambiaron = false;
+    cambios.forEach(cambio => {
+        if (cambio.entidad === 'reserva') {
+            reservasCambiaron = true;
+            aplicarCambioReserva(cambio);
+        } else if (cambio.entidad === 'inflable') {
+            inflablesCambiaron = true;
+            const i = inflables.findIndex(inflable => inflable.id === cambio.entidad_id);
+            if (i >= 0) {
+                inflables.splice(i, 1);
+            }
+            // /api/inflables lista solo los activos
+            if (cambio.datos && cambio.datos.activo) {
+                const j = inflables.findIndex(inflable => inflable.id > cambio.entidad_id);
+                inflables.splice(j < 0 ? inflables.length : j, 0, cambio.datos);
+            }
+        }
+    });
+    if (reservasCambiaron) {
+        renderReservas();
+    }
+    if (inflablesCambiaron) {
+        renderInflables();
+    }
+}
+
+function aplicarCambioReserva(cambio) {
+    const i = reservas.findIndex(reserva => reserva.id === cambio.entidad_id);
+    if (i >= 0) {
+        reservas.splice(i, 1);
+    }
+    const reserva = cambio.datos;
+    if (reserva) {
+        // Solo dentro de las páginas ya cargadas; el resto llega con "cargar más"
+        const ultima = reservas[reservas.length - 1];
+        if (!reservasCursor || (ultima && compararReservas(reserva, ultima) < 0)) {
+            const j = reservas.findIndex(r => compararReservas(reserva, r) < 0);
+            reservas.splice(j < 0 ? reservas.length : j, 0, reserva);
+        }
+    }
+    
+    if (calendar) {
+        const evento = calendar.getEventById(String(cambio.entidad_id));
+        if (evento) {
+            evento.remove();
+        }
+        // El calendario muestra solo las reservas activas
+        if (reserva && (reserva.estado === 'pendiente' || reserva.estado === 'confirmada')) {
+            calendar.addEvent({
+                id: reserva.id,
+                title: `${reserva.inflable} - ${reserva.cliente}`,
+                start: reserva.fecha_inicio,
+                end: reserva.fecha_fin,
+                color: reserva.estado === 'pendiente' ? '#ff6b6b' : '#51cf66'
+            });
+        }
     }
 }
 
@@ -352,7 +509,7 @@ async function saveInflable() {
             showAlert('Inflable creado exitosamente', 'success');
             bootstrap.Modal.getInstance(document.getElementById('modalInflable')).hide();
             form.reset();
-            loadInflables();
+            sincronizarCambios();
         } else {
             const error = await response.json();
             showAlert(error.error || 'Error al crear inflable', 'danger');
@@ -392,8 +549,7 @@ async function saveReserva() {
             showAlert('Reserva creada exitosamente', 'success');
             bootstrap.Modal.getInstance(document.getElementById('modalReserva')).hide();
             form.reset();
-            loadReservas();
-            loadCalendarEvents();
+            sincronizarCambios();
         } else {
             const error = await response.json();
             showAlert(error.error || 'Error al crear reserva', 'danger');
@@ -457,6 +613,16 @@ function setupEventListeners() {
         });
     }
     
+    // Búsqueda de clientes en el modal de edición
+    const buscarCliente = document.getElementById('edit_cliente_buscar');
+    if (buscarCliente) {
+        let espera;
+        buscarCliente.addEventListener('input', function() {
+            clearTimeout(espera);
+            espera = setTimeout(() => buscarClientesParaEdicion(buscarCliente.value), CLIENTES_BUSQUEDA_ESPERA_MS);
+        });
+    }
+    
     // Event listener para el formulario de búsqueda
     const searchForm = document.getElementById('searchForm');
     if (searchForm) {
@@ -498,6 +664,17 @@ function showEventDetails(event) {
 }
 
 // Utilidades
+// Imagen del inflable con variantes responsivas (AVIF/WebP) si ya están generadas
+function imagenInflable(inflable, clase, sizes) {
+    if (!inflable.imagen_url) {
+        return '';
+    }
+    const fuentes = Object.entries(inflable.imagenes || {}).map(([formato, datos]) =>
+        `<source type="image/${formato}" srcset="${datos.srcset}" sizes="${sizes}">`
+    ).join('');
+    return `<picture>${fuentes}<img src="${inflable.imagen_url}" class="${clase}" alt="${inflable.nombre}" loading="lazy" onerror="this.style.display='none'"></picture>`;
+}
+
 function formatDate(dateString) {
     return new Date(dateString).toLocaleDateString('es-ES');
 }
@@ -559,7 +736,8 @@ async function searchDisponibilidad() {
         const disponibles = await response.json();
         console.log(`📋 Resultados: ${disponibles.length} inflables disponibles`);
         
-        showSearchResults(disponibles, fechaInicio, fechaFin);
+        const totales = await cotizarDisponibles(disponibles, fechaInicio, fechaFin);
+        showSearchResults(disponibles, fechaInicio, fechaFin, totales);
     } catch (error) {
         console.error('❌ Error buscando disponibilidad:', error);
         showAlert(`Error al buscar disponibilidad: ${error.message}`, 'danger');
@@ -568,7 +746,28 @@ async function searchDisponibilidad() {
     }
 }
 
-function showSearchResults(disponibles, fechaInicio, fechaFin) {
+// Totales con las reglas de precio, en un solo pedido para todos los resultados
+async function cotizarDisponibles(disponibles, fechaInicio, fechaFin) {
+    const totales = {};
+    if (disponibles.length === 0) return totales;
+    const response = await fetch('/api/cotizar', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            inflable_ids: disponibles.map(inflable => inflable.id),
+            rangos: [[fechaInicio, fechaFin]]
+        })
+    });
+    if (!response.ok) {
+        const error = await response.json();
+        throw new Error(error.error || 'Error al cotizar');
+    }
+    const { cotizaciones } = await response.json();
+    cotizaciones.forEach(c => { totales[c.inflable_id] = c.precio_total; });
+    return totales;
+}
+
+function showSearchResults(disponibles, fechaInicio, fechaFin, totales = {}) {
     const resultsContainer = document.getElementById('search-results');
     const contentContainer = document.getElementById('search-results-content');
     const originalList = document.getElementById('inflables-list');
@@ -602,7 +801,7 @@ function showSearchResults(disponibles, fechaInicio, fechaFin) {
                 ${disponibles.map(inflable => `
                     <div class="col-md-6 col-lg-4 mb-3">
                         <div class="card h-100 border-success">
-                            ${inflable.imagen_url ? `<img src="${inflable.imagen_url}" class="card-img-top search-img" alt="${inflable.nombre}" onerror="this.style.display='none'">` : ''}
+                            ${imagenInflable(inflable, 'card-img-top search-img', '(min-width: 992px) 33vw, (min-width: 768px) 50vw, 100vw')}
                             <div class="card-header bg-success text-white">
                                 <h6 class="mb-0">${inflable.nombre}</h6>
                             </div>
@@ -615,7 +814,7 @@ function showSearchResults(disponibles, fechaInicio, fechaFin) {
                                     </div>
                                     <div class="text-end">
                                         <span class="text-muted small">Total (${dias} día${dias !== 1 ? 's' : ''}):</span><br>
-                                        <span class="h5 text-primary mb-0">$${(inflable.precio_diario * dias).toFixed(2)}</span>
+                                        <span class="h5 text-primary mb-0">$${(totales[inflable.id] ?? inflable.precio_diario * dias).toFixed(2)}</span>
                                     </div>
                                 </div>
                             </div>
@@ -697,7 +896,7 @@ async function showInflableDetails(inflableId) {
         // Mostrar información del inflable
         document.getElementById('inflableDetailsTitle').textContent = `Detalles: ${inflable.nombre}`;
         document.getElementById('inflableInfo').innerHTML = `
-            ${inflable.imagen_url ? `<img src="${inflable.imagen_url}" class="img-fluid rounded mb-3" alt="${inflable.nombre}" onerror="this.style.display='none'">` : ''}
+            ${imagenInflable(inflable, 'img-fluid rounded mb-3', '(min-width: 992px) 50vw, 100vw')}
             <h6>${inflable.nombre}</h6>
             <p class="text-muted">${inflable.descripcion || 'Sin descripción'}</p>
             <hr>
@@ -771,14 +970,16 @@ async function showInflableHistory(inflableId) {
             return;
         }
 
-        // Cargar historial de reservas
-        const response = await fetch(`/api/inflables/${inflableId}/reservas?tipo=historial`);
-        const historial = await response.json();
+        // Cargar la primera página del historial (incluye las reservas archivadas)
+        historial = [];
+        historialInflableId = inflableId;
+        historialCursor = null;
+        await loadMasHistorial();
 
         // Mostrar información del inflable
         document.getElementById('inflableHistoryTitle').textContent = `Historial: ${inflable.nombre}`;
         document.getElementById('inflableHistoryInfo').innerHTML = `
-            ${inflable.imagen_url ? `<img src="${inflable.imagen_url}" class="img-fluid rounded mb-3" alt="${inflable.nombre}" onerror="this.style.display='none'">` : ''}
+            ${imagenInflable(inflable, 'img-fluid rounded mb-3', '(min-width: 992px) 50vw, 100vw')}
             <h6>${inflable.nombre}</h6>
             <p class="text-muted">${inflable.descripcion || 'Sin descripción'}</p>
             <hr>
@@ -788,57 +989,10 @@ async function showInflableHistory(inflableId) {
             </div>
             <hr>
             <div class="text-center">
-                <span class="badge bg-secondary fs-6">${historial.length} reservas completadas</span>
+                <span class="badge bg-secondary fs-6" id="historialCantidad"></span>
             </div>
         `;
-
-        // Mostrar historial
-        if (historial.length === 0) {
-            document.getElementById('historialReservas').innerHTML = `
-                <div class="alert alert-info text-center">
-                    <i class="fas fa-history me-2"></i>
-                    No hay historial de reservas para este inflable
-                </div>
-            `;
-        } else {
-            document.getElementById('historialReservas').innerHTML = `
-                <div class="table-responsive">
-                    <table class="table table-sm table-hover">
-                        <thead>
-                            <tr>
-                                <th>Cliente</th>
-                                <th>Teléfono</th>
-                                <th>Fechas</th>
-                                <th>Precio</th>
-                                <th>Notas</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${historial.map(reserva => `
-                                <tr>
-                                    <td>
-                                        <strong>${reserva.cliente}</strong>
-                                        ${reserva.email ? `<br><small class="text-muted">${reserva.email}</small>` : ''}
-                                    </td>
-                                    <td>${reserva.telefono}</td>
-                                    <td>
-                                        <small>
-                                            ${formatDate(reserva.fecha_inicio)}<br>
-                                            <span class="text-muted">a</span><br>
-                                            ${formatDate(reserva.fecha_fin)}
-                                        </small>
-                                    </td>
-                                    <td class="text-success fw-bold">$${reserva.precio_total.toFixed(2)}</td>
-                                    <td>
-                                        ${reserva.notas ? `<small class="text-muted">${reserva.notas}</small>` : '<span class="text-muted">-</span>'}
-                                    </td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>
-                </div>
-            `;
-        }
+        renderHistorial();
 
         // Mostrar modal
         new bootstrap.Modal(document.getElementById('modalInflableHistory')).show();
@@ -848,7 +1002,97 @@ async function showInflableHistory(inflableId) {
     }
 }
 
+// Cargar la siguiente página del historial del inflable abierto
+async function loadMasHistorial() {
+    let url = `/api/inflables/${historialInflableId}/reservas?tipo=historial&limite=${HISTORIAL_POR_PAGINA}`;
+    if (historialCursor) {
+        url += `&cursor=${encodeURIComponent(historialCursor)}`;
+    }
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Error ${response.status}: ${response.statusText}`);
+    }
+    const pagina = await response.json();
+    historial = historial.concat(pagina.reservas);
+    historialCursor = pagina.siguiente_cursor;
+}
+
+async function cargarMasHistorial() {
+    try {
+        await loadMasHistorial();
+        renderHistorial();
+    } catch (error) {
+        console.error('Error cargando historial:', error);
+        showAlert('Error al cargar el historial del inflable', 'danger');
+    }
+}
+
+function renderHistorial() {
+    document.getElementById('historialCantidad').textContent =
+        `${historial.length}${historialCursor ? '+' : ''} reservas completadas`;
+
+    if (historial.length === 0) {
+        document.getElementById('historialReservas').innerHTML = `
+            <div class="alert alert-info text-center">
+                <i class="fas fa-history me-2"></i>
+                No hay historial de reservas para este inflable
+            </div>
+        `;
+    } else {
+        document.getElementById('historialReservas').innerHTML = `
+            <div class="table-responsive">
+                <table class="table table-sm table-hover">
+                    <thead>
+                        <tr>
+                            <th>Cliente</th>
+                            <th>Teléfono</th>
+                            <th>Fechas</th>
+                            <th>Precio</th>
+                            <th>Notas</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        ${historial.map(reserva => `
+                            <tr>
+                                <td>
+                                    <strong>${reserva.cliente}</strong>
+                                    ${reserva.email ? `<br><small class="text-muted">${reserva.email}</small>` : ''}
+                                </td>
+                                <td>${reserva.telefono}</td>
+                                <td>
+                                    <small>
+                                        ${formatDate(reserva.fecha_inicio)}<br>
+                                        <span class="text-muted">a</span><br>
+                                        ${formatDate(reserva.fecha_fin)}
+                                    </small>
+                                </td>
+                                <td class="text-success fw-bold">$${reserva.precio_total.toFixed(2)}</td>
+                                <td>
+                                    ${reserva.notas ? `<small class="text-muted">${reserva.notas}</small>` : '<span class="text-muted">-</span>'}
+                                </td>
+                            </tr>
+                        `).join('')}
+                    </tbody>
+                </table>
+            </div>
+            ${historialCursor ? `
+                <div class="text-center">
+                    <button class="btn btn-outline-secondary btn-sm" onclick="cargarMasHistorial()">
+                        Cargar más
+                    </button>
+                </div>
+            ` : ''}
+        `;
+    }
+}
+
 // Funciones para editar/eliminar reservas
+let reservaEditadaEtag = null;
+
+function headersVersionReserva(headers = {}) {
+    return reservaEditadaEtag ? { ...headers, 'If-Match': reservaEditadaEtag } : headers;
+}
+
 async function editReserva(id) {
     console.log(`🔧 Editando reserva ID: ${id}`);
     
@@ -861,6 +1105,8 @@ async function editReserva(id) {
         
         const reserva = await response.json();
         console.log('📋 Datos de la reserva:', reserva);
+        // Versión editada: el guardado falla con 412 si otro la cambió mientras tanto
+        reservaEditadaEtag = response.headers.get('ETag');
         
         // Llenar formulario de edición
         document.getElementById('edit_reserva_id').value = reserva.id;
@@ -870,12 +1116,13 @@ async function editReserva(id) {
         document.getElementById('edit_notas').value = reserva.notas || '';
         document.getElementById('edit_precio_total').value = reserva.precio_total;
         
-        // Cargar clientes e inflables
-        await cargarClientesParaEdicion();
+        // Cliente actual (los demás se buscan) e inflables
+        const enLista = reservas.find(r => r.id === reserva.id);
+        document.getElementById('edit_cliente_buscar').value = '';
+        cargarClientesParaEdicion({ id: reserva.cliente_id, nombre: enLista ? enLista.cliente : `Cliente #${reserva.cliente_id}` });
         await cargarInflablesParaEdicion();
         
-        // Seleccionar cliente e inflable actuales
-        document.getElementById('edit_cliente_select').value = reserva.cliente_id;
+        // Seleccionar inflable actual
         document.getElementById('edit_inflable_select').value = reserva.inflable_id;
         
         // Mostrar modal
@@ -888,22 +1135,41 @@ async function editReserva(id) {
     }
 }
 
-async function cargarClientesParaEdicion() {
+// Opciones del cliente: el elegido (siempre presente) y los resultados de la búsqueda
+function cargarClientesParaEdicion(actual, clientes = []) {
+    const select = document.getElementById('edit_cliente_select');
+    select.innerHTML = '<option value="">Seleccione un cliente...</option>';
+    
+    [actual, ...clientes.filter(c => c.id !== actual.id)].forEach(cliente => {
+        const option = document.createElement('option');
+        option.value = cliente.id;
+        option.textContent = cliente.email ? `${cliente.nombre} - ${cliente.email}` : cliente.nombre;
+        select.appendChild(option);
+    });
+    select.value = actual.id;
+}
+
+async function buscarClientesParaEdicion(texto) {
+    const opcion = document.getElementById('edit_cliente_select').selectedOptions[0];
+    if (!opcion || !opcion.value) return;
+    const actual = { id: parseInt(opcion.value), nombre: opcion.textContent };
+    if (clientesBusqueda) clientesBusqueda.abort();
+    if (!texto.trim()) {
+        cargarClientesParaEdicion(actual);
+        return;
+    }
+    
+    clientesBusqueda = new AbortController();
     try {
-        const response = await fetch('/api/clientes');
-        const clientes = await response.json();
-        
-        const select = document.getElementById('edit_cliente_select');
-        select.innerHTML = '<option value="">Seleccione un cliente...</option>';
-        
-        clientes.forEach(cliente => {
-            const option = document.createElement('option');
-            option.value = cliente.id;
-            option.textContent = `${cliente.nombre} - ${cliente.email}`;
-            select.appendChild(option);
-        });
+        const response = await fetch(`/api/clientes/buscar?q=${encodeURIComponent(texto)}&limite=20`,
+                                     { signal: clientesBusqueda.signal });
+        if (!response.ok) return;
+        const { clientes } = await response.json();
+        cargarClientesParaEdicion(actual, clientes);
     } catch (error) {
-        console.error('❌ Error cargando clientes:', error);
+        if (error.name !== 'AbortError') {
+            console.error('❌ Error buscando clientes:', error);
+        }
     }
 }
 
@@ -943,9 +1209,9 @@ async function guardarReservaEditada() {
     try {
         const response = await fetch(`/api/reservas/${reservaId}`, {
             method: 'PUT',
-            headers: {
+            headers: headersVersionReserva({
                 'Content-Type': 'application/json'
-            },
+            }),
             body: JSON.stringify({
                 fecha_inicio: fechaInicio,
                 fecha_fin: fechaFin,
@@ -957,7 +1223,8 @@ async function guardarReservaEditada() {
         });
         
         if (!response.ok) {
-            throw new Error(`Error ${response.status}: ${response.statusText}`);
+            const error = await response.json().catch(() => ({}));
+            throw new Error(error.error || `Error ${response.status}: ${response.statusText}`);
         }
         
         const resultado = await response.json();
@@ -969,8 +1236,7 @@ async function guardarReservaEditada() {
         const modal = bootstrap.Modal.getInstance(document.getElementById('modalEditarReserva'));
         modal.hide();
         
-        loadReservas();
-        loadCalendarEvents();
+        sincronizarCambios();
         
     } catch (error) {
         console.error('❌ Error actualizando reserva:', error);
@@ -984,11 +1250,13 @@ async function confirmarEliminacionReserva() {
     if (confirm('¿Está seguro de que desea eliminar esta reserva? Esta acción no se puede deshacer.')) {
         try {
             const response = await fetch(`/api/reservas/${reservaId}`, {
-                method: 'DELETE'
+                method: 'DELETE',
+                headers: headersVersionReserva()
             });
             
             if (!response.ok) {
-                throw new Error(`Error ${response.status}: ${response.statusText}`);
+                const error = await response.json().catch(() => ({}));
+                throw new Error(error.error || `Error ${response.status}: ${response.statusText}`);
             }
             
             showAlert('Reserva eliminada exitosamente', 'success');
@@ -997,8 +1265,7 @@ async function confirmarEliminacionReserva() {
             const modal = bootstrap.Modal.getInstance(document.getElementById('modalEditarReserva'));
             modal.hide();
             
-            loadReservas();
-            loadCalendarEvents();
+            sincronizarCambios();
             
         } catch (error) {
             console.error('❌ Error eliminando reserva:', error);
@@ -1027,8 +1294,7 @@ async function eliminarReservaDirecta(id) {
         showAlert('Reserva eliminada exitosamente', 'success');
         
         // Recargar datos
-        loadReservas();
-        loadCalendarEvents();
+        sincronizarCambios();
         
     } catch (error) {
         console.error('❌ Error eliminando reserva:', error);
@@ -0,0 +1,149 @@
+"""
+Tareas periódicas en segundo plano.
+
+Cada tarea es una función sin argumentos que devuelve cuántas filas tocó, con
+el intervalo mínimo entre dos ejecuciones. ejecutar_pendientes() corre las
+que ya les toca según el registro de ejecuciones (el inicio de la última
+exitosa); iniciar() lo hace cada cierto tiempo en un hilo del proceso, y
+`flask tareas` una sola vez (p. ej. desde cron).
+
+Con varios workers (o un cron además de los workers), cada uno intenta todas
+las tareas: el bloqueo que recibe el Planificador (un advisory lock de
+PostgreSQL, o bloqueo_archivo() si la base es local) hace que solo uno corra
+cada tarea a la vez, y el que la toma después ve en el registro que ya corrió
+y la saltea.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # opcional (no existe en Windows)
+    fcntl = None
+
+logger = logging.getLogger('inflables')
+
+
+@contextmanager
+def bloqueo_archivo(ruta):
+    """flock exclusivo de ruta, sin esperar: entrega True si lo obtuvo. Vale
+    entre procesos de la misma máquina (workers de gunicorn, cron); sin fcntl,
+    siempre True."""
+    if fcntl is None:
+        yield True
+        return
+    with open(ruta, 'a') as archivo:
+        try:
+            fcntl.flock(archivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            obtenido = True
+        except BlockingIOError:
+            obtenido = False
+        try:
+            yield obtenido
+        finally:
+            if obtenido:
+                fcntl.flock(archivo, fcntl.LOCK_UN)
+
+
+class Planificador:
+    def __init__(self, bloquear, ultima_ejecucion, registrar, contexto=None, metricas=None, espera=60):
+        """
+        bloquear: función (nombre) que devuelve un context manager; entrega True
+        si este proceso puede correr la tarea, False si otro la está corriendo.
+        ultima_ejecucion: función (nombre) que devuelve el inicio (datetime UTC)
+        de la última ejecución exitosa, o None.
+        registrar: función (nombre, inicio, segundos, filas, error) que guarda la ejecución.
+        contexto: función sin argumentos que devuelve el context manager en el
+        que corre cada tarea (el app context de Flask).
+        metricas: Metricas de observabilidad.py, o None.
+        espera: segundos entre dos revisiones del hilo de iniciar().
+        """
+        self._bloquear = bloquear
+        self._ultima_ejecucion = ultima_ejecucion
+        self._registrar = registrar
+        self._contexto = contexto
+        self._metricas = metricas
+        self._espera = espera
+        self._tareas = {}  # nombre -> (función, intervalo en segundos)
+        self._hilo = None
+        self._detener = threading.Event()
+
+    def tarea(self, nombre, intervalo):
+        """Decorador que registra una tarea que corre cada intervalo segundos"""
+        def registrar(funcion):
+            self._tareas[nombre] = (funcion, intervalo)
+            return funcion
+        return registrar
+
+    @property
+    def tareas(self):
+        return {nombre: intervalo for nombre, (_, intervalo) in self._tareas.items()}
+
+    def ejecutar(self, nombre, forzar=False):
+        """Correr la tarea si le toca (o siempre, con forzar). Devuelve
+        {'filas', 'segundos', 'error'}, o None si no corrió."""
+        funcion, intervalo = self._tareas[nombre]
+        with self._bloquear(nombre) as obtenido:
+            if not obtenido:
+                if self._metricas:
+                    self._metricas.tareas.inc(nombre, 'ocupada')
+                return None
+            ultima = self._ultima_ejecucion(nombre)
+            if not forzar and ultima is not None and (datetime.utcnow() - ultima).total_seconds() < intervalo:
+                return None
+            inicio = datetime.utcnow()
+            reloj = time.perf_counter()
+            filas = error = None
+            try:
+                filas = funcion()
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                logger.exception('Falló la tarea %s', nombre, extra={'tarea': nombre})
+            segundos = time.perf_counter() - reloj
+            self._registrar(nombre, inicio, segundos, filas, error)
+        if self._metricas:
+            self._metricas.tareas.inc(nombre, 'error' if error else 'ok')
+            self._metricas.tareas_duracion.observar(segundos, nombre)
+            if filas:
+                self._metricas.tareas_filas.inc(nombre, cantidad=filas)
+        if not error:
+            logger.info('Tarea %s: %s filas en %.2f s', nombre, filas, segundos,
+                        extra={'tarea': nombre, 'filas': filas, 'segundos': round(segundos, 3)})
+        return {'filas': filas, 'segundos': segundos, 'error': error}
+
+    def ejecutar_pendientes(self, nombres=None, forzar=False):
+        """{nombre: resultado de ejecutar()} de las tareas (todas o las de nombres)"""
+        resultados = {}
+        for nombre in nombres or list(self._tareas):
+            if self._contexto is None:
+                resultados[nombre] = self.ejecutar(nombre, forzar)
+            else:
+                with self._contexto():
+                    resultados[nombre] = self.ejecutar(nombre, forzar)
+        return resultados
+
+    def iniciar(self):
+        """Revisar las tareas cada `espera` segundos en un hilo daemon"""
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._bucle, name='tareas', daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+
+    def _bucle(self):
+        # Desfasar los workers que arrancan juntos
+        self._detener.wait(random.uniform(0, self._espera))
+        while not self._detener.is_set():
+            try:
+                self.ejecutar_pendientes()
+            except Exception:
+                # Sin base, por ejemplo: reintentar en la próxima vuelta
+                logger.exception('No se pudieron revisar las tareas periódicas')
+            self._detener.wait(self._espera)
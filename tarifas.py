@@ -0,0 +1,166 @@
+"""
+Motor de precios.
+
+El precio de una reserva es la suma del precio diario del inflable por el
+factor de cada día (fin de semana, temporada), multiplicada por el factor de
+duración que corresponda a la cantidad de días:
+
+    fin_de_semana  factor para sábados y domingos
+    temporada      factor para los días entre desde y hasta
+    duracion       factor sobre el total para reservas de dias_minimos o más
+                   (se aplica la de mayor dias_minimos que alcance)
+
+Las reglas sin inflable valen para todos; si un inflable tiene reglas propias
+de un tipo, reemplazan a las generales de ese tipo. Los factores de un mismo
+día se multiplican.
+
+Las reglas se compilan, por cada combinación distinta de reglas efectivas,
+en la suma acumulada de los factores diarios de una ventana alrededor de
+hoy; el precio de un rango es entonces una resta de dos posiciones por el
+precio diario. Fuera de la ventana se calcula día por día. Como el índice de
+disponibilidad, es por proceso y se reconstruye al invalidarse o al vencer
+el TTL: sirve para cotizar. Para cobrar una reserva, PreciosVigentes calcula
+lo mismo día por día con precios y reglas recién leídos de la base.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from itertools import accumulate
+
+TIPOS_REGLA = ('fin_de_semana', 'temporada', 'duracion')
+DIAS_FIN_DE_SEMANA = (5, 6)  # date.weekday(): sábado y domingo
+
+
+def _factor_dia(fecha, reglas):
+    factor = 1.0
+    for regla in reglas:
+        if regla.tipo == 'fin_de_semana' and fecha.weekday() in DIAS_FIN_DE_SEMANA:
+            factor *= regla.factor
+        elif regla.tipo == 'temporada' and regla.desde <= fecha <= regla.hasta:
+            factor *= regla.factor
+    return factor
+
+
+def _agrupar(reglas):
+    """(generales, propias): {tipo: [reglas]} y {inflable_id: {tipo: [reglas]}}"""
+    generales = {}
+    propias = {}
+    for regla in reglas:
+        destino = generales if regla.inflable_id is None else propias.setdefault(regla.inflable_id, {})
+        destino.setdefault(regla.tipo, []).append(regla)
+    return generales, propias
+
+
+def _efectivas(generales, propias, inflable_id):
+    efectivas = {**generales, **propias.get(inflable_id, {})}
+    return [r for tipo in TIPOS_REGLA for r in efectivas.get(tipo, ())]
+
+
+class _Perfil:
+    """Reglas efectivas de uno o más inflables; con dias, compiladas"""
+
+    def __init__(self, reglas, origen=None, dias=0):
+        self.reglas = [r for r in reglas if r.tipo != 'duracion']
+        # (dias_minimos, factor) de mayor a menor
+        self.duraciones = sorted(
+            ((r.dias_minimos, r.factor) for r in reglas if r.tipo == 'duracion'), reverse=True
+        )
+        self.acumulado = [0.0] + list(accumulate(
+            _factor_dia(origen + timedelta(days=i), self.reglas) for i in range(dias)
+        ))
+
+    def factor_duracion(self, dias):
+        for minimo, factor in self.duraciones:
+            if dias >= minimo:
+                return factor
+        return 1.0
+
+    def precio(self, precio_diario, inicio, fin, origen=None):
+        """Precio total de [inicio, fin]; de la suma acumulada si el rango
+        cae dentro de la ventana que empieza en origen"""
+        dias = (fin - inicio).days + 1
+        desde = (inicio - origen).days if origen is not None else -1
+        hasta = desde + dias
+        if desde >= 0 and hasta < len(self.acumulado):
+            suma = self.acumulado[hasta] - self.acumulado[desde]
+        else:
+            suma = sum(_factor_dia(inicio + timedelta(days=i), self.reglas) for i in range(dias))
+        return round(precio_diario * suma * self.factor_duracion(dias), 2)
+
+
+class MotorPrecios:
+    def __init__(self, cargador, ttl=None, dias_atras=365, dias_adelante=730):
+        """
+        cargador: función sin argumentos que devuelve (precios, reglas), donde
+        precios es {inflable_id: precio_diario} y reglas un iterable de objetos
+        con id, tipo, inflable_id, factor, desde, hasta y dias_minimos.
+        ttl: segundos tras los cuales se recompila; None para no vencer nunca.
+        """
+        self._cargador = cargador
+        self._ttl = ttl
+        self._dias_atras = dias_atras
+        self._dias_adelante = dias_adelante
+        self._lock = threading.RLock()
+        self._compilado_en = None
+        self._origen = None
+        self._inflables = {}  # inflable_id -> (precio_diario, _Perfil)
+
+    def invalidar(self):
+        with self._lock:
+            self._compilado_en = None
+
+    def compilar(self):
+        with self._lock:
+            precios, reglas = self._cargador()
+            generales, propias = _agrupar(reglas)
+            self._origen = date.today() - timedelta(days=self._dias_atras)
+            dias = self._dias_atras + self._dias_adelante
+            perfiles = {}
+            self._inflables = {}
+            for inflable_id, precio in precios.items():
+                lista = _efectivas(generales, propias, inflable_id)
+                # Los inflables con las mismas reglas comparten la compilación
+                clave = tuple(r.id for r in lista)
+                if clave not in perfiles:
+                    perfiles[clave] = _Perfil(lista, self._origen, dias)
+                self._inflables[inflable_id] = (precio, perfiles[clave])
+            self._compilado_en = time.monotonic()
+
+    def _asegurar(self):
+        if self._compilado_en is None or (
+            self._ttl is not None and time.monotonic() - self._compilado_en > self._ttl
+        ):
+            self.compilar()
+
+    def cotizar(self, inflable_id, inicio, fin):
+        """Precio total de [inicio, fin] (inclusive), o None si el inflable no existe"""
+        with self._lock:
+            self._asegurar()
+            datos = self._inflables.get(inflable_id)
+            origen = self._origen
+        if datos is None:
+            return None
+        precio, perfil = datos
+        return perfil.precio(precio, inicio, fin, origen)
+
+
+class PreciosVigentes:
+    """Precios con la misma interfaz que MotorPrecios pero sin compilar ni
+    TTL, día por día: para cobrar reservas con los precios y reglas que se
+    acaban de leer de la base (el motor de otro worker puede estar atrasado)"""
+
+    def __init__(self, precios, reglas):
+        """precios y reglas como los que devuelve el cargador de MotorPrecios"""
+        self._precios = precios
+        self._generales, self._propias = _agrupar(reglas)
+        self._perfiles = {}
+
+    def cotizar(self, inflable_id, inicio, fin):
+        """Precio total de [inicio, fin] (inclusive), o None si el inflable no existe"""
+        precio = self._precios.get(inflable_id)
+        if precio is None:
+            return None
+        if inflable_id not in self._perfiles:
+            self._perfiles[inflable_id] = _Perfil(_efectivas(self._generales, self._propias, inflable_id))
+        return self._perfiles[inflable_id].precio(precio, inicio, fin)
@@ -0,0 +1,58 @@
+"""
+Fixtures de los tests.
+
+Corren contra una base SQLite temporal, o contra la de TEST_DATABASE_URL
+(p. ej. un PostgreSQL descartable, para probar el trigger de solapamiento y
+las particiones): cada test borra y recrea las tablas.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+_directorio = tempfile.mkdtemp(prefix='inflables-tests-')
+os.environ['DATABASE_URL'] = os.environ.get('TEST_DATABASE_URL') or f'sqlite:///{_directorio}/tests.db'
+os.environ['TAREAS_ESPERA'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as modulo_app  # noqa: E402
+from app import db, Cliente, Inflable  # noqa: E402
+
+
+def _olvidar_caches():
+    for cache in (modulo_app.indice_disponibilidad, modulo_app.motor_precios, modulo_app.indice_clientes,
+                  modulo_app.calendario_cache, modulo_app.catalogo_cache):
+        cache.invalidar()
+
+
+@pytest.fixture
+def app():
+    with modulo_app.app.app_context():
+        db.drop_all()
+        db.create_all()
+        _olvidar_caches()
+        yield modulo_app.app
+        db.session.remove()
+
+
+@pytest.fixture
+def cliente_http(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def inflable(app):
+    inflable = Inflable(nombre='Castillo', precio_diario=100)
+    db.session.add(inflable)
+    db.session.commit()
+    return inflable.id
+
+
+@pytest.fixture
+def cliente(app):
+    cliente = Cliente(nombre='Ana', telefono='11 5555-0001')
+    db.session.add(cliente)
+    db.session.commit()
+    return cliente.id
@@ -0,0 +1,115 @@
+"""Analítica desde el resumen mensual"""
+
+import random
+from datetime import date, timedelta
+
+import analitica
+from app import db, Inflable, Reserva, ResumenMensual, completar_reservas, reconstruir_resumen, vencer_pendientes
+
+OPERACIONES = 150
+
+
+def _ocupacion(cliente_http, desde, hasta):
+    respuesta = cliente_http.get(f'/api/analitica/ocupacion?desde={desde}&hasta={hasta}')
+    assert respuesta.status_code == 200
+    return {i['inflable_id']: i['dias_ocupados'] for i in respuesta.get_json()['inflables']}
+
+
+def test_ocupacion_con_reservas_que_empiezan_antes_del_rango(cliente_http, inflable, cliente):
+    # Escrita por fuera de la API: el resumen no la tiene
+    db.session.add(Reserva(inflable_id=inflable, cliente_id=cliente, fecha_inicio=date(2030, 3, 25),
+                           fecha_fin=date(2030, 5, 5), precio_total=4200, estado='confirmada'))
+    db.session.commit()
+    # Un extremo suelto y un mes completo
+    assert _ocupacion(cliente_http, '2030-03-28', '2030-03-31') == {inflable: 4}
+    assert _ocupacion(cliente_http, '2030-04-10', '2030-05-20') == {inflable: 26}
+
+    reconstruir_resumen()
+    assert _ocupacion(cliente_http, '2030-03-28', '2030-03-31') == {inflable: 4}
+    assert _ocupacion(cliente_http, '2030-03-28', '2030-05-20') == {inflable: 39}
+
+
+def _resumen_en_tabla():
+    return {
+        (r.mes, r.inflable_id, r.estado): (r.reservas, r.dias, r.ingresos, r.primer_inicio)
+        for r in ResumenMensual.query if r.reservas or r.dias
+    }
+
+
+def _comparar_con_reservas():
+    esperado = analitica.agregar_mensual(db.session.execute(db.select(
+        Reserva.inflable_id, Reserva.fecha_inicio, Reserva.fecha_fin, Reserva.estado, Reserva.precio_total
+    )))
+    obtenido = _resumen_en_tabla()
+    assert esperado.keys() == obtenido.keys()
+    for clave, (reservas, dias, ingresos, primer_inicio) in esperado.items():
+        assert obtenido[clave][:2] == (reservas, dias)
+        assert abs(obtenido[clave][2] - ingresos) < 1e-6
+        # Al borrar no sube: sigue siendo una cota inferior
+        assert obtenido[clave][3] <= primer_inicio
+
+
+def test_resumen_al_dia_tras_cada_escritura(cliente_http, app):
+    """Altas, modificaciones, bajas y tareas al azar: el resumen que se
+    actualiza con cada escritura es el que se recalcula desde las reservas"""
+    azar = random.Random(20261018)
+    db.session.add_all([Inflable(nombre=f'Inflable {n}', precio_diario=80 + 10 * n) for n in range(4)])
+    db.session.commit()
+    inflables = [i.id for i in Inflable.query]
+    origen = date.today() - timedelta(days=60)
+    reservas = []
+    for _ in range(OPERACIONES):
+        inicio = origen + timedelta(days=azar.randrange(150))
+        fin = inicio + timedelta(days=azar.randrange(45))
+        operacion = azar.random()
+        if not reservas or operacion < 0.35:
+            respuesta = cliente_http.post('/api/reservas', json={
+                'inflable_id': azar.choice(inflables), 'fecha_inicio': inicio.isoformat(),
+                'fecha_fin': fin.isoformat(), 'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+            })
+            if respuesta.status_code == 200:
+                reservas.append(respuesta.get_json()['id'])
+        elif operacion < 0.45:
+            respuesta = cliente_http.post('/api/reservas/bulk', json=[{
+                'inflable_id': azar.choice(inflables), 'fecha_inicio': (inicio + timedelta(days=60 * n)).isoformat(),
+                'fecha_fin': (fin + timedelta(days=60 * n)).isoformat(),
+                'cliente': {'nombre': 'Beto', 'telefono': '11 5555-0002'},
+            } for n in range(3)])
+            reservas.extend(r['id'] for r in respuesta.get_json()['resultados'] if r['estado'] == 'creada')
+        elif operacion < 0.8:
+            cambios = azar.choice([
+                {'fecha_inicio': inicio.isoformat(), 'fecha_fin': fin.isoformat()},
+                {'inflable_id': azar.choice(inflables)},
+                {'estado': azar.choice(['confirmada', 'cancelada', 'completada'])},
+                {'notas': 'sin cambios en el resumen'},
+            ])
+            cliente_http.put(f'/api/reservas/{azar.choice(reservas)}', json=cambios)
+        elif operacion < 0.95:
+            cliente_http.delete(f'/api/reservas/{reservas.pop(azar.randrange(len(reservas)))}')
+        else:
+            completar_reservas()
+            vencer_pendientes()
+        _comparar_con_reservas()
+    assert len(_resumen_en_tabla()) > 10
+
+
+def test_reservas_sin_estado_cuentan_como_pendientes(cliente_http, inflable, cliente):
+    # Una reserva vieja, anterior a que la columna tuviera valor por defecto
+    db.session.add(Reserva(inflable_id=inflable, cliente_id=cliente, fecha_inicio=date(2030, 1, 30),
+                           fecha_fin=date(2030, 2, 2), precio_total=400, estado=None))
+    db.session.commit()
+    reserva_id = Reserva.query.one().id
+    assert reconstruir_resumen() == 2
+    assert {r.estado for r in ResumenMensual.query} == {'pendiente'}
+
+    # Al modificarla o borrarla se resta de las pendientes
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', json={'estado': 'confirmada'})
+    assert respuesta.status_code == 200
+    assert {(r.mes, r.estado): r.dias for r in ResumenMensual.query if r.dias} == {
+        (date(2030, 1, 1), 'confirmada'): 2, (date(2030, 2, 1), 'confirmada'): 2
+    }
+    Reserva.query.update({'estado': None})
+    db.session.commit()
+    reconstruir_resumen()
+    assert cliente_http.delete(f'/api/reservas/{reserva_id}').status_code == 200
+    assert not [r for r in ResumenMensual.query if r.reservas or r.dias]
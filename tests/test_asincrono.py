@@ -0,0 +1,82 @@
+"""POST /api/reservas de la variante ASGI (asincrono.py), sobre el engine asíncrono"""
+
+import asyncio
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app import db, Inflable, Reserva, ReglaPrecio, precios_vigentes
+from respuestas import a_json, de_json
+
+pytest.importorskip({'postgresql': 'asyncpg'}.get(make_url(os.environ['DATABASE_URL']).get_backend_name(),
+                                                 'aiosqlite'))
+import asincrono  # noqa: E402
+
+HOY = date.today()
+
+
+async def _pedir(metodo, ruta, datos=None):
+    scope = {'type': 'http', 'method': metodo, 'path': ruta, 'query_string': b'', 'headers': []}
+    mensajes = [{'type': 'http.request', 'body': a_json(datos) if datos is not None else b''}]
+    enviados = []
+
+    async def receive():
+        return mensajes.pop(0)
+
+    async def send(mensaje):
+        enviados.append(mensaje)
+
+    await asincrono.app(scope, receive, send)
+    return enviados[0]['status'], de_json(enviados[1]['body'])
+
+
+def _reserva(inflable_id, desde, dias, telefono='11 5555-0001'):
+    return {
+        'inflable_id': inflable_id, 'fecha_inicio': (HOY + timedelta(days=desde)).isoformat(),
+        'fecha_fin': (HOY + timedelta(days=desde + dias)).isoformat(),
+        'cliente': {'nombre': 'Ana', 'telefono': telefono},
+    }
+
+
+def test_create_reserva(app, inflable):
+    db.session.add_all([
+        ReglaPrecio(tipo='fin_de_semana', factor=1.5),
+        ReglaPrecio(tipo='duracion', inflable_id=inflable, factor=0.8, dias_minimos=5),
+    ])
+    db.session.commit()
+    # Precios y reglas se leen por el engine asíncrono, no por el de Flask
+    leidas_por_flask = []
+
+    def registrar(conexion, cursor, sentencia, *_):
+        leidas_por_flask.append(sentencia)
+
+    async def pedidos():
+        try:
+            return [await _pedir('POST', '/api/reservas', datos) for datos in (
+                _reserva(inflable, 10, 6),
+                _reserva(inflable, 30, 1, telefono='11 5555-0002'),
+                _reserva(inflable, 12, 0, telefono='11 5555-0003'),   # choca con la primera
+                _reserva(inflable + 99, 10, 1),
+                {**_reserva(inflable, 50, 1), 'fecha_fin': HOY.isoformat()},
+            )]
+        finally:
+            await asincrono.engine.dispose()
+
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        respuestas = asyncio.run(pedidos())
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+    assert [estado for estado, _ in respuestas] == [200, 200, 409, 404, 400]
+    assert not [s for s in leidas_por_flask if 'regla_precio' in s]
+
+    db.session.expire_all()
+    for (_, cuerpo), datos in zip(respuestas[:2], (_reserva(inflable, 10, 6), _reserva(inflable, 30, 1))):
+        reserva = db.session.get(Reserva, cuerpo['id'])
+        inicio, fin = reserva.fecha_inicio, reserva.fecha_fin
+        assert (inicio.isoformat(), fin.isoformat()) == (datos['fecha_inicio'], datos['fecha_fin'])
+        assert reserva.precio_total == precios_vigentes([inflable]).cotizar(inflable, inicio, fin)
+    assert db.session.scalar(db.select(db.func.count()).select_from(Inflable)) == 1
@@ -0,0 +1,103 @@
+"""Búsqueda de clientes: el índice de trigramas (SQLite) y la consulta ILIKE
+(PostgreSQL) contra una búsqueda directa sobre todos los clientes"""
+
+import pytest
+
+import app as modulo_app
+from app import db, Cliente
+from busqueda import LARGO_SUBCADENA, normalizar_consulta, normalizar_telefono
+
+CLIENTES = [
+    ('Ana María Pérez', 'ana_bell@correo.com', '11 5555-0001'),
+    ('ÁNGEL Ruiz', 'angel@correo.com', '(011) 4444-1234'),
+    ('ángela Sosa', 'cien%@correo.com', '+54 9 11 5555 0002'),
+    ('Lara Bell', 'lara@correo.com', '221 400 1000'),
+    ('Ñandú Eventos', 'contacto@nandu.com.ar', '0800-555-0003'),
+    ('Bruno Díaz', '', 'sin teléfono'),
+    ('María José', 'mj@correo.com', '11 6000 7000'),
+]
+
+CONSULTAS = [
+    'a', 'an', 'ana', 'ANA', '  Ana   María ', 'ría', 'pérez', 'perez', 'bell', 'a b', 'a_b', '_b', 'n%@',
+    '%', '_', '555', '5555', '1155550001', '5555-00', '011', '1234', 'correo', '.com.ar', 'z', 'sin tel',
+    'ángel', 'ÁNGEL', 'Ángela', 'ñandú', 'ÑA', 'díaz', 'maría', 'MARÍA JOSÉ',
+]
+
+
+def _coinciden(consulta):
+    """Ids de los clientes que cumplen lo que documenta busqueda.py"""
+    consulta = normalizar_consulta(consulta)
+    ids = []
+    for cliente in Cliente.query:
+        campos = [normalizar_consulta(c) for c in (cliente.nombre, cliente.email, cliente.telefono_normalizado)]
+        if len(consulta) >= LARGO_SUBCADENA:
+            coincide = any(consulta in c for c in campos)
+        else:
+            coincide = any(c.startswith(consulta) for c in campos)
+        if coincide:
+            ids.append(cliente.id)
+    return sorted(ids)
+
+
+def _buscar(cliente_http, **parametros):
+    respuesta = cliente_http.get('/api/clientes/buscar', query_string=parametros)
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()
+
+
+@pytest.fixture(params=['base', 'sql'])
+def camino(request, app, monkeypatch):
+    """'base': el de la base de los tests (índice en SQLite, ILIKE con
+    TEST_DATABASE_URL de PostgreSQL); 'sql': la consulta ILIKE en cualquier base"""
+    if request.param == 'sql':
+        monkeypatch.setattr(modulo_app, 'busqueda_en_db', lambda: True)
+    return request.param
+
+
+def test_coincidencias(cliente_http, camino):
+    db.session.add_all([Cliente(nombre=n, email=e, telefono=t) for n, e, t in CLIENTES])
+    db.session.commit()
+    assert [c.telefono_normalizado for c in Cliente.query.order_by(Cliente.id)][:2] == ['1155550001', '01144441234']
+    for consulta in CONSULTAS:
+        # lower() y LIKE de SQLite solo pasan a minúsculas ASCII
+        if camino == 'sql' and db.engine.dialect.name == 'sqlite' and not consulta.isascii():
+            continue
+        encontrados = _buscar(cliente_http, q=consulta, limite=100)['clientes']
+        assert sorted(c['id'] for c in encontrados) == _coinciden(consulta), consulta
+    assert cliente_http.get('/api/clientes/buscar?q=%20').status_code == 400
+
+
+def test_paginas(cliente_http, camino):
+    db.session.add_all([Cliente(nombre=f'Cliente {n:02d}', email=f'c{n}@correo.com', telefono=f'11 4000-{n:04d}')
+                        for n in (7, 3, 24, 0, 15, 11, 19, 2, 8, 21, 13, 5, 17, 1, 22, 9, 4, 12, 20, 6)])
+    # Mismo nombre: desempata el id
+    db.session.add_all([Cliente(nombre='Cliente 10', telefono=f'11 4100-{n:04d}') for n in range(3)])
+    db.session.add(Cliente(nombre='Otro', telefono='11 4200-0000'))
+    db.session.commit()
+    esperados = [c.id for c in Cliente.query.filter(Cliente.nombre.like('Cliente%'))
+                 .order_by(Cliente.nombre, Cliente.id)]
+    assert len(esperados) == 23
+
+    vistos, cursor = [], None
+    while True:
+        parametros = {'q': 'client', 'limite': 5}
+        if cursor:
+            parametros['cursor'] = cursor
+        pagina = _buscar(cliente_http, **parametros)
+        assert len(pagina['clientes']) == (5 if pagina['siguiente_cursor'] else 3)
+        vistos += [c['id'] for c in pagina['clientes']]
+        cursor = pagina['siguiente_cursor']
+        if cursor is None:
+            break
+    assert vistos == esperados
+
+    assert [c['id'] for c in _buscar(cliente_http, q='cl')['clientes']] == esperados[:20]
+    assert len(_buscar(cliente_http, q='cl', limite=1000)['clientes']) == 23
+    assert cliente_http.get('/api/clientes/buscar?q=cl&limite=x').status_code == 400
+    assert _buscar(cliente_http, q='cl', cursor=esperados[-1]) == {'clientes': [], 'siguiente_cursor': None}
+
+
+def test_telefono_normalizado():
+    assert normalizar_telefono(' +54 (11) 5555-0001 ') == '541155550001'
+    assert normalizar_telefono('sin teléfono ') == 'sin teléfono'
+    assert normalizar_telefono(None) == ''
@@ -0,0 +1,131 @@
+"""Feed de cambios: cursor, compactación y purga del registro"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import app as modulo_app
+from app import db, Cambio, cargar_cambios, cursor_cambios, purgar_cambios, _stream_cambios
+from cambios import DifusorCambios, compactar
+
+HOY = date.today()
+
+
+@pytest.fixture
+def difusor(app, monkeypatch):
+    """Un difusor por test (el del módulo recuerda cursores de bases anteriores),
+    sin esperar entre lecturas y con poca memoria, para que los cursores viejos
+    se lean de la base"""
+    difusor = DifusorCambios(cargar_cambios, cursor_cambios, intervalo=0.01, capacidad=3)
+    monkeypatch.setattr(modulo_app, 'cambios_difusor', difusor)
+    return difusor
+
+
+def _reservar(cliente_http, inflable_id, desde):
+    respuesta = cliente_http.post('/api/reservas', json={
+        'inflable_id': inflable_id, 'fecha_inicio': (HOY + timedelta(days=desde)).isoformat(),
+        'fecha_fin': (HOY + timedelta(days=desde)).isoformat(),
+        'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+    })
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()['id']
+
+
+def _cambios(cliente_http, since, **parametros):
+    respuesta = cliente_http.get('/api/cambios', query_string={'since': since, **parametros})
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()
+
+
+def test_compactar_deja_el_ultimo_de_cada_entidad():
+    cambios = [
+        {'id': 1, 'entidad': 'reserva', 'entidad_id': 7, 'operacion': 'alta'},
+        {'id': 2, 'entidad': 'inflable', 'entidad_id': 7, 'operacion': 'modificacion'},
+        {'id': 3, 'entidad': 'reserva', 'entidad_id': 8, 'operacion': 'alta'},
+        {'id': 4, 'entidad': 'reserva', 'entidad_id': 7, 'operacion': 'baja'},
+    ]
+    assert [c['id'] for c in compactar(cambios)] == [2, 3, 4]
+    assert compactar([]) == []
+
+
+def test_el_cursor_avanza(cliente_http, inflable, difusor):
+    inicial = cliente_http.get('/api/cambios').get_json()
+    assert (inicial['cambios'], inicial['mas']) == ([], False)
+
+    primera = _reservar(cliente_http, inflable, 10)
+    cuerpo = _cambios(cliente_http, inicial['cursor'])
+    assert [(c['entidad_id'], c['operacion']) for c in cuerpo['cambios']] == [(primera, 'alta')]
+    assert cuerpo['cambios'][0]['datos']['id'] == primera
+    assert cuerpo['cursor'] > inicial['cursor']
+    # Con el cursor nuevo no hay nada más
+    assert _cambios(cliente_http, cuerpo['cursor']) == {'cursor': cuerpo['cursor'], 'cambios': [], 'mas': False}
+
+    # Alta y modificación de la misma reserva: una entrada con su estado actual;
+    # tras la baja, sin datos
+    segunda = _reservar(cliente_http, inflable, 20)
+    assert cliente_http.put(f'/api/reservas/{segunda}', json={'notas': 'nueva'}).status_code == 200
+    assert cliente_http.delete(f'/api/reservas/{primera}').status_code == 200
+    siguiente = _cambios(cliente_http, cuerpo['cursor'])
+    assert [(c['entidad_id'], c['operacion']) for c in siguiente['cambios']] == [
+        (segunda, 'modificacion'), (primera, 'baja')
+    ]
+    assert siguiente['cambios'][0]['datos']['notas'] == 'nueva'
+    assert siguiente['cambios'][1]['datos'] is None
+    assert siguiente['cursor'] == db.session.scalar(db.select(db.func.max(Cambio.id)))
+
+
+def test_paginas_con_limite(cliente_http, inflable, difusor):
+    difusor.cursor()
+    for dia in range(7):
+        _reservar(cliente_http, inflable, 10 + dia)
+    # Las primeras ya no están en memoria (capacidad 3): se leen de la base
+    cursor, vistos = 0, []
+    while True:
+        cuerpo = _cambios(cliente_http, cursor, limite=2)
+        vistos += [c['id'] for c in cuerpo['cambios']]
+        assert cuerpo['cursor'] >= cursor
+        cursor = cuerpo['cursor']
+        if not cuerpo['mas']:
+            break
+    assert vistos == [c.id for c in Cambio.query.order_by(Cambio.id)]
+    assert len(vistos) == 7
+
+
+def test_cursor_anterior_a_lo_conservado(cliente_http, inflable, difusor, monkeypatch):
+    for dia in range(5):
+        _reservar(cliente_http, inflable, 10 + dia)
+    ids = [c.id for c in Cambio.query.order_by(Cambio.id)]
+    # Las dos primeras quedan fuera de la retención
+    Cambio.query.filter(Cambio.id.in_(ids[:2])).update(
+        {'fecha': datetime.utcnow() - timedelta(days=30)}, synchronize_session=False
+    )
+    db.session.commit()
+    monkeypatch.setitem(modulo_app.app.config, 'CAMBIOS_RETENCION_DIAS', 7)
+    borrados, _ = purgar_cambios()
+    assert borrados == 2
+    assert [c.id for c in Cambio.query.order_by(Cambio.id)] == ids[2:]
+
+    assert cliente_http.get('/api/cambios?since=0').status_code == 410
+    assert cliente_http.get(f'/api/cambios?since={ids[1] - 1}').status_code == 410
+    # Quien ya había visto las purgadas sigue sin perder nada
+    cuerpo = _cambios(cliente_http, ids[1])
+    assert [c['id'] for c in cuerpo['cambios']] == ids[2:]
+    assert cliente_http.get('/api/cambios?since=x').status_code == 400
+
+
+def test_stream(cliente_http, inflable, difusor, monkeypatch):
+    cursor = difusor.cursor()
+    reserva_id = _reservar(cliente_http, inflable, 10)
+    eventos = list(_stream_cambios(cursor, 0.05))
+    assert eventos[0].startswith(f'id: {cursor + 1}\nevent: cambios\ndata: ')
+    assert f'"entidad_id":{reserva_id}' in eventos[0].replace(' ', '')
+    assert all(e == ': ping\n\n' for e in eventos[1:])
+
+    Cambio.query.update({'fecha': datetime.utcnow() - timedelta(days=30)}, synchronize_session=False)
+    db.session.commit()
+    _reservar(cliente_http, inflable, 20)
+    monkeypatch.setitem(modulo_app.app.config, 'CAMBIOS_RETENCION_DIAS', 7)
+    purgar_cambios()
+    # Otro worker, que no tiene en memoria la purgada
+    monkeypatch.setattr(modulo_app, 'cambios_difusor', DifusorCambios(cargar_cambios, cursor_cambios))
+    assert list(_stream_cambios(cursor, 0.05)) == ['event: recargar\ndata: {}\n\n']
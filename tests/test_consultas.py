@@ -0,0 +1,71 @@
+"""Cantidad de sentencias SQL por petición de los listados de reservas"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db, calendario_cache, Cliente, Inflable, Reserva
+
+HOY = date.today()
+RUTAS = [
+    '/api/reservas',
+    '/api/reservas?limite=500',
+    '/api/reservas?formato=ndjson',
+    '/api/calendario?start={desde}&end={hasta}',
+    '/api/inflables/{inflable}/reservas',
+    '/api/inflables/{inflable}/reservas?tipo=historial',
+    '/api/inflables/{inflable}/reservas?tipo=historial&limite=500',
+]
+
+
+@contextmanager
+def sentencias():
+    ejecutadas = []
+
+    def contar(conexion, cursor, sentencia, parametros, contexto, executemany):
+        ejecutadas.append(sentencia)
+
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    try:
+        yield ejecutadas
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', contar)
+
+
+def _agregar_reservas(inflable_id, cantidad):
+    """Por cada una, un inflable y un cliente propios con una reserva
+    confirmada, y una próxima y una completada del inflable_id con ese cliente"""
+    inflables = [Inflable(nombre=f'Inflable {n}', precio_diario=100) for n in range(cantidad)]
+    clientes = [Cliente(nombre=f'Cliente {n}', telefono=f'11 4444-{n:04d}') for n in range(cantidad)]
+    db.session.add_all(inflables + clientes)
+    db.session.flush()
+    desplazamiento = Reserva.query.count()
+    for n, (otro, cliente) in enumerate(zip(inflables, clientes), start=desplazamiento + 1):
+        futura = HOY + timedelta(days=n)
+        pasada = HOY - timedelta(days=n)
+        for inflable, fecha, estado in ((otro.id, futura, 'confirmada'), (inflable_id, futura, 'confirmada'),
+                                        (inflable_id, pasada, 'completada')):
+            db.session.add(Reserva(inflable_id=inflable, cliente_id=cliente.id, precio_total=100,
+                                   estado=estado, fecha_inicio=fecha, fecha_fin=fecha))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('ruta', RUTAS)
+def test_sentencias_no_dependen_de_la_cantidad_de_filas(cliente_http, inflable, ruta):
+    url = ruta.format(inflable=inflable, desde=HOY - timedelta(days=400), hasta=HOY + timedelta(days=400))
+    cuentas = []
+    tamanos = []
+    for cantidad in (3, 40):
+        _agregar_reservas(inflable, cantidad)
+        calendario_cache.invalidar()
+        db.session.remove()  # que ninguna instancia quede en la sesión
+        with sentencias() as ejecutadas:
+            respuesta = cliente_http.get(url)
+            cuerpo = respuesta.get_data()
+        assert respuesta.status_code == 200
+        cuentas.append(len(ejecutadas))
+        tamanos.append(len(cuerpo))
+    assert tamanos[1] > tamanos[0]
+    assert cuentas[0] == cuentas[1], cuentas
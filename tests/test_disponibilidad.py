@@ -0,0 +1,102 @@
+"""Índice de disponibilidad en memoria contra la consulta de solapamiento en SQL"""
+
+import random
+from datetime import date, timedelta
+
+from app import (
+    db, Inflable, Reserva, IndiceDisponibilidad, cargar_disponibilidad, disponibilidad_version,
+    filtro_solapamiento, indice_disponibilidad,
+)
+from cache import BackendMemoria, CacheVersionado
+
+OPERACIONES = 200
+CONSULTAS_POR_OPERACION = 5
+
+
+def _disponibles_en_sql(inicio, fin):
+    ocupado = db.exists().where(Reserva.inflable_id == Inflable.id, filtro_solapamiento(inicio, fin))
+    return [i for (i,) in db.session.query(Inflable.id).filter(
+        Inflable.activo == True, ~ocupado
+    ).order_by(Inflable.id)]
+
+
+def _rango(azar, origen):
+    inicio = origen + timedelta(days=azar.randrange(60))
+    return inicio, inicio + timedelta(days=azar.randrange(8))
+
+
+def test_indice_coincide_con_sql(cliente_http, app):
+    """Altas, modificaciones y bajas al azar por la API; después de cada una
+    el índice (actualizado en el lugar) responde lo mismo que la base"""
+    azar = random.Random(20261018)
+    db.session.add_all([Inflable(nombre=f'Inflable {n}', precio_diario=100) for n in range(6)])
+    db.session.commit()
+    inflables = [i.id for i in Inflable.query]
+    origen = date.today() + timedelta(days=10)
+    reservas = []
+    for n in range(OPERACIONES):
+        inicio, fin = _rango(azar, origen)
+        operacion = azar.random()
+        if not reservas or operacion < 0.5:
+            respuesta = cliente_http.post('/api/reservas', json={
+                'inflable_id': azar.choice(inflables), 'fecha_inicio': inicio.isoformat(),
+                'fecha_fin': fin.isoformat(), 'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+            })
+            if respuesta.status_code == 200:
+                reservas.append(respuesta.get_json()['id'])
+        elif operacion < 0.85:
+            cambios = azar.choice([
+                {'fecha_inicio': inicio.isoformat(), 'fecha_fin': fin.isoformat()},
+                {'inflable_id': azar.choice(inflables)},
+                {'estado': azar.choice(['pendiente', 'confirmada', 'completada', 'cancelada'])},
+            ])
+            cliente_http.put(f'/api/reservas/{azar.choice(reservas)}', json=cambios)
+        else:
+            reserva_id = reservas.pop(azar.randrange(len(reservas)))
+            assert cliente_http.delete(f'/api/reservas/{reserva_id}').status_code == 200
+        db.session.expire_all()
+        for _ in range(CONSULTAS_POR_OPERACION):
+            inicio, fin = _rango(azar, origen)
+            esperado = _disponibles_en_sql(inicio, fin)
+            assert [i['id'] for i in indice_disponibilidad.disponibles(inicio, fin)] == esperado, (n, inicio, fin)
+            inflable_id = azar.choice(inflables)
+            assert indice_disponibilidad.ocupado(inflable_id, inicio, fin) == (inflable_id not in esperado)
+
+
+def test_otro_worker_ve_las_escrituras_por_la_version(cliente_http, inflable):
+    # Otro worker con el mismo backend de versiones (Redis en producción) y sin TTL
+    otro = IndiceDisponibilidad(cargar_disponibilidad, version=lambda: disponibilidad_version.version)
+    inicio = date.today() + timedelta(days=30)
+    assert [i['id'] for i in otro.disponibles(inicio, inicio)] == [inflable]
+
+    respuesta = cliente_http.post('/api/reservas', json={
+        'inflable_id': inflable, 'fecha_inicio': inicio.isoformat(), 'fecha_fin': inicio.isoformat(),
+        'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+    })
+    assert respuesta.status_code == 200
+    assert otro.disponibles(inicio, inicio) == []
+
+    cliente_http.delete(f"/api/reservas/{respuesta.get_json()['id']}")
+    assert [i['id'] for i in otro.disponibles(inicio, inicio)] == [inflable]
+
+
+def test_quien_escribe_no_reconstruye_su_indice():
+    version = CacheVersionado('disponibilidad', BackendMemoria())
+    cargas = []
+
+    def cargar():
+        cargas.append(1)
+        return [], [{'id': 1}]
+
+    indice = IndiceDisponibilidad(cargar, version=lambda: version.version)
+    dia = date(2030, 1, 1)
+    assert indice.disponibles(dia, dia) == [{'id': 1}]
+    # Este proceso escribe: registra la reserva y sube la versión
+    indice.registrar(10, 1, dia, dia)
+    indice.al_dia(version.invalidar())
+    assert indice.disponibles(dia, dia) == []
+    assert len(cargas) == 1
+    # Escribe otro: se reconstruye desde la base
+    version.invalidar()
+    indice.disponibles(dia, dia)
+    assert len(cargas) == 2
@@ -0,0 +1,101 @@
+"""Tramos libres de la flota (ventanas_libres) contra un recorrido día por día"""
+
+import random
+from datetime import date, timedelta
+
+from app import db, Cliente, Inflable, Reserva, ESTADOS_ACTIVOS, ventanas_libres
+
+CONSULTAS = 150
+UN_DIA = timedelta(days=1)
+
+
+def _agregar_reservas(azar, inflables, cliente_id, origen):
+    """Por inflable, reservas activas sin solaparse entre sí, pegadas (la
+    siguiente empieza el día después) o con huecos; además canceladas y
+    completadas encima de cualquiera, que no ocupan"""
+    reservas = []
+    for inflable_id in inflables:
+        dia = origen + timedelta(days=azar.randrange(5))
+        for _ in range(azar.randrange(12)):
+            fin = dia + timedelta(days=azar.choice([0, 0, 1, 3, 6]))
+            reservas.append((inflable_id, dia, fin, azar.choice(ESTADOS_ACTIVOS)))
+            dia = fin + timedelta(days=azar.choice([1, 1, 2, 3, 5, 9]))
+        for _ in range(azar.randrange(3)):
+            inicio = origen + timedelta(days=azar.randrange(90))
+            reservas.append((inflable_id, inicio, inicio + timedelta(days=azar.randrange(5)),
+                             azar.choice(['cancelada', 'completada'])))
+    db.session.add_all([Reserva(inflable_id=inflable_id, cliente_id=cliente_id, fecha_inicio=inicio,
+                                fecha_fin=fin, precio_total=100, estado=estado)
+                        for inflable_id, inicio, fin, estado in reservas])
+    db.session.commit()
+
+
+def _ventanas_dia_por_dia(desde, hasta, inflable_ids=None):
+    ocupados = {}
+    for r in Reserva.query.filter(Reserva.estado.in_(ESTADOS_ACTIVOS)):
+        dia = r.fecha_inicio
+        while dia <= r.fecha_fin:
+            ocupados.setdefault(r.inflable_id, set()).add(dia)
+            dia += UN_DIA
+    ventanas = {}
+    for inflable in Inflable.query.filter(Inflable.activo == True):
+        if inflable_ids is not None and inflable.id not in inflable_ids:
+            continue
+        tramos = ventanas[inflable.id] = []
+        dia = desde
+        while dia <= hasta:
+            if dia not in ocupados.get(inflable.id, ()):
+                if tramos and tramos[-1][1] == dia - UN_DIA:
+                    tramos[-1] = (tramos[-1][0], dia)
+                else:
+                    tramos.append((dia, dia))
+            dia += UN_DIA
+    return ventanas
+
+
+def test_ventanas_coinciden_con_el_recorrido(app):
+    azar = random.Random(20261018)
+    db.session.add_all([Inflable(nombre=f'Inflable {n}', precio_diario=100) for n in range(8)]
+                       + [Inflable(nombre='De baja', precio_diario=100, activo=False)])
+    cliente = Cliente(nombre='Ana', telefono='11 5555-0001')
+    db.session.add(cliente)
+    db.session.commit()
+    inflables = [i.id for i in Inflable.query]
+    origen = date(2030, 1, 1)
+    # El último inflable activo queda sin reservas
+    _agregar_reservas(azar, inflables[:-2] + inflables[-1:], cliente.id, origen)
+
+    for n in range(CONSULTAS):
+        # Extremos que cortan reservas, caen en huecos o quedan fuera de todas
+        desde = origen + timedelta(days=azar.randrange(-10, 100))
+        hasta = desde + timedelta(days=azar.randrange(0, 60))
+        inflable_ids = set(azar.sample(inflables, 3)) if azar.random() < 0.2 else None
+        assert ventanas_libres(desde, hasta, inflable_ids) == _ventanas_dia_por_dia(desde, hasta, inflable_ids), \
+            (n, desde, hasta, inflable_ids)
+
+
+def test_busqueda_por_duracion(cliente_http, app):
+    azar = random.Random(20261019)
+    db.session.add_all([Inflable(nombre=f'Inflable {n}', precio_diario=100) for n in range(5)])
+    cliente = Cliente(nombre='Ana', telefono='11 5555-0001')
+    db.session.add(cliente)
+    db.session.commit()
+    inflables = [i.id for i in Inflable.query]
+    origen = date(2030, 1, 1)
+    _agregar_reservas(azar, inflables, cliente.id, origen)
+
+    for n in range(40):
+        desde = origen + timedelta(days=azar.randrange(-5, 60))
+        hasta = desde + timedelta(days=azar.randrange(0, 40))
+        duracion = azar.choice([1, 2, 4, 8])
+        respuesta = cliente_http.post('/api/disponibilidad/buscar', json={
+            'duracion': duracion, 'desde': desde.isoformat(), 'hasta': hasta.isoformat()
+        })
+        assert respuesta.status_code == 200
+        obtenido = {r['inflable_id']: (r['proximo'], r['tramos']) for r in respuesta.get_json()}
+        esperado = {}
+        for inflable_id, tramos in _ventanas_dia_por_dia(desde, hasta).items():
+            largos = [[i.isoformat(), f.isoformat()] for i, f in tramos if (f - i).days + 1 >= duracion]
+            if largos:
+                esperado[inflable_id] = (largos[0][0], largos)
+        assert obtenido == esperado, (n, desde, hasta, duracion)
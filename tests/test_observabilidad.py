@@ -0,0 +1,32 @@
+"""Medición de sentencias SQL y log de consultas lentas"""
+
+import logging
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from observabilidad import Metricas, _sentencia_ejecutada
+
+
+def test_sentencias_fallidas_no_acumulan_inicios(app):
+    conexion = db.session.connection()
+    for _ in range(5):
+        with pytest.raises(OperationalError):
+            conexion.exec_driver_sql('SELECT * FROM tabla_que_no_existe')
+        db.session.rollback()
+        conexion = db.session.connection()
+    conexion.exec_driver_sql('SELECT 1')
+    assert not conexion.info.get('inicio_sentencia')
+
+
+def test_consultas_lentas_sin_parametros(app, caplog):
+    # Umbral 0: todas son lentas
+    despues = _sentencia_ejecutada(Metricas(), 0)
+    conexion = db.session.connection()
+    conexion.info.setdefault('inicio_sentencia', []).append((None, 0.0))
+    with caplog.at_level(logging.WARNING, logger='inflables.sql'):
+        despues(conexion, None, 'SELECT ?', ('11 5555-0001',), None, False)
+    assert caplog.records[-1].sql == 'SELECT ?'
+    assert not hasattr(caplog.records[-1], 'parametros')
+    assert '5555' not in caplog.text
@@ -0,0 +1,122 @@
+"""Particiones y archivo de reservas, y trigger de solapamiento (PostgreSQL)"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+import particiones
+from app import (
+    app as aplicacion, db, Cambio, Inflable, Reserva, ReservaArchivada, ESTADOS_RESERVA,
+    es_error_solapamiento, mantener_particiones,
+)
+
+solo_postgresql = pytest.mark.skipif(
+    not aplicacion.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'),
+    reason='Requiere TEST_DATABASE_URL de PostgreSQL'
+)
+
+OPERACIONES = 600
+ANIO = 2031
+
+
+def _particiones_anuales(*anios):
+    conexion = db.session.connection()
+    for anio in anios:
+        particiones.crear_particion(conexion, f'reserva_{anio}', date(anio, 1, 1), date(anio + 1, 1, 1))
+
+
+def _aplicar(sentencia, parametros):
+    """True si se aplicó, False si la base la rechazó por solapamiento"""
+    try:
+        with db.session.begin_nested():
+            db.session.execute(text(sentencia), parametros)
+        return True
+    except IntegrityError as e:
+        assert es_error_solapamiento(e), e
+        return False
+
+
+@solo_postgresql
+def test_solapamiento_entre_particiones(app, inflable, cliente):
+    _particiones_anuales(ANIO, ANIO + 1)
+    alta = ("INSERT INTO reserva (inflable_id, cliente_id, fecha_inicio, fecha_fin, precio_total, estado) "
+            "VALUES (:inflable, :cliente, :inicio, :fin, 100, 'confirmada')")
+    parametros = {'inflable': inflable, 'cliente': cliente}
+
+    assert _aplicar(alta, {**parametros, 'inicio': date(ANIO, 12, 30), 'fin': date(ANIO + 1, 1, 2)})
+    assert not _aplicar(alta, {**parametros, 'inicio': date(ANIO + 1, 1, 2), 'fin': date(ANIO + 1, 1, 3)})
+    assert _aplicar(alta, {**parametros, 'inicio': date(ANIO + 1, 1, 3), 'fin': date(ANIO + 1, 1, 3)})
+
+
+@solo_postgresql
+def test_trigger_equivale_a_restriccion_de_exclusion(app, inflable, cliente):
+    """La misma secuencia de altas y modificaciones al azar sobre reserva
+    (particionada, con el trigger) y sobre una copia sin particiones con la
+    restricción de exclusión: cada una se acepta o rechaza en las dos igual"""
+    _particiones_anuales(ANIO, ANIO + 1)
+    otros = [Inflable(nombre=f'Inflable {n}', precio_diario=100) for n in range(2)]
+    db.session.add_all(otros)
+    db.session.flush()
+    inflables = [inflable] + [i.id for i in otros]
+    db.session.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    db.session.execute(text("CREATE TEMPORARY TABLE reserva_exclusion (LIKE reserva INCLUDING DEFAULTS)"))
+    db.session.execute(text(
+        "ALTER TABLE reserva_exclusion ADD CONSTRAINT reserva_exclusion_sin_solapamiento "
+        "EXCLUDE USING gist (inflable_id WITH =, daterange(fecha_inicio, fecha_fin, '[]') WITH &&) "
+        "WHERE (estado IN ('pendiente', 'confirmada'))"
+    ))
+
+    azar = random.Random(20261018)
+    inicio_base = date(ANIO, 12, 1)  # las fechas cruzan el cambio de partición
+    ids = []
+    aceptadas = rechazadas = 0
+    for n in range(1, OPERACIONES + 1):
+        inicio = inicio_base + timedelta(days=azar.randrange(60))
+        parametros = {
+            'id': n, 'inflable': azar.choice(inflables), 'cliente': cliente, 'inicio': inicio,
+            'fin': inicio + timedelta(days=azar.randrange(6)), 'estado': azar.choice(ESTADOS_RESERVA),
+        }
+        if ids and azar.random() < 0.4:
+            parametros['id'] = azar.choice(ids)
+            sentencia = ("UPDATE {tabla} SET inflable_id = :inflable, fecha_inicio = :inicio, "
+                         "fecha_fin = :fin, estado = :estado WHERE id = :id")
+        else:
+            sentencia = ("INSERT INTO {tabla} (id, inflable_id, cliente_id, fecha_inicio, fecha_fin, "
+                         "precio_total, estado) VALUES (:id, :inflable, :cliente, :inicio, :fin, 100, :estado)")
+        con_trigger = _aplicar(sentencia.format(tabla='reserva'), parametros)
+        con_restriccion = _aplicar(sentencia.format(tabla='reserva_exclusion'), parametros)
+        assert con_trigger == con_restriccion, (sentencia, parametros)
+        if con_trigger:
+            aceptadas += 1
+            if sentencia.startswith('INSERT'):
+                ids.append(n)
+        else:
+            rechazadas += 1
+    # Que la secuencia haya ejercitado los dos casos
+    assert aceptadas > 50 and rechazadas > 50
+    db.session.rollback()
+
+
+def test_archivar_registra_las_bajas(app, inflable, cliente):
+    hace_cinco_anios = date(date.today().year - 5, 3, 1)
+    viejas = [Reserva(inflable_id=inflable, cliente_id=cliente, precio_total=100, estado='completada',
+                      fecha_inicio=hace_cinco_anios + timedelta(days=7 * n),
+                      fecha_fin=hace_cinco_anios + timedelta(days=7 * n + 1))
+              for n in range(3)]
+    actual = Reserva(inflable_id=inflable, cliente_id=cliente, precio_total=100, estado='confirmada',
+                     fecha_inicio=date.today(), fecha_fin=date.today())
+    db.session.add_all(viejas + [actual])
+    db.session.commit()
+    archivadas = {r.id for r in viejas}
+
+    mantener_particiones()
+
+    db.session.expire_all()
+    assert {r.id for r in Reserva.query} == {actual.id}
+    assert {r.id for r in ReservaArchivada.query} == archivadas
+    assert {(c.entidad, c.entidad_id, c.operacion) for c in Cambio.query} == {
+        ('reserva', reserva_id, 'baja') for reserva_id in archivadas
+    }
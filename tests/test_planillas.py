@@ -0,0 +1,66 @@
+"""Exportación e importación de planillas"""
+
+import io
+from datetime import date, timedelta
+
+import pytest
+
+from app import db, Cliente, Inflable, Reserva
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+def _reservar(cliente_http, inflable_id, desde, dias):
+    respuesta = cliente_http.post('/api/reservas', json={
+        'inflable_id': inflable_id, 'fecha_inicio': desde.isoformat(),
+        'fecha_fin': (desde + timedelta(days=dias)).isoformat(),
+        'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+    })
+    assert respuesta.status_code == 200, respuesta.get_json()
+
+
+def _exportar(cliente_http, entidad):
+    respuesta = cliente_http.get(f'/api/exportar/{entidad}?formato=xlsx')
+    assert respuesta.status_code == 200
+    assert respuesta.mimetype.endswith('spreadsheetml.sheet')
+    return respuesta.data
+
+
+def _importar(cliente_http, entidad, contenido):
+    respuesta = cliente_http.post(f'/api/importar/{entidad}', data={
+        'archivo': (io.BytesIO(contenido), f'{entidad}.xlsx')
+    }, content_type='multipart/form-data')
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()
+
+
+def test_xlsx_exportado_se_vuelve_a_importar(cliente_http, inflable):
+    hoy = date.today()
+    _reservar(cliente_http, inflable, hoy + timedelta(days=10), 2)
+    _reservar(cliente_http, inflable, hoy + timedelta(days=20), 0)
+
+    inflables = _exportar(cliente_http, 'inflables')
+    reservas = _exportar(cliente_http, 'reservas')
+    hoja = openpyxl.load_workbook(io.BytesIO(reservas), read_only=True).active
+    filas = list(hoja.iter_rows(values_only=True))
+    assert filas[0][:4] == ('id', 'inflable_id', 'inflable', 'cliente_nombre')
+    assert len(filas) == 3
+
+    # En una base vacía: inflables por nombre y clientes por teléfono
+    db.drop_all()
+    db.create_all()
+    assert _importar(cliente_http, 'inflables', inflables)['creados'] == 1
+    resumen = _importar(cliente_http, 'reservas', reservas)
+    assert (resumen['creados'], resumen['errores'], resumen['conflictos']) == (2, 0, 0)
+    assert db.session.scalar(db.select(db.func.count()).select_from(Cliente)) == 1
+    assert sorted(db.session.execute(
+        db.select(Reserva.fecha_inicio, Reserva.fecha_fin, Reserva.precio_total).order_by(Reserva.fecha_inicio)
+    ).all()) == [
+        (hoy + timedelta(days=10), hoy + timedelta(days=12), 300.0),
+        (hoy + timedelta(days=20), hoy + timedelta(days=20), 100.0),
+    ]
+
+    # Importarla otra vez no duplica nada
+    resumen = _importar(cliente_http, 'reservas', reservas)
+    assert (resumen['creados'], resumen['existentes']) == (0, 2)
+    assert db.session.scalar(db.select(db.func.count()).select_from(Inflable)) == 1
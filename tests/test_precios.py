@@ -0,0 +1,69 @@
+"""Motor de precios y precios vigentes al reservar"""
+
+import random
+from collections import namedtuple
+from datetime import date, timedelta
+
+from app import db, Inflable
+from tarifas import MotorPrecios, PreciosVigentes
+
+Regla = namedtuple('Regla', 'id tipo inflable_id factor desde hasta dias_minimos')
+
+
+def _reglas_al_azar(azar, inflables, cantidad):
+    hoy = date.today()
+    reglas = []
+    for n in range(1, cantidad + 1):
+        tipo = azar.choice(('fin_de_semana', 'temporada', 'duracion'))
+        desde = hoy + timedelta(days=azar.randrange(-400, 800))
+        reglas.append(Regla(
+            id=n, tipo=tipo, inflable_id=azar.choice([None, *inflables]), factor=round(azar.uniform(0.5, 2), 2),
+            desde=desde if tipo == 'temporada' else None,
+            hasta=desde + timedelta(days=azar.randrange(60)) if tipo == 'temporada' else None,
+            dias_minimos=azar.randrange(2, 10) if tipo == 'duracion' else None,
+        ))
+    return reglas
+
+
+def test_precios_vigentes_coinciden_con_el_motor():
+    azar = random.Random(20261018)
+    precios = {i: azar.choice((80.0, 120.5, 199.99)) for i in range(1, 6)}
+    reglas = _reglas_al_azar(azar, list(precios), 15)
+    motor = MotorPrecios(lambda: (precios, reglas), dias_atras=30, dias_adelante=90)
+    vigentes = PreciosVigentes(precios, reglas)
+    for _ in range(2000):
+        # Dentro y fuera de la ventana compilada del motor
+        inicio = date.today() + timedelta(days=azar.randrange(-120, 400))
+        fin = inicio + timedelta(days=azar.randrange(15))
+        inflable_id = azar.randrange(0, 7)
+        esperado = motor.cotizar(inflable_id, inicio, fin)
+        obtenido = vigentes.cotizar(inflable_id, inicio, fin)
+        if esperado is None:
+            assert obtenido is None
+        else:
+            assert abs(obtenido - esperado) <= 0.01, (inflable_id, inicio, fin)
+
+
+def test_reservar_cobra_el_precio_de_la_base(cliente_http, inflable):
+    inicio = date.today() + timedelta(days=30)
+    cotizacion = {'cotizaciones': [{'inflable_id': inflable, 'fecha_inicio': inicio.isoformat(),
+                                    'fecha_fin': inicio.isoformat()}]}
+    assert cliente_http.post('/api/cotizar', json=cotizacion).get_json()['cotizaciones'][0]['precio_total'] == 100
+
+    # Otro worker cambia el precio: el motor de este sigue con el anterior hasta el TTL
+    db.session.get(Inflable, inflable).precio_diario = 150
+    db.session.commit()
+    assert cliente_http.post('/api/cotizar', json=cotizacion).get_json()['cotizaciones'][0]['precio_total'] == 100
+
+    respuesta = cliente_http.post('/api/reservas', json={
+        'inflable_id': inflable, 'fecha_inicio': inicio.isoformat(), 'fecha_fin': inicio.isoformat(),
+        'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+    })
+    assert respuesta.status_code == 200
+    reserva = cliente_http.get(f"/api/reservas/{respuesta.get_json()['id']}").get_json()
+    assert reserva['precio_total'] == 150
+
+    respuesta = cliente_http.put(f"/api/reservas/{reserva['id']}", json={
+        'fecha_inicio': inicio.isoformat(), 'fecha_fin': (inicio + timedelta(days=1)).isoformat()
+    })
+    assert respuesta.get_json()['reserva']['precio_total'] == 300
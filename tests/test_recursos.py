@@ -0,0 +1,31 @@
+"""Compilación de los recursos estáticos"""
+
+import gzip
+import os
+
+import recursos
+
+JS = '''function tarjeta(inflable) {
+    // Comentario de línea
+    return `
+        <div class="tarjeta">
+// no es un comentario: es parte del HTML
+            <a href="https://example.com/${inflable.id}">${inflable.nombre}</a>
+        </div>
+    `;
+}
+const url = 'http://example.com/\\
+// sigue el string';
+'''
+
+
+def test_js_sin_minificador_no_cambia_el_codigo(tmp_path, monkeypatch):
+    monkeypatch.setattr(recursos, 'rjsmin', None)
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'app.js').write_text(JS, encoding='utf-8')
+    manifiesto = recursos.construir(str(tmp_path), fuentes=('js/app.js',))
+    compilado = os.path.join(tmp_path, manifiesto['js/app.js'])
+    with open(compilado, encoding='utf-8') as f:
+        assert f.read() == JS
+    with open(compilado + '.gz', 'rb') as f:
+        assert gzip.decompress(f.read()).decode('utf-8') == JS
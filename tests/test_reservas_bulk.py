@@ -0,0 +1,81 @@
+"""Alta de reservas en lote"""
+
+from datetime import date, timedelta
+
+from app import db, Cliente, Inflable, Reserva
+from test_consultas import sentencias
+
+HOY = date.today()
+
+
+def _item(inflable_id, desde, dias, telefono='11 5555-0001', nombre='Ana'):
+    return {
+        'inflable_id': inflable_id, 'fecha_inicio': (HOY + timedelta(days=desde)).isoformat(),
+        'fecha_fin': (HOY + timedelta(days=desde + dias)).isoformat(),
+        'cliente': {'nombre': nombre, 'telefono': telefono},
+    }
+
+
+def _lote(cliente_http, items):
+    respuesta = cliente_http.post('/api/reservas/bulk', json=items)
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()
+
+
+def test_resultados_en_el_orden_del_lote(cliente_http, inflable):
+    assert cliente_http.post('/api/reservas', json=_item(inflable, 10, 2)).status_code == 200
+    cuerpo = _lote(cliente_http, [
+        _item(inflable, 20, 1),
+        _item(inflable, 11, 0),                      # choca con la existente
+        {'inflable_id': inflable, 'fecha_inicio': '2030-01-05'},
+        _item(inflable, 30, 1, telefono='11 5555-0002'),
+        _item(inflable, 40, -2),                     # rango invertido
+        _item(inflable + 99, 50, 1),                 # inflable inexistente
+    ])
+    assert [r['estado'] for r in cuerpo['resultados']] == [
+        'creada', 'conflicto', 'error', 'creada', 'error', 'error'
+    ]
+    assert [r['indice'] for r in cuerpo['resultados']] == list(range(6))
+    assert (cuerpo['creadas'], cuerpo['conflictos'], cuerpo['errores']) == (2, 1, 3)
+    creadas = {r['id'] for r in cuerpo['resultados'] if r['estado'] == 'creada'}
+    assert {r.id for r in Reserva.query.filter(Reserva.fecha_inicio > HOY + timedelta(days=15))} == creadas
+
+
+def test_dentro_del_lote_gana_la_primera(cliente_http, inflable):
+    cuerpo = _lote(cliente_http, [
+        _item(inflable, 10, 3, nombre='Primera'),
+        _item(inflable, 12, 3, telefono='11 5555-0002', nombre='Segunda'),
+        _item(inflable, 13, 0, telefono='11 5555-0003'),   # toca el último día de la primera
+        _item(inflable, 14, 0, telefono='11 5555-0004'),
+    ])
+    assert [r['estado'] for r in cuerpo['resultados']] == ['creada', 'conflicto', 'conflicto', 'creada']
+    primera = db.session.get(Reserva, cuerpo['resultados'][0]['id'])
+    assert db.session.get(Cliente, primera.cliente_id).nombre == 'Primera'
+
+
+def test_cliente_sin_telefono(cliente_http, inflable):
+    cuerpo = _lote(cliente_http, [
+        _item(inflable, 10, 0, telefono=None),
+        _item(inflable, 11, 0, telefono='  '),
+        _item(inflable, 12, 0),
+    ])
+    assert [r['estado'] for r in cuerpo['resultados']] == ['error', 'error', 'creada']
+    assert cuerpo['resultados'][0]['error'] == 'Falta el teléfono del cliente'
+    assert [c.telefono for c in Cliente.query] == ['11 5555-0001']
+
+
+def test_sentencias_no_dependen_del_tamano_del_lote(cliente_http, inflable):
+    db.session.add_all([Inflable(nombre=f'Inflable {n}', precio_diario=100) for n in range(40)])
+    db.session.commit()
+    inflables = [i.id for i in Inflable.query.order_by(Inflable.id)]
+    cuentas = []
+    for inicio, cantidad in ((0, 3), (100, 40)):
+        # Cada tanda con clientes nuevos, clientes existentes y un conflicto
+        items = [_item(inflables[n], inicio + n, 1, telefono=f'11 4444-{inicio + n:04d}') for n in range(cantidad)]
+        items += [_item(inflables[0], inicio + 1000, 0), _item(inflables[0], inicio + 1000, 0)]
+        db.session.remove()
+        with sentencias() as ejecutadas:
+            cuerpo = _lote(cliente_http, items)
+        assert cuerpo['creadas'] == cantidad + 1
+        cuentas.append(len(ejecutadas))
+    assert cuentas[0] == cuentas[1], cuentas
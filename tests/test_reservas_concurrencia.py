@@ -0,0 +1,74 @@
+"""Reservas en paralelo del mismo inflable: una sola gana"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from app import db, Reserva
+
+PARALELAS = 8
+
+
+def _reservar_en_paralelo(app, inflable_id, rangos):
+    barrera = threading.Barrier(len(rangos))
+
+    def reservar(n):
+        inicio, fin = rangos[n]
+        cliente_http = app.test_client()
+        barrera.wait()
+        return cliente_http.post('/api/reservas', json={
+            'inflable_id': inflable_id,
+            'fecha_inicio': inicio.isoformat(),
+            'fecha_fin': fin.isoformat(),
+            'cliente': {'nombre': f'Cliente {n}', 'telefono': f'11 5555-{n:04d}'},
+        }).status_code
+
+    with ThreadPoolExecutor(len(rangos)) as pool:
+        return list(pool.map(reservar, range(len(rangos))))
+
+
+def test_solo_una_reserva_gana_entre_solapadas(app, inflable):
+    inicio = date.today() + timedelta(days=30)
+    # Todas se solapan con todas: comparten inicio + PARALELAS - 1
+    rangos = [(inicio + timedelta(days=n), inicio + timedelta(days=PARALELAS + n)) for n in range(PARALELAS)]
+
+    estados = _reservar_en_paralelo(app, inflable, rangos)
+
+    assert sorted(estados) == [200] + [409] * (PARALELAS - 1)
+    assert Reserva.query.filter_by(inflable_id=inflable).count() == 1
+
+
+def test_reservas_sin_solapamiento_ganan_todas(app, inflable):
+    inicio = date.today() + timedelta(days=30)
+    rangos = [(inicio + timedelta(days=3 * n), inicio + timedelta(days=3 * n + 1)) for n in range(PARALELAS)]
+
+    estados = _reservar_en_paralelo(app, inflable, rangos)
+
+    assert estados == [200] * PARALELAS
+    db.session.expire_all()
+    assert Reserva.query.filter_by(inflable_id=inflable).count() == PARALELAS
+
+
+def test_solo_una_modificacion_gana_hacia_el_mismo_rango(app, inflable, cliente):
+    inicio = date.today() + timedelta(days=30)
+    reservas = [Reserva(inflable_id=inflable, cliente_id=cliente, precio_total=100,
+                        fecha_inicio=inicio + timedelta(days=3 * n), fecha_fin=inicio + timedelta(days=3 * n))
+                for n in range(1, PARALELAS + 1)]
+    db.session.add_all(reservas)
+    db.session.commit()
+    ids = [r.id for r in reservas]
+    barrera = threading.Barrier(PARALELAS)
+
+    def mover(reserva_id):
+        cliente_http = app.test_client()
+        barrera.wait()
+        return cliente_http.put(f'/api/reservas/{reserva_id}', json={
+            'fecha_inicio': inicio.isoformat(), 'fecha_fin': (inicio + timedelta(days=1)).isoformat()
+        }).status_code
+
+    with ThreadPoolExecutor(PARALELAS) as pool:
+        estados = list(pool.map(mover, ids))
+
+    assert sorted(estados) == [200] + [409] * (PARALELAS - 1)
+    db.session.expire_all()
+    assert Reserva.query.filter(Reserva.fecha_inicio == inicio).count() == 1
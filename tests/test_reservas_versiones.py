@@ -0,0 +1,128 @@
+"""ETag de las reservas: If-None-Match en GET, If-Match en PUT y DELETE
+
+En PostgreSQL (TEST_DATABASE_URL) un PUT con inflable y fechas completos es
+un único UPDATE ... RETURNING; con solo una fecha, o en SQLite, se lee antes
+la fila. Los casos con cambios parametrizados pasan por los dos caminos.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app import db, Reserva
+
+HOY = date.today()
+
+
+def _dia(dias):
+    return (HOY + timedelta(days=dias)).isoformat()
+
+
+def _reservar(cliente_http, inflable_id, desde, hasta):
+    respuesta = cliente_http.post('/api/reservas', json={
+        'inflable_id': inflable_id, 'fecha_inicio': _dia(desde), 'fecha_fin': _dia(hasta),
+        'cliente': {'nombre': 'Ana', 'telefono': '11 5555-0001'},
+    })
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()['id']
+
+
+def _cambio_de_fechas(inflable_id, completo, desde, hasta):
+    if completo:
+        return {'inflable_id': inflable_id, 'fecha_inicio': _dia(desde), 'fecha_fin': _dia(hasta)}
+    return {'fecha_fin': _dia(hasta)}
+
+
+def test_get_con_if_none_match(cliente_http, inflable):
+    reserva_id = _reservar(cliente_http, inflable, 10, 12)
+    respuesta = cliente_http.get(f'/api/reservas/{reserva_id}')
+    assert respuesta.status_code == 200
+    etag = respuesta.headers['ETag']
+
+    respuesta = cliente_http.get(f'/api/reservas/{reserva_id}', headers={'If-None-Match': etag})
+    assert respuesta.status_code == 304
+    assert respuesta.headers['ETag'] == etag
+    assert not respuesta.data
+
+    # Débil, como lo reenvía un navegador tras una respuesta comprimida
+    respuesta = cliente_http.get(f'/api/reservas/{reserva_id}', headers={'If-None-Match': f'W/{etag}'})
+    assert respuesta.status_code == 304
+
+    assert cliente_http.put(f'/api/reservas/{reserva_id}', json={'notas': 'otra'}).status_code == 200
+    respuesta = cliente_http.get(f'/api/reservas/{reserva_id}', headers={'If-None-Match': etag})
+    assert respuesta.status_code == 200
+    assert respuesta.headers['ETag'] != etag
+    assert respuesta.get_json()['notas'] == 'otra'
+
+
+@pytest.mark.parametrize('completo', [True, False])
+def test_if_match_vencido_tras_un_put(cliente_http, inflable, completo):
+    reserva_id = _reservar(cliente_http, inflable, 10, 12)
+    etag = cliente_http.get(f'/api/reservas/{reserva_id}').headers['ETag']
+
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', headers={'If-Match': etag},
+                                 json=_cambio_de_fechas(inflable, completo, 10, 13))
+    assert respuesta.status_code == 200, respuesta.get_json()
+    nuevo = respuesta.headers['ETag']
+    assert nuevo != etag
+    assert respuesta.get_json()['reserva']['precio_total'] == 400
+
+    # Otro usuario con la versión que leyó antes
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', headers={'If-Match': etag},
+                                 json=_cambio_de_fechas(inflable, completo, 10, 11))
+    assert respuesta.status_code == 412
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', headers={'If-Match': etag}, json={'notas': 'x'})
+    assert respuesta.status_code == 412
+    reserva = db.session.get(Reserva, reserva_id)
+    assert (reserva.fecha_fin, reserva.precio_total, reserva.notas) == (HOY + timedelta(days=13), 400, '')
+
+    # La de la última respuesta sí; y la de otra reserva nunca coincide
+    otra = _reservar(cliente_http, inflable, 30, 30)
+    assert cliente_http.put(f'/api/reservas/{otra}', headers={'If-Match': nuevo},
+                            json={'notas': 'x'}).status_code == 412
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', headers={'If-Match': nuevo},
+                                 json={'notas': 'x'})
+    assert respuesta.status_code == 200
+    assert cliente_http.put('/api/reservas/999999', headers={'If-Match': nuevo},
+                            json={'notas': 'x'}).status_code == 404
+
+
+@pytest.mark.parametrize('completo', [True, False])
+def test_put_que_se_solapa(cliente_http, inflable, completo):
+    _reservar(cliente_http, inflable, 20, 22)
+    reserva_id = _reservar(cliente_http, inflable, 10, 12)
+    etag = cliente_http.get(f'/api/reservas/{reserva_id}').headers['ETag']
+
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', headers={'If-Match': etag},
+                                 json=_cambio_de_fechas(inflable, completo, 10, 20))
+    assert respuesta.status_code == 409
+    # No cambió nada: la misma versión sigue valiendo
+    assert cliente_http.get(f'/api/reservas/{reserva_id}', headers={'If-None-Match': etag}).status_code == 304
+
+    # Pegada a la otra sí
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', headers={'If-Match': etag},
+                                 json=_cambio_de_fechas(inflable, completo, 10, 19))
+    assert respuesta.status_code == 200
+
+
+@pytest.mark.parametrize('completo', [True, False])
+def test_put_con_rango_invertido(cliente_http, inflable, completo):
+    reserva_id = _reservar(cliente_http, inflable, 10, 12)
+    respuesta = cliente_http.put(f'/api/reservas/{reserva_id}', json=_cambio_de_fechas(inflable, completo, 10, 5))
+    assert respuesta.status_code == 400
+    assert db.session.get(Reserva, reserva_id).fecha_fin == HOY + timedelta(days=12)
+
+
+def test_delete_con_if_match(cliente_http, inflable):
+    reserva_id = _reservar(cliente_http, inflable, 10, 12)
+    etag = cliente_http.get(f'/api/reservas/{reserva_id}').headers['ETag']
+    assert cliente_http.put(f'/api/reservas/{reserva_id}', json={'notas': 'otra'}).status_code == 200
+
+    assert cliente_http.delete(f'/api/reservas/{reserva_id}', headers={'If-Match': etag}).status_code == 412
+    assert db.session.get(Reserva, reserva_id) is not None
+
+    etag = cliente_http.get(f'/api/reservas/{reserva_id}').headers['ETag']
+    assert cliente_http.delete(f'/api/reservas/{reserva_id}', headers={'If-Match': etag}).status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Reserva, reserva_id) is None
+    assert cliente_http.delete(f'/api/reservas/{reserva_id}', headers={'If-Match': etag}).status_code == 404
@@ -0,0 +1,21 @@
+"""Serialización JSON de las respuestas"""
+
+import json
+from datetime import date
+
+import pytest
+
+import respuestas
+from app import db
+
+
+@pytest.mark.parametrize('con_orjson', [True, False])
+def test_filas_de_sqlalchemy_como_listas(app, monkeypatch, con_orjson):
+    if not con_orjson:
+        monkeypatch.setattr(respuestas, 'orjson', None)
+    elif respuestas.orjson is None:
+        pytest.skip('orjson no está instalado')
+    fila = db.session.execute(db.select(db.literal(1), db.literal('a'), db.literal(date(2030, 1, 2)))).first()
+    assert json.loads(respuestas.a_json({'fila': fila, 'filas': [fila]})) == {
+        'fila': [1, 'a', '2030-01-02'], 'filas': [[1, 'a', '2030-01-02']]
+    }
@@ -0,0 +1,48 @@
+"""Bloqueo de las tareas periódicas entre workers"""
+
+import threading
+import time
+
+from app import bloqueo_tarea
+from tareas import Planificador
+
+WORKERS = 4
+
+
+def test_bloqueo_de_tarea_sin_postgresql(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'TAREAS_BLOQUEO_DIRECTORIO', str(tmp_path))
+    with bloqueo_tarea('completar_reservas') as primero:
+        with bloqueo_tarea('completar_reservas') as segundo, bloqueo_tarea('vencer_pendientes') as otra:
+            assert (primero, segundo, otra) == (True, False, True)
+    with bloqueo_tarea('completar_reservas') as de_nuevo:
+        assert de_nuevo
+
+
+def test_una_sola_ejecucion_entre_workers(app, tmp_path, monkeypatch):
+    """Varios workers revisan a la vez una tarea que toca: corre una vez"""
+    monkeypatch.setitem(app.config, 'TAREAS_BLOQUEO_DIRECTORIO', str(tmp_path))
+    registro = {}
+    corridas = []
+    planificador = Planificador(
+        bloqueo_tarea, registro.get, lambda nombre, inicio, *_: registro.__setitem__(nombre, inicio)
+    )
+
+    @planificador.tarea('lenta', intervalo=3600)
+    def lenta():
+        corridas.append(threading.get_ident())
+        time.sleep(0.2)
+        return 0
+
+    barrera = threading.Barrier(WORKERS)
+
+    def worker():
+        barrera.wait()
+        with app.app_context():
+            planificador.ejecutar('lenta')
+
+    hilos = [threading.Thread(target=worker) for _ in range(WORKERS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(corridas) == 1